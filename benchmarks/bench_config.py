@@ -0,0 +1,220 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Benchmarks for the config pipeline.
+
+Generates synthetic configs (xdotool, qdbus and command lines, comments, devices,
+messy whitespace and a few broken lines) and times read_config, resub_config, fix_config,
+GesturesApp.prepare_config_for_displaying, GesturesApp.sort_config and find_key_combo.
+
+Usage:
+    python benchmarks/bench_config.py [--sizes 10 100 1000 10000 100000] [--output results.json]
+                                      [--thresholds benchmarks/thresholds.json]
+                                      [--baseline old_results.json --tolerance 1.5]
+Exits with 1 if a threshold is exceeded or a result regressed against the baseline.
+--------------
+Functions: generate_config, run_benchmarks, check_thresholds, check_baseline, main
+--------------
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libinput_gestures_qt import config  # noqa: E402
+
+SIZES = (10, 100, 1000, 10000, 100000)
+THRESHOLDS_LOCATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+
+gestures = [
+    'swipe up', 'swipe down', 'swipe left', 'swipe right', 'swipe left_up', 'swipe left_down',
+    'swipe right_up', 'swipe right_down', 'pinch in', 'pinch out', 'pinch clockwise', 'pinch anticlockwise',
+]
+key_combos = ['Meta+PgDown', 'Ctrl+Alt+Left', 'Alt+Right', 'Ctrl+Meta+F1', 'Shift+Up', 'Ctrl+W']
+kwin_shortcuts = ['Expose', 'ShowDesktopGrid', 'Window Minimize', 'Window Maximize', 'Switch to Next Desktop']
+commands = ['echo "Hello"', 'notify-send gesture', 'xdg-open https://example.com', 'amixer set Master 5%+']
+
+
+def generate_config(lines, seed=0, broken=0.02):
+    """Synthetic config with the given number of lines
+
+    Roughly a third of gestures each use xdotool, qdbus and plain commands;
+    a share of `broken` lines is invalid and gets dropped by fix_config.
+    """
+    rnd = random.Random(seed)
+    result = []
+    for i in range(lines):
+        roll = rnd.random()
+        if roll < broken:
+            result.append(rnd.choice(['gesture swipe up\n', 'nonsense line\n', 'device\n']))
+        elif roll < 0.08:
+            result.append('# comment {}\n'.format(i))
+        elif roll < 0.09:
+            result.append('device  touchpad{}\n'.format(i))
+        else:
+            gesture = 'gesture\t{}  {}'.format(rnd.choice(gestures), rnd.randint(2, 5))
+            kind = rnd.randrange(3)
+            if kind == 0:
+                action = 'xdotool key ' + config_key(rnd.choice(key_combos))
+            elif kind == 1:
+                action = 'qdbus org.kde.kglobalaccel /component/kwin invokeShortcut "{}"'.format(rnd.choice(kwin_shortcuts))
+            else:
+                action = rnd.choice(commands)
+            result.append('{}   {}\n'.format(gesture, action))
+    return result
+
+
+def config_key(combo):
+    return combo.lower().replace('meta', 'super')
+
+
+def measure(function, setup=None, min_time=0.2, max_repeats=5):
+    """Best time of function() out of several runs; setup() runs untimed before each"""
+    best = None
+    spent = 0.0
+    for _ in range(max_repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        best = elapsed if best is None else min(best, elapsed)
+        if spent > min_time:
+            break
+    return best
+
+
+def run_benchmarks(sizes=SIZES, seed=0):
+    """Returns list of {'function', 'lines', 'seconds', 'per_line_us'}"""
+    from libinput_gestures_qt.main import GesturesApp
+    from libinput_gestures_qt.mappings import find_key_combo
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'libinput-gestures.conf')
+        for size in sizes:
+            raw = ''.join(generate_config(size, seed))
+
+            def write_raw():
+                with open(path, 'w') as f:
+                    f.write(raw)
+
+            write_raw()
+            timings = {
+                'read_config': measure(lambda: config.read_config(path)),
+                'resub_config': measure(lambda: config.resub_config(path), write_raw),
+                'fix_config': measure(lambda: config.fix_config(path), write_raw),
+            }
+
+            config.fix_config(path)
+            window = types.SimpleNamespace(config=config.Config.load(path))
+            timings['prepare_config_for_displaying'] = measure(
+                lambda: GesturesApp.prepare_config_for_displaying(window)
+            )
+            timings['sort_config'] = measure(
+                lambda: GesturesApp.sort_config(window),
+                lambda: GesturesApp.prepare_config_for_displaying(window)
+            )
+
+            combos = [key_combos[i % len(key_combos)] for i in range(size)]
+            timings['find_key_combo'] = measure(lambda: [find_key_combo(combo) for combo in combos])
+
+            for function, seconds in timings.items():
+                results.append({
+                    'function': function,
+                    'lines': size,
+                    'seconds': seconds,
+                    'per_line_us': seconds / size * 1e6,
+                })
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """Returns failures: results slower per line than thresholds[function] microseconds
+
+    Sizes under 1000 lines are skipped, they are dominated by fixed costs.
+    """
+    failures = []
+    for result in results:
+        limit = thresholds.get(result['function'])
+        if limit is not None and result['lines'] >= 1000 and result['per_line_us'] > limit:
+            failures.append('{function} ({lines} lines): {per_line_us:.2f} us/line > {limit} us/line'.format(
+                limit=limit, **result
+            ))
+    return failures
+
+
+def check_baseline(results, baseline, tolerance):
+    """Returns failures: results more than tolerance times slower than the same entry in baseline"""
+    old = {(result['function'], result['lines']): result['seconds'] for result in baseline['results']}
+    failures = []
+    for result in results:
+        before = old.get((result['function'], result['lines']))
+        if before and result['seconds'] > before * tolerance:
+            failures.append('{} ({} lines): {:.4f}s, was {:.4f}s'.format(
+                result['function'], result['lines'], result['seconds'], before
+            ))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the libinput-gestures-qt config pipeline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    parser.add_argument('--thresholds', default=THRESHOLDS_LOCATION, help='JSON of max microseconds per line')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='allowed slowdown against the baseline')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.seed)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    failures = []
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            failures += check_thresholds(results, json.load(f))
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += check_baseline(results, json.load(f), args.tolerance)
+    report['failures'] = failures
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    for failure in failures:
+        print('REGRESSION: ' + failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
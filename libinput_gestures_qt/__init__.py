@@ -1 +1,6 @@
-from libinput_gestures_qt.main import main
+def main():
+    """Starts the GUI; Qt is imported only here so that the CLI does not load it"""
+    from libinput_gestures_qt.startup import profiler
+    with profiler.span('imports'):
+        from libinput_gestures_qt.main import main as gui_main
+    gui_main()
@@ -0,0 +1,105 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Tiny client of the resident action helper (see daemon.py), run by libinput-gestures on every gesture.
+
+Usage:
+    libinput-gestures-qt-action key <keys>
+    libinput-gestures-qt-action shortcut <kwin shortcut name>
+
+Sends one line to the helper's socket and exits without waiting for an answer.
+If the helper is not running, the action is done the old way ('xdotool key' or qdbus;
+without a qdbus binary, an in-process D-Bus call), so config lines using the client always work.
+Imports as little as possible, Qt only for the in-process fallback.
+
+Variables:
+--------------
+ACTION_CLIENT: str
+    name of the client script, the command used in config lines
+SOCKET_LOCATION: str
+    path to the helper's UNIX socket
+VERBS: tuple of str
+    actions the helper knows
+--------------
+Functions: send, is_running, fallback_command, main
+--------------
+"""
+
+import os
+import sys
+import socket
+
+ACTION_CLIENT = 'libinput-gestures-qt-action'
+SOCKET_LOCATION = os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or '/tmp',
+    'libinput-gestures-qt-{}.sock'.format(os.getuid())
+)
+VERBS = ('key', 'shortcut')
+
+
+def send(verb, argument, path=None):
+    """Sends '<verb> <argument>' to the helper, returns False if it is not listening"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path or SOCKET_LOCATION)
+            connection.sendall('{} {}\n'.format(verb, argument).encode('utf-8'))
+    except OSError:
+        return False
+    return True
+
+
+def is_running(path=None):
+    """True if the helper accepts connections"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path or SOCKET_LOCATION)
+    except OSError:
+        return False
+    return True
+
+
+def fallback_command(verb, argument):
+    """Command doing the same as the helper would, for when it is not running
+
+    None if there is no qdbus binary for a shortcut, see kglobalaccel.invoke_shortcut.
+    """
+    if verb == 'key':
+        return ['xdotool', 'key', argument]
+    from libinput_gestures_qt.process import get_qdbus_name
+    qdbus_name = get_qdbus_name()
+    if not qdbus_name:
+        return None
+    return [qdbus_name, 'org.kde.kglobalaccel', '/component/kwin', 'invokeShortcut', argument]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] not in VERBS:
+        print('usage: {} (key <keys> | shortcut <name>)'.format(ACTION_CLIENT), file=sys.stderr)
+        return 2
+    verb, argument = argv
+    if send(verb, argument):
+        return 0
+    command = fallback_command(verb, argument)
+    if command:
+        os.execvp(command[0], command)
+    from libinput_gestures_qt.kglobalaccel import invoke_shortcut
+    return 0 if invoke_shortcut(argument) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
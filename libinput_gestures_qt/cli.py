@@ -0,0 +1,339 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Headless command line interface. Never imports Qt, works over SSH and in scripts.
+
+Usage:
+    libinput-gestures-qt-cli [--config PATH] list [--json]
+    libinput-gestures-qt-cli add swipe up 3 (--key KEYS | --plasma SHORTCUT | --command COMMAND) [--helper] [--device NAME]
+    libinput-gestures-qt-cli edit swipe up 3 (--key KEYS | --plasma SHORTCUT | --command COMMAND) [--helper] [--device NAME]
+    libinput-gestures-qt-cli delete swipe up 3 [--device NAME]
+    libinput-gestures-qt-cli validate [FILE]
+    libinput-gestures-qt-cli import FILE
+    libinput-gestures-qt-cli apply-defaults [--helper]
+    libinput-gestures-qt-cli history [--limit N]
+    libinput-gestures-qt-cli revert VERSION
+    libinput-gestures-qt-cli profile (list | save NAME | switch NAME | delete NAME)
+Every command takes --config PATH and --trace FILE (Chrome trace, see trace.py).
+--------------
+Classes:
+CliError(Exception)
+    Error reported to the user with exit code 1
+--------------
+Functions: build_parser, main
+--------------
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from libinput_gestures_qt import config as config_module
+from libinput_gestures_qt.config import Config, normalize_lines, normalize_config, write_defaults
+from libinput_gestures_qt.history import History
+from libinput_gestures_qt.profiles import ProfileStore, KDE_PROFILE
+from libinput_gestures_qt.mappings import (
+    reversed_mapping, kde_defaults, find_key_combo, key_command, plasma_command, gesture_line, with_action_client
+)
+from libinput_gestures_qt.process import get_qdbus_name, restart_libinput_gestures
+from libinput_gestures_qt.trace import tracer
+
+
+class CliError(Exception):
+    """Error reported to the user as 'error: <message>' with exit code 1"""
+
+
+def gesture_action(args):
+    """'gesture <type> <direction>' from command line arguments"""
+    action = 'gesture {} {}'.format(args.type, args.direction)
+    if action not in reversed_mapping:
+        raise CliError('unknown gesture "{} {}"'.format(args.type, args.direction))
+    return action
+
+
+def gesture_command(args):
+    """Command of the line from --key, --plasma or --command (and --helper)
+
+    Plasma actions go through the resident helper if there is no qdbus binary.
+    """
+    if args.key:
+        return key_command(find_key_combo(args.key), args.helper)
+    if args.plasma:
+        return plasma_command(get_qdbus_name(), args.plasma, args.helper)
+    return args.command
+
+
+def gesture_device(args):
+    """Device from --device: None if not given or empty (lines above any 'device' line)"""
+    return args.device or None
+
+
+def find_entries(config, args):
+    """Gesture lines for exactly '<type> <direction> <fingers>'
+
+    Only under --device if it is given, otherwise under any device,
+    CliError if that gesture is set for more than one device.
+    """
+    _, gesture_type, direction = gesture_action(args).split()
+    if args.device is not None:
+        return config.lookup((gesture_type, direction, str(args.fingers), gesture_device(args)))
+    entries = config.find_any(gesture_type, direction, args.fingers)
+    devices = []
+    for entry in entries:
+        if entry.device not in devices:
+            devices.append(entry.device)
+    if len(devices) > 1:
+        raise CliError('gesture is set for several devices, choose one with --device: {}'.format(
+            ', '.join('"{}"'.format(device or '') for device in devices)
+        ))
+    return entries
+
+
+def report_rejected(rejected):
+    for lineno, line, reason in rejected:
+        print('line {}: {}: {}'.format(lineno, reason, line), file=sys.stderr)
+
+
+def cmd_list(config, args):
+    rows = sorted(
+        (reversed_mapping.get('gesture {} {}'.format(entry.type, entry.direction), entry.key),
+         entry.fingers, entry.action, entry.shortcut)
+        for entry in config.gestures()
+    )
+    if args.json:
+        keys = ('gesture', 'fingers', 'type', 'action')
+        json.dump([dict(zip(keys, row)) for row in rows], sys.stdout, indent=2)
+        print()
+    else:
+        for row in rows:
+            print('\t'.join(row))
+    return 0
+
+
+def cmd_add(config, args):
+    line = gesture_line(gesture_action(args), args.fingers, gesture_command(args))
+    if args.device is None:
+        config.append(line)
+    else:
+        config.add_for_device(line, gesture_device(args))
+    config.save()
+    return 0
+
+
+def cmd_edit(config, args):
+    entries = find_entries(config, args)
+    if not entries:
+        raise CliError('no such gesture')
+    config.replace(entries[-1], gesture_line(gesture_action(args), args.fingers, gesture_command(args)))
+    config.save()
+    return 0
+
+
+def cmd_delete(config, args):
+    entries = find_entries(config, args)
+    if not entries:
+        raise CliError('no such gesture')
+    for entry in entries:
+        config.remove(entry)
+    config.save()
+    return 0
+
+
+def cmd_validate(config, args):
+    rejected = []
+    with open(args.file or config.path or config_module.CONFIG_LOCATION) as lines:
+        for _ in normalize_lines(lines, rejected):
+            pass
+    report_rejected(rejected)
+    return 1 if rejected else 0
+
+
+def cmd_import(config, args):
+    report_rejected(normalize_config(config.path, source=args.file))
+    config.reload()
+    return 0
+
+
+def defaults_text(helper=False):
+    """KDE defaults with the qdbus binary found, or with helper lines"""
+    qdbus_name = get_qdbus_name()
+    defaults = kde_defaults.format(qdbus=qdbus_name or 'qdbus')
+    if helper or not qdbus_name:
+        defaults = with_action_client(defaults)
+    return defaults
+
+
+def cmd_apply_defaults(config, args):
+    write_defaults(defaults_text(args.helper), config.path)
+    config.reload()
+    return 0
+
+
+def cmd_profile(config, args):
+    store = ProfileStore()
+    store.add_builtin(KDE_PROFILE, defaults_text())
+    if args.action == 'list':
+        active = store.active(config.path)
+        for name in store.names():
+            print('{}{}'.format(name, ' *' if name == active else ''))
+        return 0
+    if not args.name:
+        raise CliError('profile name is required')
+    if args.action == 'save':
+        report_rejected(store.save(args.name, config.serialize().splitlines(True)))
+    elif args.action == 'delete':
+        try:
+            store.delete(args.name)
+        except FileNotFoundError:
+            raise CliError('no such profile')
+    else:
+        try:
+            changed = store.switch(args.name, config.path)
+        except FileNotFoundError:
+            raise CliError('no such profile')
+        if changed:
+            config.reload()
+            restart_libinput_gestures()
+    return 0
+
+
+def require_history(config):
+    if config.history is None:
+        raise CliError('history is not available')
+    return config.history
+
+
+def cmd_history(config, args):
+    history = require_history(config)
+    for version in history.log()[:args.limit]:
+        print('{}{}\t{}\t+{} -{}'.format(
+            version.seq, ' *' if version.seq == history.head else '',
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(version.time)),
+            version.added, version.removed
+        ))
+    return 0
+
+
+def cmd_revert(config, args):
+    try:
+        content = require_history(config).revert(args.version)
+    except KeyError:
+        raise CliError('no such version')
+    config.set_lines(content.splitlines(True))
+    config.save()
+    return 0
+
+
+def add_gesture_arguments(parser, with_command=True):
+    parser.add_argument('type', help='swipe or pinch')
+    parser.add_argument('direction', help='e.g. up, left_down, in, clockwise')
+    parser.add_argument('fingers', type=int)
+    if with_command:
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument('--key', help='keyboard shortcut, e.g. ctrl+alt+Left')
+        group.add_argument('--plasma', help='kwin shortcut name, e.g. "Window Maximize"')
+        group.add_argument('--command', help='any command')
+        add_helper_argument(parser)
+    parser.add_argument(
+        '--device',
+        help='gestures under the "device NAME" line ("" for lines above any device line); '
+             'by default edit and delete look under every device and add appends to the end'
+    )
+
+
+def add_helper_argument(parser):
+    parser.add_argument(
+        '--helper', action='store_true',
+        help='run keys and Plasma actions through libinput-gestures-qt-daemon (must be running)'
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='libinput-gestures-qt-cli',
+        description='Edit libinput-gestures configuration without the GUI'
+    )
+    parser.add_argument('--config', help='configuration file (default: ~/.config/libinput-gestures.conf)')
+    parser.add_argument('--trace', metavar='FILE', help='write a Chrome trace of the run to FILE')
+    commands = parser.add_subparsers(dest='command_name', metavar='command')
+    commands.required = True
+
+    sub = commands.add_parser('list', help='show configured gestures')
+    sub.add_argument('--json', action='store_true')
+    sub.set_defaults(func=cmd_list)
+
+    sub = commands.add_parser('add', help='add a gesture')
+    add_gesture_arguments(sub)
+    sub.set_defaults(func=cmd_add)
+
+    sub = commands.add_parser('edit', help='change the action of a gesture')
+    add_gesture_arguments(sub)
+    sub.set_defaults(func=cmd_edit)
+
+    sub = commands.add_parser('delete', help='delete a gesture')
+    add_gesture_arguments(sub, with_command=False)
+    sub.set_defaults(func=cmd_delete)
+
+    sub = commands.add_parser('validate', help='report invalid lines, exit code 1 if there are any')
+    sub.add_argument('file', nargs='?')
+    sub.set_defaults(func=cmd_validate)
+
+    sub = commands.add_parser('import', help='replace configuration with a normalized copy of FILE')
+    sub.add_argument('file')
+    sub.set_defaults(func=cmd_import)
+
+    sub = commands.add_parser('apply-defaults', help='set KDE Plasma defaults, old config stays in history')
+    add_helper_argument(sub)
+    sub.set_defaults(func=cmd_apply_defaults)
+
+    sub = commands.add_parser('history', help='show saved versions, newest first (* is the current one)')
+    sub.add_argument('--limit', type=int, default=20)
+    sub.set_defaults(func=cmd_history)
+
+    sub = commands.add_parser('revert', help='make an earlier version current, can be reverted as well')
+    sub.add_argument('version', type=int)
+    sub.set_defaults(func=cmd_revert)
+
+    sub = commands.add_parser('profile', help='list, save (current configuration as), switch to or delete a profile')
+    sub.add_argument('action', choices=('list', 'save', 'switch', 'delete'))
+    sub.add_argument('name', nargs='?')
+    sub.set_defaults(func=cmd_profile)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        tracer.enable(args.trace)
+    try:
+        config = Config.load(args.config)
+        try:
+            config.history = History.open(config.path, content=config.serialize())
+        except OSError as e:
+            print('warning: history is not available: {}'.format(e), file=sys.stderr)
+        with tracer.span(args.command_name, 'cli'):
+            return args.func(config, args)
+    except (CliError, OSError) as e:
+        print('error: {}'.format(e), file=sys.stderr)
+        return 1
+    finally:
+        tracer.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,675 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+In-memory model of the libinput-gestures configuration file.
+
+The file is parsed once into a Config, changed in memory and serialized
+only on save. Does not depend on Qt.
+
+Variables:
+--------------
+HOME: str
+    path to user's home directory
+CONFIG_LOCATION: str
+    path to the location of the configuration file
+--------------
+Classes:
+GestureLine
+    'gesture <type> <direction> <fingers> <command>' line
+DeviceLine
+    'device <name>' line
+ThresholdLine
+    'swipe_threshold <value>' line
+Config
+    All lines of the configuration file
+--------------
+Functions: read_config, write_config, current_umask, atomic_write, digest, file_digest, stat_config, write_defaults,
+    check_line, normalize_line, normalize_lines, normalize_config, fix_config, resub_config, parse_line
+--------------
+"""
+
+import os
+import re
+import hashlib
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+
+from libinput_gestures_qt.action_client import ACTION_CLIENT
+from libinput_gestures_qt.trace import tracer
+
+HOME = str(Path.home())
+CONFIG_LOCATION = HOME + '/.config/libinput-gestures.conf'
+
+WHITESPACE = re.compile('[\t ]+')
+QUOTED = re.compile('"(.*?)"')
+
+# os.umask can only be read by setting it, threads of the app must not see the temporary value
+_umask_lock = threading.Lock()
+
+
+def read_config(path=None):
+    """Reads config file by lines
+
+    Config under CONFIG_LOCATION = ~/.config/libinput-gestures.conf
+    Returns '' if there is no config file.
+    """
+    try:
+        with tracer.span('config read', 'config', path=path or CONFIG_LOCATION):
+            with open(path or CONFIG_LOCATION, 'r') as config:
+                conf = config.readlines()
+        return conf
+    except FileNotFoundError:
+        return ''
+
+
+def write_config(new_conf, path=None):
+    """Writes config under CONFIG_LOCATION
+
+    Parameter: new_conf, list of strings
+    Goes through atomic_write, so libinput-gestures never reads a half-written config.
+    """
+    with tracer.span('config write', 'config', path=path or CONFIG_LOCATION):
+        atomic_write(path or CONFIG_LOCATION, ''.join(new_conf))
+
+
+def current_umask():
+    with _umask_lock:
+        umask = os.umask(0o077)
+        os.umask(umask)
+    return umask
+
+
+def atomic_write(path, content, skip_unchanged=False):
+    """Writes content to a temporary file next to path, fsyncs it and renames it over path
+
+    content is a str or an iterable of str (written chunk by chunk).
+    A symlink is written through: its target is replaced, the link stays.
+    Permissions and ownership of the existing file are kept, a new file gets them from the umask.
+    If skip_unchanged is True and path already has the same content, it is left untouched.
+    Returns True if path was replaced.
+    """
+    if isinstance(content, str):
+        content = (content,)
+    path = os.path.realpath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        hasher = hashlib.sha1()
+        with os.fdopen(fd, 'w') as tmp:
+            for chunk in content:
+                tmp.write(chunk)
+                hasher.update(chunk.encode('utf-8'))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        if skip_unchanged and hasher.hexdigest() == file_digest(path):
+            os.unlink(tmp_path)
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o666 & ~current_umask())
+        else:
+            if (stat.st_uid, stat.st_gid) != (os.getuid(), os.getgid()):
+                # only possible for root (or to one's own groups), keep going otherwise
+                with contextlib.suppress(PermissionError):
+                    os.chown(tmp_path, stat.st_uid, stat.st_gid)
+            os.chmod(tmp_path, stat.st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    with contextlib.suppress(OSError):
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
+
+
+def digest(content):
+    """Hash of config content, used to skip writes that change nothing"""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def file_digest(path):
+    """digest() of file content read in blocks, None if there is no such file"""
+    hasher = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                hasher.update(block)
+    except FileNotFoundError:
+        return None
+    return hasher.hexdigest()
+
+
+def stat_config(path=None):
+    """(mtime_ns, size) of config file, None if there is no config file"""
+    try:
+        stat = os.stat(path or CONFIG_LOCATION)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_defaults(defaults, path=None):
+    """Write default settings
+
+    The old config can be restored from history (see history.History) once the file is recorded,
+    e.g. by Config.reload.
+    Returns defaults
+    """
+    atomic_write(path or CONFIG_LOCATION, defaults)
+    return defaults
+
+
+def check_line(line):
+    """Validates a (normalized) line
+
+    Comments and empty lines are ok.
+    'gesture' lines need a known type and direction (see mappings.reversed_mapping), fingers (a number) and command;
+        xdotool commands must be 'xdotool key <keys>',
+        qdbus commands must end with a quoted shortcut name,
+        action client commands must be '<client> key <keys>' or '<client> shortcut "<name>"'.
+    'device' and 'swipe_threshold' lines take exactly one value.
+    Returns None if line is ok, otherwise the reason why it is not.
+    """
+    # mappings imports this module
+    from libinput_gestures_qt.mappings import reversed_mapping
+    splitted = line.split()
+    if not splitted or splitted[0].startswith('#'):
+        return None
+    directive = splitted[0]
+    if directive == 'gesture':
+        if len(splitted) < 5:
+            return 'gesture needs type, direction, fingers and command'
+        if ' '.join(splitted[:3]) not in reversed_mapping:
+            return 'unknown gesture "{} {}"'.format(splitted[1], splitted[2])
+        if not splitted[3].isdigit():
+            return 'fingers must be a number, not "{}"'.format(splitted[3])
+        if splitted[4] == 'xdotool':
+            if len(splitted) != 7 or splitted[5] != 'key':
+                return 'xdotool command must be "xdotool key <keys>"'
+        elif 'qdbus' in splitted[4]:
+            if not splitted[-1].endswith('"'):
+                return 'qdbus command must end with a quoted shortcut name'
+        elif splitted[4] == ACTION_CLIENT:
+            if splitted[5:6] == ['key']:
+                valid = len(splitted) == 7
+            else:
+                valid = splitted[5:6] == ['shortcut'] and len(splitted) > 6 and splitted[-1].endswith('"')
+            if not valid:
+                return '{} command must be "key <keys>" or "shortcut <quoted name>"'.format(ACTION_CLIENT)
+        return None
+    if directive in ('device', 'swipe_threshold'):
+        if len(splitted) != 2:
+            return '{} takes exactly one value'.format(directive)
+        return None
+    return 'unknown directive "{}"'.format(directive)
+
+
+def normalize_line(line):
+    """Collapses tabs and spaces, strips the ends, keeps exactly one newline"""
+    return WHITESPACE.sub(' ', line.strip()) + '\n'
+
+
+def normalize_lines(lines, rejected=None, drop_invalid=True):
+    """Single streaming pass replacing resub + fix
+
+    Takes any iterable of lines (e.g. an open file), yields normalized lines one by one.
+    Invalid lines (see check_line) are dropped if drop_invalid is True;
+    (line number, original line, reason) of each of them is appended to rejected, if it is given.
+    """
+    for lineno, line in enumerate(lines, 1):
+        normalized = normalize_line(line)
+        reason = check_line(normalized)
+        if reason is not None:
+            if rejected is not None:
+                rejected.append((lineno, line.rstrip('\n'), reason))
+            if drop_invalid:
+                continue
+        yield normalized
+
+
+def normalize_config(path=None, source=None, drop_invalid=True):
+    """Normalizes and validates config file in one pass with bounded memory
+
+    Reads source (defaults to the config itself) line by line and writes the result atomically to path.
+    Nothing is written if the result is the same as the config or if there is no config to normalize.
+    Raises FileNotFoundError if source is given but does not exist.
+    Returns list of (line number, line, reason) for rejected lines.
+    """
+    path = path or CONFIG_LOCATION
+    rejected = []
+    try:
+        lines = open(source or path)
+    except FileNotFoundError:
+        if source:
+            raise
+        return rejected
+    with lines:
+        atomic_write(path, normalize_lines(lines, rejected, drop_invalid), skip_unchanged=True)
+    return rejected
+
+
+def fix_config(path=None):
+    """Deletes invalid lines and collapses whitespace, see normalize_config"""
+    return normalize_config(path)
+
+
+def resub_config(path=None):
+    """Delete multiple tabs and spaces, see normalize_config"""
+    return normalize_config(path, drop_invalid=False)
+
+
+class GestureLine:
+    """'gesture <type:swipe|pinch> <direction> <fingers> <command>' line
+
+    Attributes: index (position in file), line (original text), type, direction, fingers, command,
+        device (value of the 'device' line in effect, set by Config.index)
+    """
+    __slots__ = ('index', 'line', 'type', 'direction', 'fingers', 'command', 'device')
+
+    def __init__(self, index, line):
+        self.index = index
+        self.line = line
+        splitted = line.split(None, 4) + [''] * 5
+        self.type, self.direction, self.fingers, self.command = splitted[1:5]
+        self.command = self.command.strip()
+        self.device = None
+
+    @property
+    def index_key(self):
+        """(type, direction, fingers, device), key of Config.index"""
+        return self.type, self.direction, self.fingers, self.device
+
+    @property
+    def key(self):
+        """'gesture <type> <direction> <fingers>', e.g. 'gesture swipe up 3'"""
+        return 'gesture {} {} {}'.format(self.type, self.direction, self.fingers)
+
+    @property
+    def action(self):
+        """Either 'Keyboard shortcut', 'Plasma action' or 'Command'"""
+        splitted = self.command.split()
+        if splitted[:2] in (['xdotool', 'key'], [ACTION_CLIENT, 'key']):
+            return 'Keyboard shortcut'
+        if splitted and ('qdbus' in splitted[0] or splitted[:2] == [ACTION_CLIENT, 'shortcut']):
+            return 'Plasma action'
+        return 'Command'
+
+    @property
+    def uses_client(self):
+        """True if the command goes through the resident helper (action_client.ACTION_CLIENT)"""
+        return self.command.split()[:1] == [ACTION_CLIENT]
+
+    @property
+    def shortcut(self):
+        """Keyboard shortcut (xdotool form, '' if the line has no keys), kwin shortcut name or command"""
+        action = self.action
+        if action == 'Keyboard shortcut':
+            return ' '.join(self.command.split()[2:3])
+        if action == 'Plasma action':
+            plasma_action = QUOTED.findall(self.command)
+            if plasma_action and plasma_action[0]:
+                return plasma_action[0]
+            return self.command.split()[-1].replace('"', '')
+        return ' '.join(self.command.split())
+
+    def is_valid(self):
+        """See check_line"""
+        return check_line(self.line) is None
+
+
+class DeviceLine:
+    """'device <name>' line
+
+    Attributes: index (position in file), line (original text), value
+    """
+    __slots__ = ('index', 'line', 'value')
+
+    def __init__(self, index, line):
+        self.index = index
+        self.line = line
+        splitted = line.split(None, 1)
+        self.value = splitted[1].strip() if len(splitted) > 1 else ''
+
+    def is_valid(self):
+        """See check_line"""
+        return check_line(self.line) is None
+
+
+class ThresholdLine(DeviceLine):
+    """'swipe_threshold <value>' line
+
+    Attributes: index (position in file), line (original text), value
+    """
+    __slots__ = ()
+
+
+line_types = {
+    'gesture': GestureLine,
+    'device': DeviceLine,
+    'swipe_threshold': ThresholdLine,
+}
+
+
+def parse_line(index, line):
+    """Turns a line into GestureLine, DeviceLine or ThresholdLine
+
+    Comments, empty and unknown lines are kept as plain strings.
+    """
+    splitted = line.split(None, 1)
+    if splitted and splitted[0] in line_types:
+        return line_types[splitted[0]](index, line)
+    return line
+
+
+class Config:
+    """All lines of the configuration file
+
+    Parsed once, changed in memory, written only by self.save().
+    self.lines: list of GestureLine, DeviceLine, ThresholdLine or str
+    self.stamp: stat_config() of the file as it was last read or written by self
+    self.digest: digest() of the content as it was last read or written by self
+
+    self.history: history.History that records every content read or written, or None
+
+    Gesture lines are looked up by (type, direction, fingers, device), see self.index.
+    Changes can be batched with self.transaction().
+    """
+    __slots__ = ('path', 'lines', 'stamp', 'digest', 'depth', 'pending', 'by_key', 'end_device', 'history')
+
+    def __init__(self, lines=(), path=None):
+        self.path = path
+        with tracer.span('config parse', 'config'):
+            self.lines = [parse_line(i, line) for i, line in enumerate(lines)]
+        self.stamp = None
+        self.digest = None
+        self.depth = 0
+        self.pending = False
+        self.by_key = None
+        self.end_device = None
+        self.history = None
+
+    @classmethod
+    def load(cls, path=None):
+        """Reads and parses config file"""
+        stamp = stat_config(path)
+        lines = read_config(path)
+        config = cls(lines, path)
+        config.stamp = stamp
+        config.digest = digest(''.join(lines))
+        return config
+
+    def reload(self):
+        """Re-reads the file, e.g. after it was edited outside of the app
+
+        Records of lines that have not changed are reused, not parsed again.
+        """
+        self.stamp = stat_config(self.path)
+        lines = read_config(self.path)
+        self.digest = digest(''.join(lines))
+        self.set_lines(lines, reuse=True)
+        self.record(''.join(lines))
+
+    def record(self, content):
+        """Adds content to self.history; the config itself is never lost if the history cannot be written"""
+        if self.history is not None:
+            with contextlib.suppress(OSError), tracer.span('history record', 'config'):
+                self.history.record(content)
+
+    def changed_on_disk(self):
+        """True if the file was modified (mtime or size) since it was last read or written"""
+        return stat_config(self.path) != self.stamp
+
+    def set_lines(self, lines, reuse=False):
+        """Replaces the whole content, e.g. with an imported config
+
+        If reuse is True, records of unchanged lines are kept.
+        """
+        with tracer.span('config parse', 'config', reuse=reuse):
+            old = {}
+            if reuse:
+                for record in self.lines:
+                    if not isinstance(record, str):
+                        old.setdefault(record.line, []).append(record)
+            self.lines = []
+            self.by_key = None
+            for i, line in enumerate(lines):
+                if old.get(line):
+                    record = old[line].pop(0)
+                    record.index = i
+                else:
+                    record = parse_line(i, line)
+                self.lines.append(record)
+
+    def _reindex(self, start=0):
+        for i in range(start, len(self.lines)):
+            if not isinstance(self.lines[i], str):
+                self.lines[i].index = i
+
+    def gestures(self):
+        """All GestureLine records in file order"""
+        return [line for line in self.lines if isinstance(line, GestureLine)]
+
+    def index(self):
+        """{(type, direction, fingers, device): [GestureLine, ...]}
+
+        device is the value of the last 'device' line above the gesture (None if there is none).
+        Built on first use, kept up to date by append/replace/remove,
+        rebuilt only after the content is replaced or a 'device' line changes.
+        """
+        if self.by_key is None:
+            by_key = {}
+            device = None
+            for record in self.lines:
+                if type(record) is DeviceLine:
+                    device = record.value
+                elif isinstance(record, GestureLine):
+                    record.device = device
+                    by_key.setdefault(record.index_key, []).append(record)
+            self.by_key = by_key
+            self.end_device = device
+        return self.by_key
+
+    def device(self):
+        """Device in effect at the end of file, i.e. for appended lines"""
+        self.index()
+        return self.end_device
+
+    def find(self, type, direction, fingers, device=None):
+        """Gesture lines bound to exactly that gesture, in file order
+
+        device defaults to self.device().
+        """
+        return self.lookup((type, direction, str(fingers), self.device() if device is None else device))
+
+    def find_any(self, type, direction, fingers):
+        """Gesture lines bound to that gesture under any device, in file order"""
+        key = (type, direction, str(fingers))
+        return sorted(
+            (record for records_key, records in self.index().items() if records_key[:3] == key for record in records),
+            key=lambda record: record.index
+        )
+
+    def lookup(self, key):
+        """Gesture lines with that GestureLine.index_key, in file order"""
+        return sorted(self.index().get(key, ()), key=lambda record: record.index)
+
+    def _index_add(self, record, device):
+        if self.by_key is not None and isinstance(record, GestureLine):
+            record.device = device
+            self.by_key.setdefault(record.index_key, []).append(record)
+
+    def _index_remove(self, record):
+        if self.by_key is None:
+            return
+        if type(record) is DeviceLine:
+            self.by_key = None
+        elif isinstance(record, GestureLine):
+            records = self.by_key.get(record.index_key, [])
+            if record in records:
+                records.remove(record)
+            if not records:
+                self.by_key.pop(record.index_key, None)
+
+    def append(self, line):
+        """Adds line to the end, returns its record"""
+        if not line.endswith('\n'):
+            line += '\n'
+        if self.lines and not self.text(self.lines[-1]).endswith('\n'):
+            self.lines[-1] = parse_line(len(self.lines) - 1, self.text(self.lines[-1]) + '\n')
+            self.by_key = None
+        record = parse_line(len(self.lines), line)
+        self.lines.append(record)
+        if type(record) is DeviceLine:
+            self.end_device = record.value
+        self._index_add(record, self.end_device)
+        return record
+
+    def add_for_device(self, line, device):
+        """Adds line after the last line under the last 'device <device>' line, returns its record
+
+        device None means the lines above any 'device' line.
+        If there is no such 'device' line, it is appended first.
+        """
+        if device == self.device():
+            return self.append(line)
+        start = 0 if device is None else None
+        for record in self.lines:
+            if type(record) is DeviceLine and record.value == device:
+                start = record.index + 1
+        if start is None:
+            self.append('device {}'.format(device))
+            return self.append(line)
+        position = next(
+            (record.index for record in self.lines[start:] if type(record) is DeviceLine), len(self.lines)
+        )
+        if not line.endswith('\n'):
+            line += '\n'
+        record = parse_line(position, line)
+        self.lines.insert(position, record)
+        self._reindex(position + 1)
+        if type(record) is DeviceLine:
+            self.by_key = None
+        self._index_add(record, device)
+        return record
+
+    def replace(self, record, line):
+        """Puts line in place of record, returns the new record
+
+        If record is no longer in config (e.g. the file was reloaded), line is appended.
+        """
+        if not self.contains(record):
+            return self.append(line)
+        if not line.endswith('\n'):
+            line += '\n'
+        new_record = parse_line(record.index, line)
+        self.lines[record.index] = new_record
+        if isinstance(record, GestureLine) and not type(new_record) is DeviceLine:
+            self._index_remove(record)
+            self._index_add(new_record, record.device)
+        else:
+            self.by_key = None
+        return new_record
+
+    def contains(self, record):
+        """True if record is one of self.lines (not just an equal line)"""
+        return record.index < len(self.lines) and self.lines[record.index] is record
+
+    def remove(self, record):
+        """Deletes record, if it is still in config"""
+        if not self.contains(record):
+            return
+        del self.lines[record.index]
+        self._reindex(record.index)
+        self._index_remove(record)
+
+    def normalize(self, drop_invalid=True):
+        """Collapses whitespace and drops invalid lines in one pass, see normalize_lines
+
+        Records of lines that have not changed are kept.
+        Returns list of (line number, line, reason) for invalid lines.
+        """
+        with tracer.span('config normalize', 'config'):
+            rejected = []
+            texts = [self.text(line) for line in self.lines]
+            normalized = list(normalize_lines(texts, rejected, drop_invalid))
+            if normalized != texts:
+                self.set_lines(normalized, reuse=True)
+        return rejected
+
+    @staticmethod
+    def text(line):
+        """Original text of a record or a plain line"""
+        return line if isinstance(line, str) else line.line
+
+    def serialize(self):
+        return ''.join(self.text(line) for line in self.lines)
+
+    def save(self):
+        """Writes config under self.path (CONFIG_LOCATION by default)
+
+        Inside self.transaction() only marks config as pending, it is written once at the end.
+        Skips writing if the content is the same as on disk.
+        Returns True if the file was written.
+        """
+        if self.depth:
+            self.pending = True
+            return False
+        self.pending = False
+        content = self.serialize()
+        new_digest = digest(content)
+        if new_digest == self.digest and not self.changed_on_disk():
+            return False
+        write_config(content, self.path)
+        self.stamp = stat_config(self.path)
+        self.digest = new_digest
+        self.record(content)
+        return True
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Batches changes into a single write
+
+        with config.transaction():
+            config.set_lines(...)
+            config.normalize()
+            config.save()
+        Config is written once when the outermost block exits if anything called self.save().
+        If the block raises, in-memory changes are rolled back and nothing is written.
+        """
+        snapshot = list(self.lines) if not self.depth else None
+        self.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.depth -= 1
+            if snapshot is not None:
+                self.lines = snapshot
+                self.by_key = None
+                self._reindex()
+                self.pending = False
+            raise
+        self.depth -= 1
+        if not self.depth and self.pending:
+            self.save()
@@ -0,0 +1,184 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Resident action helper: performs gesture actions without spawning qdbus or xdotool every time.
+
+Usage:
+    libinput-gestures-qt-daemon [--autostart]
+
+Keeps a session bus connection to kglobalaccel and an X connection for key presses,
+listens on action_client.SOCKET_LOCATION for lines sent by libinput-gestures-qt-action.
+
+Variables:
+--------------
+AUTOSTART_LOCATION: str
+    path to the autostart entry written by --autostart
+AUTOSTART_ENTRY: str
+    content of the autostart entry
+MODIFIERS: dict
+    xdotool modifier names >> X keysym names
+--------------
+Classes:
+KeyInjector
+    Presses xdotool-style key combos over a kept-open X connection.
+ActionDaemon(QtCore.QObject)
+    Listens on the socket and dispatches requests.
+--------------
+Functions: install_autostart, main
+--------------
+"""
+
+import os
+import sys
+
+from PyQt5 import QtCore, QtNetwork
+
+from libinput_gestures_qt.config import HOME
+from libinput_gestures_qt.action_client import SOCKET_LOCATION, is_running
+from libinput_gestures_qt.kglobalaccel import KGlobalAccel
+
+AUTOSTART_LOCATION = os.path.join(
+    os.environ.get('XDG_CONFIG_HOME') or os.path.join(HOME, '.config'),
+    'autostart', 'libinput-gestures-qt-daemon.desktop'
+)
+
+MODIFIERS = {
+    'ctrl': 'Control_L',
+    'alt': 'Alt_L',
+    'shift': 'Shift_L',
+    'super': 'Super_L',
+    'meta': 'Meta_L',
+}
+
+AUTOSTART_ENTRY = '''[Desktop Entry]
+Name=libinput-gestures-qt helper
+Comment=Performs gesture actions for libinput-gestures
+Exec=libinput-gestures-qt-daemon
+Terminal=false
+Type=Application
+X-KDE-autostart-phase=1
+'''
+
+
+class KeyInjector:
+    """Presses key combos like 'ctrl+alt+Left' (xdotool syntax)
+
+    Uses XTEST over one X connection if python-xlib is installed,
+    otherwise falls back to running 'xdotool key' for every combo.
+    """
+    def __init__(self):
+        try:
+            from Xlib import X, XK, display
+            from Xlib.ext import xtest
+            self.display = display.Display()
+        except Exception:
+            self.display = None
+            return
+        self.X, self.XK, self.xtest = X, XK, xtest
+        self.keycodes = {}
+
+    def keycode(self, name):
+        """Cached X keycode of an xdotool key name, 0 if it is unknown"""
+        if name not in self.keycodes:
+            keysym = self.XK.string_to_keysym(MODIFIERS.get(name.lower(), name))
+            self.keycodes[name] = self.display.keysym_to_keycode(keysym) if keysym else 0
+        return self.keycodes[name]
+
+    def press(self, keys):
+        keycodes = [self.keycode(name) for name in keys.split('+')] if self.display else [0]
+        if not all(keycodes):
+            QtCore.QProcess.startDetached('xdotool', ['key', keys])
+            return
+        for keycode in keycodes:
+            self.xtest.fake_input(self.display, self.X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            self.xtest.fake_input(self.display, self.X.KeyRelease, keycode)
+        self.display.sync()
+
+
+class ActionDaemon(QtCore.QObject):
+    """Listens on a UNIX socket for 'key <keys>' and 'shortcut <name>' lines
+
+    shortcuts: object with invoke(name), kglobalaccel.KGlobalAccel by default
+    keys: object with press(keys), KeyInjector by default
+    """
+    def __init__(self, path=None, shortcuts=None, keys=None, parent=None):
+        super().__init__(parent)
+        self.path = path or SOCKET_LOCATION
+        self.shortcuts = shortcuts or KGlobalAccel(self)
+        self.keys = keys or KeyInjector()
+        self.server = QtNetwork.QLocalServer(self)
+        self.server.setSocketOptions(QtNetwork.QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+
+    def listen(self):
+        """Starts listening, replacing a stale socket; False if another helper is running"""
+        if is_running(self.path):
+            return False
+        QtNetwork.QLocalServer.removeServer(self.path)
+        return self.server.listen(self.path)
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.read(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            if connection.bytesAvailable():
+                self.read(connection)
+
+    def read(self, connection):
+        while connection.canReadLine():
+            self.handle(bytes(connection.readLine()).decode('utf-8', 'replace').rstrip('\n'))
+
+    def handle(self, request):
+        """Performs one request, returns False if it is not understood"""
+        verb, _, argument = request.partition(' ')
+        if not argument:
+            return False
+        if verb == 'key':
+            self.keys.press(argument)
+        elif verb == 'shortcut':
+            self.shortcuts.invoke(argument)
+        else:
+            return False
+        return True
+
+
+def install_autostart(location=None):
+    """Makes the session start the helper on login"""
+    location = location or AUTOSTART_LOCATION
+    os.makedirs(os.path.dirname(location), exist_ok=True)
+    with open(location, 'w') as entry:
+        entry.write(AUTOSTART_ENTRY)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if '--autostart' in argv:
+        install_autostart()
+    app = QtCore.QCoreApplication(sys.argv[:1])
+    daemon = ActionDaemon()
+    if not daemon.listen():
+        if is_running(daemon.path):
+            return 0
+        print('Cannot listen on {}: {}'.format(daemon.path, daemon.server.errorString()), file=sys.stderr)
+        return 1
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Secondary window for adding/editing gestures.
+
+Imported right after the first paint of the main window (see GesturesApp.prebuild_editor),
+so that edit_window is not loaded before the first paint. The window is built once
+and reset for every add or edit.
+
+Classes:
+EditGestures(QtWidgets.QWidget, edit_window.Ui_Form)
+    Secondary window for adding/editing gestures.
+--------------
+"""
+
+import os
+
+from PyQt5 import QtWidgets, QtGui
+from libinput_gestures_qt import edit_window
+from libinput_gestures_qt.mappings import actions_mapping, find_key_combo, key_command, plasma_command, gesture_line
+
+LOGO_LOCATION = os.path.dirname(os.path.abspath(__file__)) + os.path.sep + 'logo' + os.path.sep + 'libinput-gestures-qt.png'
+
+
+class EditGestures(QtWidgets.QWidget, edit_window.Ui_Form):
+    """Secondary window for adding/editing gestures
+    
+    Child to main window (GesturesApp).
+    """
+    def __init__(self, parent, default=None):
+        """init
+        
+        Sets widgets and their attributes that I could not set in QT Designer.
+        Adds events to buttons. Takes qdbus name found by the main window.
+        default: config.GestureLine to edit or None to add a new gesture, see self.reset
+        Lines already bound to the same gesture are reported in self.conflictLabel as the input changes.
+        Inputs for every action type are created once and switched in self.inputStack.
+        The window is built once and reused, see GesturesApp.show_editor.
+        """
+        super().__init__()
+        self.setupUi(self)
+        self.parent = parent
+        self.setWindowTitle('Add Gestures')
+        self.setWindowIcon(QtGui.QIcon(LOGO_LOCATION))
+        
+        self.QDBUS_NAME = parent.QDBUS_NAME
+
+        self.shortcut_command.activated[str].connect(self.shortcut_command_or_qdbus)
+        self.actionMenu.activated[str].connect(self.action_chosen)
+        self.fingersLine.valueChanged[int].connect(self.fingers_chosen)
+        self.saveButton.clicked.connect(self.save_changes)
+
+        self.helperCheck = QtWidgets.QCheckBox('Use helper')
+        self.helperCheck.setToolTip(
+            'Run keyboard shortcuts and Plasma actions through libinput-gestures-qt-daemon\n'
+            'instead of starting xdotool or qdbus on every gesture (lower latency)'
+        )
+        self.helperCheck.toggled.connect(self.helper_toggled)
+        self.gridLayout.addWidget(self.helperCheck, 5, 1)
+        self.conflictLabel = QtWidgets.QLabel()
+        self.conflictLabel.setWordWrap(True)
+        self.gridLayout.addWidget(self.conflictLabel, 6, 1, 1, 2)
+
+        self.keyboardLine = QtWidgets.QKeySequenceEdit()
+        self.keyboardLine.keySequenceChanged.connect(self.shortcut_chosen)
+        self.plasmaActions = QtWidgets.QComboBox()
+        self.plasmaActions.activated[str].connect(self.plasma_action_chosen)
+        self.commandLine = QtWidgets.QLineEdit()
+        self.commandLine.textChanged[str].connect(self.command_chosen)
+        self.inputStack = QtWidgets.QStackedWidget()
+        for widget in (self.keyboardLine, self.plasmaActions, self.commandLine):
+            self.inputStack.addWidget(widget)
+        self.gridLayout.addWidget(self.inputStack, 4, 2)
+        self.reset(default)
+
+    def reset(self, default=None):
+        """Fills the window for adding a new gesture (default is None) or editing default (config.GestureLine)
+
+        'Use helper' makes shortcuts and Plasma actions go through the resident helper (daemon.py),
+        it is checked if the edited line uses it or, for new lines, if it was checked last time.
+        """
+        self.default_entry = default
+        self.action = None
+        self.fingers = None
+        self.shortcut = ''
+        self.helperCheck.blockSignals(True)
+        self.helperCheck.setChecked(default.uses_client if default else self.parent.use_action_client)
+        self.helperCheck.blockSignals(False)
+        self.conflictLabel.setText('')
+
+        if not default:
+            self.action = 'gesture swipe up'
+            self.fingers = 3
+            self.shortcut = ''
+            self.actionMenu.setCurrentIndex(0)
+            self.shortcut_command.setCurrentIndex(0)
+            self.fingersLine.setMinimum(3)
+            self.fingersLine.setValue(3)
+            self.draw_shortcut()
+            self.check_conflicts()
+        else:
+            splitConf = default.line.split()
+            
+            """ Set gesture value """
+            gesture_syntax = ' '.join(splitConf[:3])
+            gesture_key = ''
+            for gesture, syntax in actions_mapping.items():
+                if syntax == gesture_syntax:
+                    gesture_key = gesture
+            self.action = gesture_syntax
+            self.actionMenu.setCurrentIndex(list(actions_mapping.keys()).index(gesture_key))
+            self.action_chosen(self.actionMenu.currentText())
+
+            """ Set finger value """
+            self.fingers_chosen(splitConf[3])
+            self.fingersLine.setValue(int(self.fingers))
+
+            action = default.action
+            if action == 'Keyboard shortcut':
+                self.shortcut_command.setCurrentIndex(0)
+                self.draw_shortcut()
+                self.keyboardLine.setKeySequence(default.shortcut)
+            elif action == 'Plasma action':
+                self.shortcut_command.setCurrentIndex(1)
+                if self.parent.plasma_available:
+                    self.draw_plasma_actions(default.shortcut)
+                    self.plasma_action_chosen(self.plasmaActions.currentText())
+            else:
+                self.shortcut_command.setCurrentIndex(2)
+                self.draw_command()
+                self.commandLine.setText(default.command)
+                self.command_chosen(self.commandLine.text())
+
+            # self.shortcut_command_or_qdbus(self.shortcut_command.currentText)
+
+    def shortcut_command_or_qdbus(self, text):
+        """Chose whether you want to add plain command, xdotool command using QKeySequenceEdit or qdbus command
+
+        Shows the input for it in self.inputStack, nothing is created.
+        """
+        if text == 'Keyboard Shortcut':
+            self.draw_shortcut()
+        elif text == 'Plasma action':
+            if self.parent.plasma_available:
+                self.draw_plasma_actions()
+        else:
+            self.draw_command()
+        self.check_conflicts()
+
+    def draw_shortcut(self):
+        """Draws keyboard shortcut input
+        
+        ... so that user could just press buttons (sh|h)e wants
+        istead of manually typing 'xdotool key <key combo>' and remember differences between xdotool/Gnome/KDE/etc.
+        """
+        self.shortcut = ''
+        self.actionType.setText('Keyboard Shortcut')
+        self.keyboardLine.blockSignals(True)
+        self.keyboardLine.clear()
+        self.keyboardLine.blockSignals(False)
+        self.inputStack.setCurrentWidget(self.keyboardLine)
+
+    def draw_plasma_actions(self, default=None):
+        """Draws Plasma actions combobox input
+        
+        ... so that user could just choose action for Plasma
+        """
+        self.shortcut = plasma_command(self.QDBUS_NAME, 'Expose', self.helperCheck.isChecked())
+        
+        self.actionType.setText('Plasma action')
+        self.plasmaActions.clear()
+        self.fill_plasma_actions(self.parent.shortcut_catalog.names, default)
+        self.inputStack.setCurrentWidget(self.plasmaActions)
+        self.parent.refresh_kwin_shortcuts()
+
+    def fill_plasma_actions(self, kwin_shortcuts, default=None):
+        """Puts kwin shortcut names into Plasma actions combobox
+
+        Names come from the cached catalog, see GesturesApp.refresh_kwin_shortcuts.
+        Keeps current (or default) choice.
+        """
+        current = default or self.plasmaActions.currentText()
+        kwin_shortcuts = list(kwin_shortcuts)
+        if current and current not in kwin_shortcuts:
+            kwin_shortcuts.append(current)
+        self.plasmaActions.clear()
+        self.plasmaActions.addItems(kwin_shortcuts)
+        if current:
+            self.plasmaActions.setCurrentIndex(kwin_shortcuts.index(current))
+        
+    def draw_command(self):
+        """Draws command input
+        
+        ... because I don't want users to be stuck with xdotool and qdbus
+        """
+        self.shortcut = ''
+        self.actionType.setText('Command')
+        self.commandLine.blockSignals(True)
+        self.commandLine.clear()
+        self.commandLine.blockSignals(False)
+        self.inputStack.setCurrentWidget(self.commandLine)
+
+    def action_chosen(self, text):
+        """Event when fingers action is chosen"""
+        if 'Pinch' in text:
+            self.fingersLine.setMinimum(2)
+            self.fingersLine.setValue(2)
+        else:
+            self.fingersLine.setMinimum(3)
+            self.fingersLine.setValue(3)
+        self.action = actions_mapping[text]
+        self.check_conflicts()
+
+    def fingers_chosen(self, value):
+        """Event when amount of fingers is chosen"""
+        self.fingers = value
+        self.check_conflicts()
+
+    def shortcut_chosen(self, text):
+        """Event when keyboard shortcut is chosen"""
+        shortcut = text.toString().split(',')[0]
+        self.shortcut = key_command(find_key_combo(shortcut), self.helperCheck.isChecked())
+        self.check_conflicts()
+
+    def command_chosen(self, text):
+        """Event when command is typed in"""
+        self.shortcut = text
+        self.check_conflicts()
+
+    def plasma_action_chosen(self, text):
+        self.shortcut = plasma_command(self.QDBUS_NAME, text, self.helperCheck.isChecked())
+        self.check_conflicts()
+
+    def find_conflicts(self):
+        """Other lines bound to the chosen gesture: (same command, other commands)
+
+        Looks under the 'device' of the edited line or, for new lines, the one they are appended to.
+        """
+        if not self.action or not self.fingers:
+            return [], []
+        config = self.parent.config
+        _, gesture_type, direction = self.action.split()
+        device = self.default_entry.device if self.default_entry else config.device()
+        duplicates, conflicts = [], []
+        for record in config.lookup((gesture_type, direction, str(self.fingers), device)):
+            if record is not self.default_entry:
+                (duplicates if record.command == self.shortcut.strip() else conflicts).append(record)
+        return duplicates, conflicts
+
+    def check_conflicts(self):
+        """Shows what the chosen gesture is already bound to"""
+        duplicates, conflicts = self.find_conflicts()
+        if duplicates and self.shortcut:
+            self.conflictLabel.setText('This gesture is already bound to this command.')
+        elif conflicts:
+            self.conflictLabel.setText('This gesture is already bound to: {}'.format(
+                '; '.join(record.command for record in conflicts)
+            ))
+        else:
+            self.conflictLabel.setText('')
+
+    def helper_toggled(self, checked):
+        """Event when 'Use helper' is (un)checked, rebuilds the chosen command and remembers the choice"""
+        self.parent.use_action_client = checked
+        text = self.actionType.text()
+        if text == 'Keyboard Shortcut' and self.shortcut:
+            self.shortcut_chosen(self.keyboardLine.keySequence())
+        elif text == 'Plasma action' and self.shortcut:
+            self.plasma_action_chosen(self.plasmaActions.currentText())
+
+    def save_changes(self):
+        """Writes input data into config file"""
+        if self.action and self.fingers and self.shortcut:
+            config = self.parent.config
+            new_line = gesture_line(self.action, self.fingers, self.shortcut)
+            duplicates, conflicts = self.find_conflicts()
+            if conflicts:
+                reply = QtWidgets.QMessageBox.question(
+                    self, 'Conflict',
+                    "This gesture is already bound to:\n{}\nReplace?".format(
+                        '\n'.join(record.command for record in conflicts)
+                    ),
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                    QtWidgets.QMessageBox.No
+                )
+                if reply != QtWidgets.QMessageBox.Yes:
+                    return
+            with config.transaction():
+                for record in conflicts:
+                    config.remove(record)
+                if duplicates:
+                    # the very same line is already there, do not add another one
+                    if self.default_entry:
+                        config.remove(self.default_entry)
+                elif self.default_entry:
+                    config.replace(self.default_entry, new_line)
+                else:
+                    config.append(new_line)
+                config.save()
+            if self.helperCheck.isChecked():
+                self.parent.start_action_daemon()
+            self.actionMenu.setCurrentIndex(0)
+            self.fingersLine.setValue(0)
+            QtWidgets.QMessageBox.about(self, "Success", "Cofiguration successfully edited.")
+            self.parent.display_config(refresh=True)
+            self.parent.apply_changes()
+            self.close()
+        else:
+            QtWidgets.QMessageBox.about(self, "Fail", "Please, fill all the forms.")
@@ -0,0 +1,88 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Bounded log of libinput-gestures output, memory stays the same however long it runs.
+Does not depend on Qt.
+
+Variables:
+--------------
+CAPACITY: int
+    lines kept by default
+--------------
+Classes:
+EventLog
+    Ring buffer of (sequence number, time, line).
+--------------
+"""
+
+import time
+import collections
+
+CAPACITY = 5000
+
+
+class EventLog:
+    """Last `capacity` lines with their sequence numbers and times
+
+    Older lines are dropped as new ones come, see self.dropped.
+    """
+    def __init__(self, capacity=CAPACITY):
+        self.entries = collections.deque(maxlen=capacity)
+        self.total = 0
+        # lines before the last clear(), sequence numbers go on from self.total
+        self.cleared = 0
+
+    @property
+    def capacity(self):
+        return self.entries.maxlen
+
+    @property
+    def dropped(self):
+        """Lines that did not fit (cleared ones are not counted)"""
+        return self.total - self.cleared - len(self.entries)
+
+    def append(self, line, when=None):
+        self.total += 1
+        self.entries.append((self.total, time.time() if when is None else when, line))
+
+    def clear(self):
+        self.entries.clear()
+        self.cleared = self.total
+
+    def since(self, sequence):
+        """Entries newer than sequence number, oldest first"""
+        newer = []
+        for entry in reversed(self.entries):
+            if entry[0] <= sequence:
+                break
+            newer.append(entry)
+        newer.reverse()
+        return newer
+
+    @staticmethod
+    def matching(entries, text):
+        """Entries whose line contains text (case-insensitive), all of them if text is empty"""
+        if not text:
+            return list(entries)
+        text = text.lower()
+        return [entry for entry in entries if text in entry[2].lower()]
+
+    @staticmethod
+    def format(entry):
+        """'HH:MM:SS.mmm line'"""
+        _, when, line = entry
+        return '{}.{:03d} {}'.format(time.strftime('%H:%M:%S', time.localtime(when)), int(when % 1 * 1000), line)
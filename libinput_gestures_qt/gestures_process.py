@@ -0,0 +1,120 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+libinput-gestures run by the app itself, with its output read line by line.
+
+Classes:
+GesturesProcess(QtCore.QObject)
+    Managed libinput-gestures process.
+--------------
+"""
+
+from PyQt5 import QtCore
+
+from libinput_gestures_qt.trace import tracer
+
+STOP_TIMEOUT_MSEC = 2000
+
+
+class GesturesProcess(QtCore.QObject):
+    """Managed libinput-gestures process (QProcess, nothing blocks the GUI thread)
+
+    stdout and stderr are merged and emitted line by line: line(str).
+    Also emits started(), finished(exit code) and failed(error message) if it cannot be started.
+    libinput-gestures is a python script, it is run unbuffered so that lines arrive when they are printed.
+    """
+    line = QtCore.pyqtSignal(str)
+    started = QtCore.pyqtSignal()
+    finished = QtCore.pyqtSignal(int)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None, program='libinput-gestures', stop_timeout=STOP_TIMEOUT_MSEC):
+        super().__init__(parent)
+        self.program = program
+        self.arguments = []
+        self.restarting = False
+        self.buffer = b''
+        # stopped once the process exits, so that it never kills the next one (see self.restart)
+        self.kill_timer = QtCore.QTimer(self)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.setInterval(stop_timeout)
+        self.kill_timer.timeout.connect(self.kill)
+        self.process = QtCore.QProcess(self)
+        self.process.setProcessChannelMode(QtCore.QProcess.MergedChannels)
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        environment.insert('PYTHONUNBUFFERED', '1')
+        self.process.setProcessEnvironment(environment)
+        self.process.readyReadStandardOutput.connect(self.read)
+        self.process.started.connect(self.started)
+        self.process.finished.connect(self.process_finished)
+        self.process.errorOccurred.connect(self.process_error)
+
+    def start(self, arguments=()):
+        """Starts the program with arguments, e.g. ('--verbose',)"""
+        if self.is_running():
+            return
+        self.buffer = b''
+        self.arguments = list(arguments)
+        tracer.instant(self.program, 'subprocess', argv=[self.program] + self.arguments)
+        self.process.start(self.program, self.arguments)
+
+    def restart(self):
+        """Stops the process and starts it again with the same arguments, e.g. to re-read the config"""
+        if self.is_running():
+            self.restarting = True
+            self.stop()
+
+    def stop(self):
+        """Terminates the process, kills it if it does not exit within STOP_TIMEOUT_MSEC"""
+        if self.is_running():
+            self.process.terminate()
+            self.kill_timer.start()
+
+    def kill(self):
+        if self.is_running():
+            self.process.kill()
+
+    def is_running(self):
+        return self.process.state() != QtCore.QProcess.NotRunning
+
+    def poll(self):
+        """Reads output that is already in the pipe without waiting for the event loop"""
+        if self.is_running():
+            self.process.waitForReadyRead(0)
+        self.read()
+
+    def read(self):
+        """Emits complete lines, keeps the rest until more output arrives"""
+        self.buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self.buffer = self.buffer.split(b'\n')
+        for line in lines:
+            self.line.emit(line.decode('utf-8', 'replace'))
+
+    def process_finished(self, exit_code, exit_status=None):
+        self.kill_timer.stop()
+        self.read()
+        if self.buffer:
+            self.line.emit(self.buffer.decode('utf-8', 'replace'))
+            self.buffer = b''
+        self.finished.emit(exit_code)
+        if self.restarting:
+            self.restarting = False
+            self.start(self.arguments)
+
+    def process_error(self, error):
+        if error == QtCore.QProcess.FailedToStart:
+            self.failed.emit('Cannot start {}: {}'.format(self.program, self.process.errorString()))
@@ -0,0 +1,233 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Model and delegates for the gestures table in the main window.
+
+QTableView asks the model only for the rows it draws,
+and 'Delete'/'Edit' buttons are painted by a delegate instead of being widgets.
+
+Variables:
+--------------
+COLUMNS: tuple of str
+    column titles
+STATUS_COLUMN: int
+    result of validation.Validator
+DELETE_COLUMN: int
+EDIT_COLUMN: int
+--------------
+Functions: diff_rows
+--------------
+Classes:
+GesturesTableModel(QtCore.QAbstractTableModel)
+    Rows of (gesture, fingers, action type, shortcut, button)
+GesturesFilterModel(QtCore.QSortFilterProxyModel)
+    Rows matching the filter bar
+ButtonDelegate(QtWidgets.QStyledItemDelegate)
+    Paints a push button in every cell of a column
+--------------
+"""
+
+import difflib
+
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+from libinput_gestures_qt.search import TokenIndex
+
+COLUMNS = ('Gesture', 'Fingers', 'Type', 'Action', 'Status', '', '')
+STATUS_COLUMN = 4
+DELETE_COLUMN = 5
+EDIT_COLUMN = 6
+COLORS = {'warning': QtCore.Qt.darkYellow, 'error': QtCore.Qt.red}
+
+
+def diff_rows(old_rows, new_rows):
+    """Compares two lists of rows by their buttons
+
+    Returns list of (operation, old_start, old_end, new_start, new_end), last ones first,
+    so that they can be applied one by one without shifting positions.
+    operation is 'insert', 'remove' or 'update'; unchanged rows are skipped.
+    """
+    matcher = difflib.SequenceMatcher(
+        None, [row[4] for row in old_rows], [row[4] for row in new_rows], autojunk=False
+    )
+    operations = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal' or (tag == 'replace' and i2 - i1 == j2 - j1):
+            start = None
+            for offset in range(i2 - i1 + 1):
+                changed = offset < i2 - i1 and old_rows[i1 + offset] != new_rows[j1 + offset]
+                if changed and start is None:
+                    start = offset
+                elif not changed and start is not None:
+                    operations.append(('update', i1 + start, i1 + offset, j1 + start, j1 + offset))
+                    start = None
+        elif tag == 'delete':
+            operations.append(('remove', i1, i2, j1, j1))
+        elif tag == 'insert':
+            operations.append(('insert', i1, i1, j1, j2))
+        else:
+            operations.append(('remove', i1, i2, j1, j1))
+            operations.append(('insert', i2, i2, j1, j2))
+    operations.reverse()
+    return operations
+
+
+class GesturesTableModel(QtCore.QAbstractTableModel):
+    """Rows of (gesture, fingers, action type, shortcut, button)
+
+    'button' is the config.GestureLine of the row (unique even if two lines are bound to one gesture),
+    see GesturesApp.prepare_config_for_displaying.
+    Status column shows self.statuses: {button: (level, message)}, see self.set_statuses.
+    self.tokens (search.TokenIndex) follows the rows, see GesturesFilterModel.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.statuses = {}
+        self.tokens = TokenIndex()
+
+    def set_statuses(self, statuses):
+        """Updates the status column, repaints only rows whose status has changed"""
+        old, self.statuses = self.statuses, dict(statuses)
+        for row, values in enumerate(self.rows):
+            if old.get(values[4]) != self.statuses.get(values[4]):
+                index = self.index(row, STATUS_COLUMN)
+                self.dataChanged.emit(index, index)
+
+    def set_rows(self, rows):
+        """Replaces all rows"""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.tokens.clear()
+        for row in self.rows:
+            self.tokens.add(row)
+        self.endResetModel()
+
+    def update_rows(self, rows):
+        """Replaces rows applying only the differences, see diff_rows
+
+        Untouched rows are not repainted, selection and scroll position are kept.
+        """
+        rows = list(rows)
+        for operation, i1, i2, j1, j2 in diff_rows(self.rows, rows):
+            for row in self.rows[i1:i2]:
+                self.tokens.remove(row)
+            for row in rows[j1:j2]:
+                self.tokens.add(row)
+            if operation == 'update':
+                self.rows[i1:i2] = rows[j1:j2]
+                self.dataChanged.emit(self.index(i1, 0), self.index(i2 - 1, len(COLUMNS) - 1))
+            elif operation == 'remove':
+                self.beginRemoveRows(QtCore.QModelIndex(), i1, i2 - 1)
+                del self.rows[i1:i2]
+                self.endRemoveRows()
+            else:
+                self.beginInsertRows(QtCore.QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self.rows[i1:i1] = rows[j1:j2]
+                self.endInsertRows()
+
+    def button(self, row):
+        return self.rows[row][4]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.column() == STATUS_COLUMN:
+            status = self.statuses.get(self.rows[index.row()][4])
+            if status is None:
+                return None
+            level, message = status
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+                return message or level.upper()
+            if role == QtCore.Qt.ForegroundRole and level in COLORS:
+                return QtGui.QBrush(COLORS[level])
+            return None
+        if role == QtCore.Qt.DisplayRole and index.column() < STATUS_COLUMN:
+            return str(self.rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+
+class GesturesFilterModel(QtCore.QSortFilterProxyModel):
+    """Rows of GesturesTableModel matching self.text, see search.TokenIndex.search
+
+    Terms are looked up in the token index of the source model, not matched against every row.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.text = ''
+
+    def set_filter(self, text):
+        self.text = text
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        source = self.sourceModel()
+        found = source.tokens.search(self.text)
+        return found is None or source.rows[source_row] in found
+
+
+class ButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a push button with self.text in every cell of a column
+
+    Emits clicked(index) when the painted button is clicked.
+    """
+    clicked = QtCore.pyqtSignal(QtCore.QModelIndex)
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self.pressed = None
+
+    def button_option(self, option, index):
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = self.text
+        button.state = QtWidgets.QStyle.State_Enabled
+        if self.pressed is not None and self.pressed == QtCore.QPersistentModelIndex(index):
+            button.state |= QtWidgets.QStyle.State_Sunken
+        return button
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_PushButton, self.button_option(option, index), painter, option.widget)
+
+    def sizeHint(self, option, index):
+        button = self.button_option(option, index)
+        text_size = option.fontMetrics.size(QtCore.Qt.TextShowMnemonic, self.text)
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        return style.sizeFromContents(QtWidgets.QStyle.CT_PushButton, button, text_size, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QtCore.QEvent.MouseButtonPress and event.button() == QtCore.Qt.LeftButton:
+            self.pressed = QtCore.QPersistentModelIndex(index)
+            return True
+        if event.type() == QtCore.QEvent.MouseButtonRelease and self.pressed is not None:
+            clicked = self.pressed == QtCore.QPersistentModelIndex(index) and option.rect.contains(event.pos())
+            self.pressed = None
+            if clicked:
+                self.clicked.emit(index)
+            return True
+        return False
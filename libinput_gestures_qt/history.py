@@ -0,0 +1,325 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Persistent history of the configuration file: undo, redo and revert.
+
+Every saved content is a version, stored as a line-level delta against the version it
+was made from. Each distinct line is stored once, content seen before is stored as
+a reference to the earlier version. Does not depend on Qt.
+
+Journal is an append-only file of JSON lines, one per version or head move:
+    {"v": 3, "p": 1, "t": <time>, "d": <digest>, "c": [added, removed],
+     "new": [new lines], "ops": [[i1, i2, [line ids]], ...] | "full": [line ids] | "same": 1}
+    {"head": 2}
+"p" (parent) is left out if it is the previous version, "d" is the first DIGEST_LENGTH
+characters of config.digest().
+The GUI and the CLI may write the same journal: writers hold an flock on it and read what
+others have appended before they add anything.
+
+Variables:
+--------------
+HISTORY_LOCATION: str
+    directory with one journal per configuration file
+DIGEST_LENGTH: int
+    length of stored digests
+CHECKPOINT: int
+    a full copy (of line ids) is stored once deltas since the last one add up to the size
+    of the content, but not before they add up to CHECKPOINT
+--------------
+Classes:
+Version
+    One saved content of the configuration file
+History
+    Versions of one configuration file and the current one (head)
+--------------
+Functions: journal_location
+--------------
+"""
+
+import os
+import json
+import time
+import fcntl
+import difflib
+import hashlib
+import contextlib
+
+from libinput_gestures_qt.config import HOME, CONFIG_LOCATION, digest, read_config
+
+HISTORY_LOCATION = os.path.join(
+    os.environ.get('XDG_DATA_HOME') or os.path.join(HOME, '.local', 'share'),
+    'libinput-gestures-qt', 'history'
+)
+CHECKPOINT = 64
+DIGEST_LENGTH = 16
+
+
+def journal_location(config_path=None, location=None):
+    """Journal of a configuration file: '<name>-<hash of its absolute path>.jsonl' in location"""
+    config_path = os.path.abspath(config_path or CONFIG_LOCATION)
+    name = '{}-{}.jsonl'.format(
+        os.path.basename(config_path), hashlib.sha1(config_path.encode('utf-8')).hexdigest()[:8]
+    )
+    return os.path.join(location or HISTORY_LOCATION, name)
+
+
+class Version:
+    """One saved content of the configuration file
+
+    Attributes: seq, parent (seq or None), time, digest, added, removed (lines compared to parent),
+        and one of ops (delta against parent), full (line ids) or same (seq with the same content);
+        depth is the size of deltas to apply since the last full copy
+    """
+    __slots__ = ('seq', 'parent', 'time', 'digest', 'added', 'removed', 'ops', 'full', 'same', 'depth')
+
+    def __init__(self, entry, depth):
+        self.seq = entry['v']
+        self.parent = entry.get('p', self.seq - 1)
+        self.time = entry.get('t', 0)
+        self.digest = entry['d']
+        self.added, self.removed = entry.get('c', (0, 0))
+        self.ops = entry.get('ops')
+        self.full = entry.get('full')
+        self.same = entry.get('same')
+        self.depth = depth
+
+
+class History:
+    """Versions of one configuration file
+
+    self.versions: {seq: Version}
+    self.head: seq of the current version, the one undo() steps back from
+    Undo moves head to the parent version, redo to the latest version made from head;
+    neither adds versions. revert(seq) adds a version with the content of seq,
+    so it can be undone as well.
+    self.offset: bytes of the journal read so far, see self.load.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.lock_depth = 0
+        self.lock_file = None
+        self.versions = {}
+        self.children = {}
+        self.head = None
+        self.pool = []
+        self.ids = {}
+        self.by_digest = {}
+        self.cached = (None, None)
+        self.load()
+
+    @classmethod
+    def open(cls, config_path=None, location=None, content=None):
+        """History of config_path (CONFIG_LOCATION by default)
+
+        content (the file as already loaded, e.g. Config.serialize()) is recorded,
+        so that changes made outside of the app can be undone too. The file is read if it is not given.
+        """
+        history = cls(journal_location(config_path, location))
+        if content is None:
+            content = ''.join(read_config(config_path))
+        history.record(content)
+        return history
+
+    def load(self):
+        """Reads what was appended to the journal since the last call
+
+        A broken line (e.g. cut off by a crash, or still being written by another process) ends it.
+        """
+        try:
+            with open(self.path, 'rb') as journal:
+                journal.seek(self.offset)
+                for line in journal:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        self.apply(json.loads(line.decode('utf-8')))
+                    except (ValueError, KeyError, TypeError):
+                        break
+                    self.offset += len(line)
+        except FileNotFoundError:
+            pass
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Holds an exclusive lock on the journal and catches up with what other processes wrote
+
+        Everything that appends goes through it, so versions and line ids are never taken twice.
+        """
+        if self.lock_depth:
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'ab') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.lock_file = lock_file
+            self.lock_depth = 1
+            try:
+                self.load()
+                # nobody writes while we hold the lock: a broken tail is left from a crash
+                if os.fstat(lock_file.fileno()).st_size > self.offset:
+                    lock_file.truncate(self.offset)
+                yield
+            finally:
+                self.lock_depth = 0
+                self.lock_file = None
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def apply(self, entry):
+        """Adds a journal entry to memory"""
+        if 'head' in entry:
+            if entry['head'] not in self.versions:
+                raise KeyError(entry['head'])
+            self.head = entry['head']
+            return
+        for line in entry.get('new', ()):
+            self.ids[line] = len(self.pool)
+            self.pool.append(line)
+        version = Version(entry, 0)
+        if version.ops is not None:
+            version.depth = self.versions[self.resolve(version.parent)].depth
+            version.depth += sum(len(new) + 1 for _, _, new in version.ops)
+        self.versions[version.seq] = version
+        self.children.setdefault(version.parent, []).append(version.seq)
+        self.by_digest.setdefault(version.digest, version.seq)
+        self.head = version.seq
+
+    def write(self, entry):
+        """Appends entry to the journal, only inside self.locked()"""
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+        self.lock_file.write(line)
+        self.lock_file.flush()
+        self.offset += len(line)
+
+    def resolve(self, seq):
+        """seq of the version that actually stores the content of seq"""
+        same = self.versions[seq].same
+        return seq if same is None else same
+
+    def line_ids(self, seq):
+        """Content of a version as a list of line ids"""
+        chain = []
+        seq = self.resolve(seq)
+        while self.cached[0] != seq and self.versions[seq].full is None:
+            chain.append(self.versions[seq])
+            seq = self.resolve(self.versions[seq].parent)
+        ids = list(self.cached[1] if self.cached[0] == seq else self.versions[seq].full)
+        for version in reversed(chain):
+            for i1, i2, new in version.ops:
+                ids[i1:i2] = new
+        if chain:
+            seq = chain[0].seq
+        self.cached = (seq, ids)
+        return list(ids)
+
+    def content(self, seq):
+        return ''.join(self.pool[i] for i in self.line_ids(seq))
+
+    def record(self, content):
+        """Adds content as a new version made from head
+
+        Does nothing if it is the content of head. Returns seq of the new version or None.
+        """
+        with self.locked():
+            return self._record(content)
+
+    def _record(self, content):
+        new_digest = digest(content)[:DIGEST_LENGTH]
+        if self.head is not None and self.versions[self.head].digest == new_digest:
+            return None
+        seq = max(self.versions, default=0) + 1
+        entry = {'v': seq, 't': int(time.time()), 'd': new_digest}
+        if self.head != seq - 1:
+            entry['p'] = self.head
+        new_ids = {}
+        ids = []
+        for line in content.splitlines(True):
+            if line not in self.ids and line not in new_ids:
+                new_ids[line] = len(self.pool) + len(new_ids)
+            ids.append(self.ids[line] if line in self.ids else new_ids[line])
+        new_lines = list(new_ids)
+        base = self.line_ids(self.head) if self.head is not None else []
+        ops = []
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, base, ids, autojunk=False).get_opcodes():
+            if tag != 'equal':
+                ops.append([i1, i2, ids[j1:j2]])
+        ops.reverse()
+        entry['c'] = [sum(len(new) for _, _, new in ops), sum(i2 - i1 for i1, i2, _ in ops)]
+        if new_digest in self.by_digest:
+            entry['same'] = self.resolve(self.by_digest[new_digest])
+        else:
+            if new_lines:
+                entry['new'] = new_lines
+            depth = sum(len(new) + 1 for _, _, new in ops)
+            if self.head is not None:
+                depth += self.versions[self.resolve(self.head)].depth
+            if self.head is None or depth >= max(CHECKPOINT, len(ids)):
+                entry['full'] = ids
+            else:
+                entry['ops'] = ops
+        self.write(entry)
+        self.apply(entry)
+        return entry['v']
+
+    def move_head(self, seq):
+        with self.locked():
+            self.write({'head': seq})
+            self.head = seq
+        return self.content(seq)
+
+    def can_undo(self):
+        return self.head is not None and self.versions[self.head].parent is not None
+
+    def can_redo(self):
+        return bool(self.children.get(self.head))
+
+    def undo(self):
+        """Steps back to the parent of head, returns its content (None if there is nothing to undo)"""
+        with self.locked():
+            if not self.can_undo():
+                return None
+            return self.move_head(self.versions[self.head].parent)
+
+    def redo(self):
+        """Steps forward to the latest version made from head, returns its content or None"""
+        with self.locked():
+            if not self.can_redo():
+                return None
+            return self.move_head(max(self.children[self.head]))
+
+    def revert(self, seq):
+        """Makes the content of version seq current again, returns it
+
+        Raises KeyError if there is no such version.
+        """
+        content = self.content(seq)
+        self.record(content)
+        return content
+
+    def log(self):
+        """All versions, newest first"""
+        return sorted(self.versions.values(), key=lambda version: version.seq, reverse=True)
+
+    def size(self):
+        """Size of the journal in bytes"""
+        with contextlib.suppress(OSError):
+            return os.path.getsize(self.path)
+        return 0
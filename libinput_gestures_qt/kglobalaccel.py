@@ -0,0 +1,111 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+In-process access to kglobalaccel (kwin shortcuts) over QtDBus, no qdbus binary is needed.
+
+Variables:
+--------------
+SERVICE: str
+PATH: str
+INTERFACE: str
+    where kwin shortcuts live on the session bus
+--------------
+Classes:
+KGlobalAccel(QtCore.QObject)
+    Probes, lists and invokes kwin shortcuts with asynchronous calls.
+--------------
+Functions: invoke_shortcut
+--------------
+"""
+
+from PyQt5 import QtCore, QtDBus
+
+SERVICE = 'org.kde.kglobalaccel'
+PATH = '/component/kwin'
+INTERFACE = 'org.kde.kglobalaccel.Component'
+
+
+def _method_call(name, *arguments, service=SERVICE, path=PATH, interface=INTERFACE):
+    message = QtDBus.QDBusMessage.createMethodCall(service, path, interface, name)
+    message.setArguments(list(arguments))
+    return message
+
+
+class KGlobalAccel(QtCore.QObject):
+    """kwin component of kglobalaccel
+
+    bus: QtDBus.QDBusConnection, the session bus by default (tests pass a private one).
+    Nothing blocks: results arrive as signals
+        probed(bool) -- whether kglobalaccel is on the bus, see self.probe
+        listed(list) -- sorted shortcut names, see self.list_shortcuts
+        failed(str) -- error of a failed listing
+    """
+    probed = QtCore.pyqtSignal(bool)
+    listed = QtCore.pyqtSignal(list)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None, bus=None):
+        super().__init__(parent)
+        self.bus = QtDBus.QDBusConnection.sessionBus() if bus is None else bus
+
+    def _call(self, message, on_reply, on_error=None):
+        """Sends message, calls on_reply(arguments) or on_error(error) when the answer arrives
+
+        on_error defaults to emitting failed(error).
+        """
+        watcher = QtDBus.QDBusPendingCallWatcher(self.bus.asyncCall(message), self)
+
+        def finished(watcher):
+            reply = QtDBus.QDBusPendingReply(watcher).reply()
+            watcher.deleteLater()
+            if reply.type() == QtDBus.QDBusMessage.ErrorMessage:
+                (on_error or self.failed.emit)(reply.errorMessage() or reply.errorName() or 'D-Bus error')
+            else:
+                on_reply(reply.arguments())
+        watcher.finished.connect(finished)
+
+    def probe(self):
+        """Asks the bus whether kglobalaccel is running, emits probed(bool)"""
+        if not self.bus.isConnected():
+            QtCore.QTimer.singleShot(0, lambda: self.probed.emit(False))
+            return
+        message = _method_call(
+            'NameHasOwner', SERVICE,
+            service='org.freedesktop.DBus', path='/org/freedesktop/DBus', interface='org.freedesktop.DBus'
+        )
+        self._call(
+            message,
+            lambda arguments: self.probed.emit(bool(arguments and arguments[0])),
+            lambda error: self.probed.emit(False)
+        )
+
+    def list_shortcuts(self):
+        """Asks for kwin shortcut names, emits listed(names) or failed(error)"""
+        self._call(_method_call('shortcutNames'), lambda arguments: self.listed.emit(sorted(arguments[0])))
+
+    def invoke(self, name):
+        """Invokes kwin shortcut, does not wait for the answer"""
+        self.bus.send(_method_call('invokeShortcut', name))
+
+
+def invoke_shortcut(name, bus=None):
+    """Blocking invokeShortcut for scripts without an event loop, returns whether it succeeded"""
+    if QtCore.QCoreApplication.instance() is None:
+        invoke_shortcut.app = QtCore.QCoreApplication([])
+    bus = QtDBus.QDBusConnection.sessionBus() if bus is None else bus
+    reply = bus.call(_method_call('invokeShortcut', name))
+    return reply.type() != QtDBus.QDBusMessage.ErrorMessage
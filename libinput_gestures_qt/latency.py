@@ -0,0 +1,125 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Gesture latency bookkeeping: from the moment libinput-gestures reports a gesture
+to the moment the command it dispatched has finished. Does not depend on Qt.
+
+For a measurement, libinput-gestures runs a copy of the config (see measurement_config)
+in which every command reports its completion by writing its gesture to a FIFO.
+The Qt side is in latency_window.py.
+
+Variables:
+--------------
+GESTURE_PATTERN: re.Pattern
+    '<type> <direction> <fingers>' in libinput-gestures verbose output
+PERCENTILES: tuple of int
+    percentiles reported for every gesture
+--------------
+Classes:
+LatencyRecorder
+    Pairs gestures with completions, keeps latencies per gesture.
+--------------
+Functions: parse_gesture, measurement_config, percentile
+--------------
+"""
+
+import re
+import json
+import shlex
+import collections
+
+from libinput_gestures_qt.config import GestureLine, parse_line
+
+GESTURE_PATTERN = re.compile(r'\b(swipe|pinch|hold)\s+([a-z_]+)\s+(\d+)\b', re.IGNORECASE)
+PERCENTILES = (50, 90, 99)
+
+
+def parse_gesture(line):
+    """'gesture <type> <direction> <fingers>' reported in a line of verbose output, None if there is none"""
+    found = GESTURE_PATTERN.search(line)
+    if not found:
+        return None
+    return 'gesture {} {} {}'.format(found.group(1).lower(), found.group(2).lower(), found.group(3))
+
+
+def measurement_config(lines, done_path):
+    """Copy of config lines where every gesture command appends its gesture to done_path when it finishes
+
+    Commands are wrapped into 'sh -c', which is part of the measured time (a shell start, ~1 ms).
+    """
+    measured = []
+    for line in lines:
+        entry = parse_line(0, line)
+        if isinstance(entry, GestureLine) and entry.command:
+            script = '{}; echo {} >> {}'.format(entry.command, shlex.quote(entry.key), shlex.quote(done_path))
+            line = '{} sh -c {}\n'.format(entry.key, shlex.quote(script))
+        measured.append(line)
+    return measured
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    rank = max(1, -(-p * len(values) // 100))
+    return values[rank - 1]
+
+
+class LatencyRecorder:
+    """Latencies (seconds) per gesture
+
+    self.gesture(key, time) when libinput-gestures reports a gesture,
+    self.done(key, time) when its command has finished.
+    Completions are paired with the oldest unfinished gesture of the same key.
+    """
+    def __init__(self):
+        self.pending = collections.defaultdict(collections.deque)
+        self.samples = collections.defaultdict(list)
+
+    def gesture(self, key, time):
+        self.pending[key].append(time)
+
+    def done(self, key, time):
+        """Returns the latency or None if there was no such gesture"""
+        if not self.pending[key]:
+            return None
+        latency = time - self.pending[key].popleft()
+        self.samples[key].append(latency)
+        return latency
+
+    def clear(self):
+        self.pending.clear()
+        self.samples.clear()
+
+    def summary(self):
+        """{gesture: {'count', 'mean', 'p50', 'p90', 'p99', 'max'}}, times in milliseconds"""
+        result = {}
+        for key, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            stats = {'count': len(ordered), 'mean': sum(ordered) / len(ordered) * 1000}
+            for p in PERCENTILES:
+                stats['p{}'.format(p)] = percentile(ordered, p) * 1000
+            stats['max'] = ordered[-1] * 1000
+            result[key] = stats
+        return result
+
+    def to_json(self):
+        """Summary and raw samples (milliseconds) as JSON"""
+        return json.dumps({
+            'summary': self.summary(),
+            'samples': {key: [latency * 1000 for latency in samples] for key, samples in sorted(self.samples.items())},
+        }, indent=2)
@@ -0,0 +1,204 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Gesture latency measurement (Utility > Measure latency).
+
+Imported only when the panel is opened for the first time.
+
+Classes:
+LatencySession(QtCore.QObject)
+    Runs libinput-gestures on a measurement copy of the config and records latencies.
+LatencyWindow(QtWidgets.QWidget)
+    Start/Stop, per-gesture percentiles and JSON export.
+--------------
+"""
+
+import os
+import time
+import shutil
+import tempfile
+
+from PyQt5 import QtWidgets, QtCore
+
+from libinput_gestures_qt.config import atomic_write
+from libinput_gestures_qt.latency import LatencyRecorder, measurement_config, parse_gesture, PERCENTILES
+from libinput_gestures_qt.gestures_process import GesturesProcess
+
+COLUMNS = ('Gesture', 'Count', 'Mean') + tuple('p{}'.format(p) for p in PERCENTILES) + ('Max',)
+
+
+class LatencySession(QtCore.QObject):
+    """libinput-gestures --verbose on a measurement copy of config (see latency.measurement_config)
+
+    A gesture starts when libinput-gestures reports it and ends when its command
+    writes to a FIFO in a temporary directory. Emits updated() after every completed gesture,
+    message(str) with status changes.
+    libinput-gestures refuses to run twice, the usual instance has to be stopped first.
+    """
+    updated = QtCore.pyqtSignal()
+    message = QtCore.pyqtSignal(str)
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.recorder = LatencyRecorder()
+        self.directory = None
+        self.fds = ()
+        self.notifier = None
+        self.done_buffer = b''
+        self.last_line = ''
+        self.process = GesturesProcess(self)
+        self.process.line.connect(self.gesture_line)
+        self.process.started.connect(lambda: self.message.emit('Measuring, do some gestures'))
+        self.process.finished.connect(self.process_finished)
+        self.process.failed.connect(self.failed)
+
+    def start(self):
+        if self.process.is_running():
+            return
+        self.directory = tempfile.mkdtemp(prefix='libinput-gestures-qt-latency-')
+        done_path = os.path.join(self.directory, 'done')
+        config_path = os.path.join(self.directory, 'libinput-gestures.conf')
+        os.mkfifo(done_path, 0o600)
+        # a writer of our own keeps the FIFO from reporting EOF between commands
+        reader = os.open(done_path, os.O_RDONLY | os.O_NONBLOCK)
+        self.fds = (reader, os.open(done_path, os.O_WRONLY | os.O_NONBLOCK))
+        self.notifier = QtCore.QSocketNotifier(reader, QtCore.QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self.read_done)
+        atomic_write(config_path, measurement_config(self.config.serialize().splitlines(True), done_path))
+        self.process.start(['--verbose', '--conffile', config_path])
+
+    def stop(self):
+        self.process.stop()
+
+    def gesture_line(self, line):
+        """Line of libinput-gestures output, a gesture starts if it reports one"""
+        if line.strip():
+            self.last_line = line.strip()
+        if self.directory and self.directory in line:
+            return  # the (wrapped) command being printed, not a gesture
+        key = parse_gesture(line)
+        if key:
+            self.recorder.gesture(key, time.perf_counter())
+
+    def read_done(self):
+        """Completed commands: one gesture per line in the FIFO
+
+        Output of libinput-gestures is read first, the gesture may be reported
+        in the same event loop iteration as its completion.
+        """
+        self.process.poll()
+        now = time.perf_counter()
+        try:
+            self.done_buffer += os.read(self.fds[0], 65536)
+        except BlockingIOError:
+            return
+        *lines, self.done_buffer = self.done_buffer.split(b'\n')
+        for line in lines:
+            if self.recorder.done(line.decode('utf-8', 'replace').strip(), now) is not None:
+                self.updated.emit()
+
+    def failed(self, error):
+        self.message.emit(error)
+        self.cleanup()
+
+    def process_finished(self, exit_code):
+        if exit_code:
+            self.message.emit('libinput-gestures exited ({}): {}'.format(exit_code, self.last_line))
+        else:
+            self.message.emit('Stopped')
+        self.cleanup()
+
+    def cleanup(self):
+        if self.notifier:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = ()
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+class LatencyWindow(QtWidgets.QWidget):
+    """Latency panel: Start/Stop, Clear, Export JSON and a table of per-gesture percentiles (ms)"""
+    def __init__(self, config, parent=None):
+        super().__init__(parent, QtCore.Qt.Window)
+        self.setWindowTitle('Gesture latency')
+        self.resize(640, 320)
+        self.session = LatencySession(config, self)
+        self.session.updated.connect(self.display)
+        self.session.message.connect(self.show_message)
+        self.session.process.started.connect(lambda: self.startButton.setText('Stop'))
+        self.session.process.finished.connect(lambda code: self.startButton.setText('Start'))
+
+        self.status = QtWidgets.QLabel(
+            'Stop libinput-gestures (Service > Stop) before measuring, it cannot run twice.'
+        )
+        self.status.setWordWrap(True)
+        self.table = QtWidgets.QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.startButton = QtWidgets.QPushButton('Start')
+        self.startButton.clicked.connect(self.start_or_stop)
+        clearButton = QtWidgets.QPushButton('Clear')
+        clearButton.clicked.connect(self.clear)
+        exportButton = QtWidgets.QPushButton('Export JSON')
+        exportButton.clicked.connect(self.export)
+
+        buttons = QtWidgets.QHBoxLayout()
+        for button in (self.startButton, clearButton, exportButton):
+            buttons.addWidget(button)
+        buttons.addStretch()
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.status)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+    def start_or_stop(self):
+        if self.session.process.is_running():
+            self.session.stop()
+        else:
+            self.session.start()
+
+    def clear(self):
+        self.session.recorder.clear()
+        self.display()
+
+    def show_message(self, text):
+        self.status.setText(text)
+
+    def display(self):
+        summary = self.session.recorder.summary()
+        self.table.setRowCount(len(summary))
+        for row, (key, stats) in enumerate(summary.items()):
+            values = [key[len('gesture '):], str(stats['count'])]
+            values += ['{:.1f}'.format(stats[column.lower()]) for column in COLUMNS[2:]]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(value))
+
+    def export(self):
+        fname = QtWidgets.QFileDialog.getSaveFileName(self, 'Export', 'gesture-latency.json', 'JSON (*.json)')[0]
+        if fname:
+            atomic_write(fname, self.session.recorder.to_json())
+
+    def closeEvent(self, event):
+        self.session.stop()
+        super().closeEvent(event)
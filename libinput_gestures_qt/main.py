@@ -20,149 +20,54 @@ allows to edit the configuration file and control utility status.
 
 Variables:
 --------------
-Paths:
------
-HOME: str
-    path to user's home directory
-CONFIG_LOCATION: str
-    path to the location of the configuration file
 LOGO_LOCATION: str
     path to logo
-Mappings:
---------
-actions_mapping: dict
-    finger actions in human-readable form >> finger actions in config-readable form
-reversed_mapping: dict
-    finger actions in config-readable form >> finger actions in human-readable form
-keys_mapping: dict
-    qt keys (lowered) >> xdotool keys
-Other:
------
-kde_defaults: str
-    Default settings for KDE Plasma
-kde_defaults_description: str
-    Descriptin for KDE defaults.
 copyleft: str
     Copyleft note.
+Paths (HOME, CONFIG_LOCATION) are in config.py,
+mappings, KDE defaults and find_key_combo are in mappings.py,
+get_qdbus_name, get_installed and the executor of external commands are in process.py,
+kglobalaccel access is in kglobalaccel.py.
 --------------
 Classes:
 GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow)
     Main window.
 EditGestures(QtWidgets.QWidget, edit_window.Ui_Form)
-    Secondary window for adding/editing gestures.
+    Secondary window for adding/editing gestures (see editor.py, built once after the main window shows).
+LatencyWindow(QtWidgets.QWidget)
+    Gesture latency panel (see latency_window.py, imported when first needed).
+MonitorWindow(QtWidgets.QWidget)
+    Live libinput-gestures output (see monitor_window.py, imported when first needed).
+FirstPaintFilter(QtCore.QObject)
+    Marks the first paint of the main window for --profile-startup, then the editor is built.
 --------------
-Functions: read_config, write_config, find_key_combo, getqdbus_name, main
+Functions: main
 --------------
 """
 
 import os
-import re
 import sys
-import subprocess
-import functools
-from pathlib import Path
 from PyQt5 import QtWidgets, QtCore, QtGui
 from libinput_gestures_qt import main_window
-from libinput_gestures_qt import edit_window
+from libinput_gestures_qt.worker import run_in_background
+from libinput_gestures_qt.startup import profiler
+from libinput_gestures_qt.trace import tracer, take_trace_argument
+from libinput_gestures_qt.process import run, executor, get_qdbus_name, get_installed, kill_libinput_gestures, STATUS_TTL
+from libinput_gestures_qt.mappings import reversed_mapping, kde_defaults, kde_defaults_description, with_action_client
+from libinput_gestures_qt.shortcuts import ShortcutCatalog
+from libinput_gestures_qt.kglobalaccel import KGlobalAccel
+from libinput_gestures_qt.watcher import ConfigWatcher
+from libinput_gestures_qt.event_log import EventLog
+from libinput_gestures_qt.gestures_process import GesturesProcess
+from libinput_gestures_qt.restarter import Restarter
+from libinput_gestures_qt.validation import Validator
+from libinput_gestures_qt.gestures_table import GesturesTableModel, GesturesFilterModel, ButtonDelegate, DELETE_COLUMN, EDIT_COLUMN
+from libinput_gestures_qt.config import HOME, CONFIG_LOCATION, Config, write_defaults, normalize_config
+from libinput_gestures_qt.history import History
+from libinput_gestures_qt.profiles import ProfileStore, KDE_PROFILE
 
-# NOTE `capture_output` was introduced in 3.7
-if sys.version_info.minor < 7:
-    run = functools.partial(subprocess.run, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-else:
-    run = functools.partial(subprocess.run, capture_output=True)
-
-HOME = str(Path.home())
-CONFIG_LOCATION = HOME + '/.config/libinput-gestures.conf'
 LOGO_LOCATION = os.path.dirname(os.path.abspath(__file__)) + os.path.sep + 'logo' + os.path.sep + 'libinput-gestures-qt.png'
 
-actions_mapping = {
-    'Swipe Up': 'gesture swipe up',
-    'Swipe Down': 'gesture swipe down',
-    'Swipe Left': 'gesture swipe left',
-    'Swipe LeftUp': 'gesture swipe left_up',
-    'Swipe LeftDown': 'gesture swipe  left_down',
-    'Swipe Right': 'gesture swipe right',
-    'Swipe RightUp': 'gesture swipe right_up',
-    'Swipe RightDown': 'gesture swipe right_down',
-    'Pinch In': 'gesture pinch in',
-    'Pinch Out': 'gesture pinch out',
-    'Pinch Clockwise': 'gesture pinch clockwise',
-    'Pinch Anticlockwise': 'gesture pinch anticlockwise',
-}
-
-reversed_mapping = {
-    'gesture swipe up': 'Swipe Up',
-    'gesture swipe down': 'Swipe Down',
-    'gesture swipe left': 'Swipe Left',
-    'gesture swipe left_up': 'Swipe LeftUp',
-    'gesture swipe left_down': 'Swipe LeftDown',
-    'gesture swipe right': 'Swipe Right',
-    'gesture swipe right_up': 'Swipe RightUp',
-    'gesture swipe right_down': 'Swipe RightDown',
-    'gesture pinch in': 'Pinch In',
-    'gesture pinch out': 'Pinch Out',
-    'gesture pinch clockwise': 'Pinch Clockwise',
-    'gesture pinch anticlockwise': 'Pinch Anticlockwise'
-}
-
-keys_mapping = {
-    'meta': 'super',
-    'pgdown': 'Page_Down',
-    'pgup': 'Page_Up',
-    'right': 'Right',
-    'left': 'Left',
-    'up': 'Up',
-    'down': 'Down',
-    'f1': 'F1',
-    'f2': 'F2',
-    'f3': 'F3',
-    'f4': 'F4',
-    'f5': 'F5',
-    'f6': 'F6',
-    'f7': 'F7',
-    'f8': 'F8',
-    'f9': 'F9',
-    'f10': 'F10',
-    'f11': 'F11',
-    'f12': 'F12',
-}
-
-kde_defaults = '''
-#This default settings for KDE Plasma generated by libinput-gestures-qt
-#
-#Browser actions Back and Forward
-gesture swipe left 3 xdotool key alt+Right
-gesture swipe right 3 xdotool key alt+Left
-#
-#Present Windows
-gesture swipe down 3 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Expose"
-#
-#Desktop Grid
-gesture swipe up 3  {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "ShowDesktopGrid"
-#
-#Minimize
-gesture swipe down 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Window Minimize"
-#
-#Maximize
-gesture swipe up 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Window Maximize"
-#
-#Next virtual desktop
-gesture swipe left 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Switch to Next Desktop"
-#Previous virtual desktop
-gesture swipe right 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Switch to Previous Desktop"
-'''
-
-kde_defaults_description = '''
-Present windows: Swipe Down (3 fingers)
-Desktop Grid: Swipe Up (3 fingers)
-Maximize: Swipe Up (4 fingers)
-Minimize: Swipe Down (4 fingers)
-Next virtual desktop: Swipe Left (4 fingers)
-Previous virtual desktop: Swipe Right (4 fingers)
-Browser 'Back': Swipe Right (3 fingers)
-Browser 'Forward': Swipe Left (3 fingers)
-'''
-
 copyleft = '''
 libinput-gestures-qt
 Copyright (C) 2019  Michael Voronov
@@ -171,108 +76,6 @@ This is free software, and you are welcome to redistribute it
 under certain conditions.
 '''
 
-def read_config():
-    """Reads config file by lines
-    
-    Config under CONFIG_LOCATION = ~/.config/libinput-gestures.conf
-    Returns '' if there is no config file.
-    """
-    try:
-        with open(CONFIG_LOCATION, 'r') as config:
-            conf = config.readlines()
-        return conf
-    except FileNotFoundError:
-        return ''
-
-
-def write_config(new_conf):
-    """Writes config under CONFIG_LOCATION
-    
-    Parameter: new_conf, list of strings
-    """
-    with open(CONFIG_LOCATION, 'w') as config:
-        config.write(''.join(new_conf))
-
-
-def write_defaults(defaults):
-    """Write default settings and backs old config up
-
-    Returns defaults
-    """
-    old_conf = read_config()
-    with open(CONFIG_LOCATION + '.old', 'w') as config:
-        config.write(''.join(old_conf))
-    with open(CONFIG_LOCATION, 'w') as config:
-        config.write(defaults)
-    return defaults
-
-
-def fix_config():
-    """Fixes config
-    
-    Reads config, goes by lines.
-    If lise starts with '#', it is preserved.
-    If line starts with 'gesture', 'device' or 'swipe_threshold'
-        and this line is ok, it is preserved.
-    Other lines are deleted.
-    """
-    conf = read_config()
-    fixed_conf = []
-    for line in conf:
-        if line.startswith('#') or line == '\n':
-            fixed_conf.append(line)
-        else:
-            splitted = line.replace('\t', ' ').split()
-            if splitted[0] in ['gesture', 'device', 'swipe_threshold']:
-                if splitted[0] == 'gesture':
-                    if splitted[4] == 'xdotool':
-                        if splitted[5] == 'key' and len(splitted) == 7:
-                            fixed_conf.append(line)
-                    elif 'qdbus' in splitted[4]:
-                        if splitted[-1].endswith('"'):
-                            fixed_conf.append(line)
-                    else:
-                        fixed_conf.append(line)
-                else:
-                    if len(splitted) == 2:
-                            fixed_conf.append(line)
-    write_config(''.join(fixed_conf))
-
-
-def resub_config():
-    """Delete multiple tabs and spaces"""
-    conf = ''.join(read_config())
-    conf = re.sub('(\t)+', ' ', conf)
-    conf = re.sub('\t', ' ', conf)
-    conf = re.sub('( )+', ' ', conf)
-    write_config(conf)
-
-
-def find_key_combo(qt_key_combo):
-    """Key combo translator
-    
-    Takes string with QT-like key combo (generated by PyQt5.QtWidgets.QKeySequenceEdit)
-    mapes into a string consumable by xdotool
-    """
-    xdotool_key_combo = []
-    for qt_key in qt_key_combo.split('+'):
-        lowered_key = qt_key.lower()
-        if lowered_key in keys_mapping:
-            xdotool_key_combo.append(keys_mapping[lowered_key])
-        else:
-            xdotool_key_combo.append(lowered_key)
-    return '+'.join(xdotool_key_combo)
-
-
-def get_qdbus_name():
-    """It's either 'qdbus' or 'qdbus-qt5'"""
-    try:
-        run(['qdbus'])
-        return 'qdbus'
-    except FileNotFoundError:
-        run(['qdbus-qt5'])
-        return 'qdbus-qt5'
-
 
 class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
     """Main window.
@@ -282,35 +85,51 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
     def __init__(self, parent=None):
         """init
         
+        Loads config once into self.config (shared with EditGestures windows).
         Calls for self.display_config() and adds triggers to all the events.
         Resubs config (multiple tabs and spaces)
-        Tries to launch libinput-gestures-setup:
-            if it works, sets self.installed to True
-            if not sets self.installed to False
+        Starts probing for kglobalaccel and libinput-gestures-setup in background,
+        see self.start_probes. Until they report, self.plasma_available and self.installed are None.
+        The editor window is built right after the first paint, see self.prebuild_editor.
+        self.QDBUS_NAME is only used to write qdbus lines, without it lines use the resident helper.
         """
         super().__init__()
-        self.setupUi(self)
+        with profiler.span('setupUi'):
+            self.setupUi(self)
         self.setWindowTitle('Libinput Gestures Qt')
 
         self.setWindowIcon(QtGui.QIcon(LOGO_LOCATION))
         self.QDBUS_NAME = get_qdbus_name()
-        if not self.QDBUS_NAME:
-            reply = QtWidgets.QMessageBox.question(self, "Cannot find qdbus",
-                                                   'Unable to find qdbus binary.\n'
-                                                   'It is a utility included into KDE Plasma used by this app.\n'
-                                                   'If you have qdbus but it is called somewhat else, alias it to "qdbus" and restart the app.\n'
-                                                   'If not, you will not be able to use KDE defaults and map Plasma actions.'
-                                                   'Continue?',
-                                                   QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
-                                                   QtWidgets.QMessageBox.No)
-            if reply == QtWidgets.QMessageBox.No:
-                sys.exit()
-
-        self.kde_defaults = kde_defaults.format(qdbus=self.QDBUS_NAME)
-        
-        resub_config()
-        self.display_config()
-
+        self.plasma_available = None
+        self.kde_defaults = None
+        self.installed = None
+        self.shortcut_catalog = ShortcutCatalog()
+        self.refreshing_kwin_shortcuts = False
+        self.kwin_shortcuts_stamp = None
+        self.kglobalaccel = KGlobalAccel(self)
+        self.kglobalaccel.probed.connect(self.kglobalaccel_found)
+        self.kglobalaccel.listed.connect(self.kwin_shortcuts_found)
+        self.kglobalaccel.failed.connect(self.kwin_shortcuts_failed)
+        self.settings = QtCore.QSettings('libinput-gestures-qt', 'libinput-gestures-qt')
+
+        with profiler.span('config parsing'):
+            self.config = Config.load()
+            try:
+                self.config.history = History.open(self.config.path, content=self.config.serialize())
+            except OSError:
+                pass
+            self.config.normalize(drop_invalid=False)
+            self.config.save()
+        self.validator = Validator()
+        self.validating = False
+        self.validation_pending = False
+        with profiler.span('table'):
+            self.setup_table()
+            self.display_config()
+        self.watcher = ConfigWatcher(self.config, self)
+        self.watcher.changed.connect(self.config_changed_on_disk)
+
+        self.editor = None
         self.pushButton.clicked.connect(self.start_adding)
 
         #Menubar actions <--
@@ -318,13 +137,30 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         self.actionRefresh.triggered.connect(self.refresh)
         self.actionSet_to_default_KDE.triggered.connect(self.set_KDE_default)
         self.actionImport_config_file.triggered.connect(self.import_config)
+        self.actionUndo.triggered.connect(self.undo)
+        self.actionRedo.triggered.connect(self.redo)
+
+        #Profiles
+        self.profiles = ProfileStore()
+        self.profile_actions = QtWidgets.QActionGroup(self)
+        self.profile_actions.triggered.connect(lambda action: self.switch_profile(action.text()))
+        self.menuProfiles.aboutToShow.connect(self.fill_profiles_menu)
+        self.actionSave_profile.triggered.connect(self.save_profile)
+        self.actionDelete_profile.triggered.connect(self.delete_profile)
         
         #Utility
         self.libinput_gestures_pid = None
+        self.event_log = EventLog()
+        self.gestures_process = GesturesProcess(self)
+        self.gestures_process.line.connect(self.event_log.append)
+        self.restarter = Restarter(self.gestures_process, self)
+        self.restarter.applied.connect(self.changes_applied)
         self.actionRun.triggered.connect(self.run_libinput_gestures)
         self.actionKill.triggered.connect(self.kill_libinput_gestures)
         self.actionSet_to_autostart.triggered.connect(self.set_to_autostart)
         self.actionDisable_autostart.triggered.connect(self.disable_autostart)
+        self.actionMonitor.triggered.connect(self.show_monitor)
+        self.actionMeasure_latency.triggered.connect(self.measure_latency)
         
         #Service
         self.actionStatus.triggered.connect(self.display_status)
@@ -336,25 +172,142 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         self.actionDefaults_KDE_Plasma.triggered.connect(self.show_kde_defaults)
         self.actionLicense.triggered.connect(self.show_copyleft)
         #-->
+        self.start_probes()
+        self.first_paint = FirstPaintFilter(self)
+        self.first_paint.painted.connect(lambda: QtCore.QTimer.singleShot(0, self.prebuild_editor))
+        self.installEventFilter(self.first_paint)
+
+    '''
+    Startup probes
+    _____________________________________________________________________________________________
+    '''
+    def start_probes(self):
+        """Looks for kglobalaccel and libinput-gestures-setup concurrently without blocking the first paint
+
+        Menu actions that need them stay disabled until the results arrive.
+        """
+        self.actionSet_to_default_KDE.setEnabled(False)
+        self.menuUtility.setEnabled(False)
+        self.menuService.setEnabled(False)
+        profiler.begin('kglobalaccel probe')
+        self.kglobalaccel.probe()
+        profiler.begin('setup probe')
+        run_in_background(get_installed, on_finished=self.installed_found)
+
+    def kglobalaccel_found(self, available):
+        """Event when kglobalaccel probe is done
+
+        Enables KDE defaults or asks whether to continue without Plasma actions.
+        """
+        profiler.end('kglobalaccel probe')
+        self.plasma_available = available
+        if not self.plasma_available:
+            reply = QtWidgets.QMessageBox.question(self, "Cannot find kglobalaccel",
+                                                   'Unable to reach kglobalaccel on the session bus.\n'
+                                                   'It is a service of KDE Plasma used by this app.\n'
+                                                   'You will not be able to use KDE defaults and map Plasma actions.\n'
+                                                   'Continue?',
+                                                   QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                                                   QtWidgets.QMessageBox.No)
+            if reply == QtWidgets.QMessageBox.No:
+                QtWidgets.QApplication.quit()
+            return
+        if self.QDBUS_NAME:
+            self.kde_defaults = kde_defaults.format(qdbus=self.QDBUS_NAME)
+        else:
+            self.kde_defaults = with_action_client(kde_defaults.format(qdbus='qdbus'))
         try:
-            run(['libinput-gestures-setup', 'status'])
-            self.installed = True
-        except FileNotFoundError:
+            self.profiles.add_builtin(KDE_PROFILE, self.kde_defaults)
+        except OSError:
+            pass
+        self.actionSet_to_default_KDE.setEnabled(True)
+        self.refresh_kwin_shortcuts()
+
+    def installed_found(self, installed):
+        """Event when libinput-gestures-setup probe is done"""
+        profiler.end('setup probe')
+        self.installed = installed
+        if not self.installed:
             QtWidgets.QMessageBox.about(self, "Problem", "Cannot find libinput-gestures. Are you sure it is installed correctly?")
-            self.installed = False
-    
+            return
+        self.menuUtility.setEnabled(True)
+        self.menuService.setEnabled(True)
+
+    def refresh_kwin_shortcuts(self):
+        """Refetches kwin shortcut names in background if the cached ones are stale
+
+        Cache is stale when kglobalshortcutsrc has changed, see shortcuts.ShortcutCatalog.
+        """
+        if self.plasma_available and not self.refreshing_kwin_shortcuts and self.shortcut_catalog.is_stale():
+            self.refreshing_kwin_shortcuts = True
+            self.kwin_shortcuts_stamp = self.shortcut_catalog.source_stamp()
+            self.kglobalaccel.list_shortcuts()
+
+    def kwin_shortcuts_found(self, kwin_shortcuts):
+        """Event when kwin shortcut names are refetched, caches them and updates opened editors"""
+        self.refreshing_kwin_shortcuts = False
+        self.shortcut_catalog.update(kwin_shortcuts, self.kwin_shortcuts_stamp)
+        self.validate_config()
+        if self.editor is not None:
+            self.editor.fill_plasma_actions(kwin_shortcuts)
+
+    @property
+    def use_action_client(self):
+        """Whether new lines go through the resident helper (see daemon.py), remembered between runs"""
+        return self.settings.value('use_action_client', False, type=bool)
+
+    @use_action_client.setter
+    def use_action_client(self, value):
+        self.settings.setValue('use_action_client', bool(value))
+
+    def start_action_daemon(self):
+        """Starts the resident helper and sets it to autostart; a second helper exits right away"""
+        QtCore.QProcess.startDetached('libinput-gestures-qt-daemon', ['--autostart'])
+
+    def kwin_shortcuts_failed(self, error):
+        """Event when kwin shortcut names could not be fetched, the cached ones stay"""
+        self.refreshing_kwin_shortcuts = False
+
     def start_adding(self):
         """Shows EditGestures window"""
-        self.adding = EditGestures(self)
-        self.adding.setWindowModality(QtCore.Qt.WindowModal)
-        self.adding.show()
+        self.show_editor()
+
+    def prebuild_editor(self):
+        """Builds the EditGestures window once, after the first paint of the main window, and returns it"""
+        if self.editor is None:
+            from libinput_gestures_qt.editor import EditGestures
+            with tracer.span('editor build'):
+                self.editor = EditGestures(self)
+            self.editor.setWindowModality(QtCore.Qt.WindowModal)
+        return self.editor
+
+    def show_editor(self, default=None):
+        """Shows the EditGestures window reset for adding a gesture or editing default (config.GestureLine)"""
+        editor = self.prebuild_editor()
+        editor.reset(default)
+        editor.show()
+        editor.raise_()
+        editor.activateWindow()
 
     '''
     File Menu
     _____________________________________________________________________________________________
     '''
     def refresh(self):
-        """Refresh content of the main window"""
+        """Re-read config file and refresh content of the main window
+
+        Everything is validated again, something may have been installed in the meantime.
+        """
+        self.validator.clear()
+        self.config.reload()
+        self.display_config(refresh=True)
+
+    def config_changed_on_disk(self):
+        """Event when config file was changed outside of the app (see watcher.ConfigWatcher)
+
+        Reparses the file and pushes the difference into the table.
+        """
+        self.config.reload()
         self.display_config(refresh=True)
 
     def set_KDE_default(self):
@@ -362,108 +315,249 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         reply = QtWidgets.QMessageBox.question(
             self, 'Message',
             'Set to defaults?\n'
-            'Configuration file will be backed up.\n'
-            'You will be able to import it from ~/.cofig/libinput-gestures.conf.old',
+            'You will be able to get your configuration back with File > Undo.',
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
             QtWidgets.QMessageBox.No
         )
         if reply == QtWidgets.QMessageBox.Yes:
-            if self.QDBUS_NAME:
-                write_defaults(self.kde_defaults)
+            if self.kde_defaults:
+                if self.use_action_client:
+                    write_defaults(with_action_client(self.kde_defaults))
+                    self.start_action_daemon()
+                else:
+                    write_defaults(self.kde_defaults)
+                self.config.reload()
                 self.display_config(refresh=True)
+                self.apply_changes()
             else:
-                QtWidgets.QMessageBox.about(self, 'No qdbus', 'You cannot do it without qdbus:(')
+                QtWidgets.QMessageBox.about(self, 'No kglobalaccel', 'You cannot do it without kglobalaccel:(')
 
     def import_config(self):
         """Import some config file"""
         fname = QtWidgets.QFileDialog.getOpenFileName(self, 'Import', HOME)
         #Without this try-except the app krashes when I close the Import window
         try:
-            with open(fname[0]) as f:
-                imported_config = f.readlines()
-            write_config(imported_config)
-            resub_config()
-            fix_config()
+            rejected = normalize_config(self.config.path, source=fname[0])
+            self.config.reload()
             self.display_config(refresh=True)
+            self.apply_changes()
+            self.show_rejected(rejected)
         except FileNotFoundError:
             pass
+
+    def undo(self):
+        """Goes back to the previous saved configuration, see history.History"""
+        if self.config.history is not None:
+            self.restore(self.config.history.undo())
+
+    def redo(self):
+        if self.config.history is not None:
+            self.restore(self.config.history.redo())
+
+    def restore(self, content):
+        """Writes content from history into the config file"""
+        if content is None:
+            return
+        self.config.set_lines(content.splitlines(True), reuse=True)
+        self.config.save()
+        self.display_config(refresh=True)
+        self.apply_changes()
+
+    def update_history_actions(self):
+        history = self.config.history
+        self.actionUndo.setEnabled(history is not None and history.can_undo())
+        self.actionRedo.setEnabled(history is not None and history.can_redo())
+
+    '''
+    Profiles Menu
+    _____________________________________________________________________________________________
+    '''
+    def fill_profiles_menu(self):
+        """Lists profiles above 'Save as profile...', the one identical to the config is checked"""
+        for action in self.profile_actions.actions():
+            self.menuProfiles.removeAction(action)
+            self.profile_actions.removeAction(action)
+            action.deleteLater()
+        active = self.profiles.active(self.config.path)
+        first = self.menuProfiles.actions()[0]
+        for name in self.profiles.names():
+            action = QtWidgets.QAction(name, self.menuProfiles)
+            action.setCheckable(True)
+            action.setChecked(name == active)
+            self.profile_actions.addAction(action)
+            self.menuProfiles.insertAction(first, action)
+
+    def switch_profile(self, name):
+        """Replaces the config with a profile (stored ready to use) and reloads libinput-gestures once"""
+        try:
+            changed = self.profiles.switch(name, self.config.path)
+        except OSError as e:
+            QtWidgets.QMessageBox.about(self, 'Problem', 'Cannot switch to {}: {}'.format(name, e))
+            return
+        if changed:
+            self.config.reload()
+            self.display_config(refresh=True)
+            self.apply_changes()
+
+    def save_profile(self):
+        """Saves current configuration as a profile"""
+        name, ok = QtWidgets.QInputDialog.getText(
+            self, 'Save as profile', 'Profile name:', text=self.profiles.active(self.config.path) or ''
+        )
+        if ok and name.strip():
+            try:
+                rejected = self.profiles.save(name.strip(), self.config.serialize().splitlines(True))
+            except OSError as e:
+                QtWidgets.QMessageBox.about(self, 'Problem', 'Cannot save profile: {}'.format(e))
+                return
+            self.show_rejected(rejected)
+
+    def delete_profile(self):
+        names = self.profiles.names()
+        if not names:
+            return
+        name, ok = QtWidgets.QInputDialog.getItem(self, 'Delete profile', 'Profile:', names, editable=False)
+        if ok:
+            try:
+                self.profiles.delete(name)
+            except OSError:
+                pass
+
+    def show_rejected(self, rejected):
+        """Shows lines dropped by normalization and the reasons, see config.normalize_lines"""
+        if not rejected:
+            return
+        shown = ['Line {}: {}\n    {}'.format(lineno, reason, line) for lineno, line, reason in rejected[:20]]
+        if len(rejected) > 20:
+            shown.append('... and {} more'.format(len(rejected) - 20))
+        QtWidgets.QMessageBox.about(
+            self, 'Rejected lines',
+            '{} invalid lines were left out:\n\n{}'.format(len(rejected), '\n'.join(shown))
+        )
         
     '''
     Utility Menu
     _____________________________________________________________________________________________
     '''
     def run_libinput_gestures(self):
-        """Start libinput-gestures in background"""
+        """Start libinput-gestures in background
+
+        It is run by the app (self.gestures_process) with --verbose, its output goes
+        to self.event_log and can be watched in Utility > Monitor.
+        It stops with the app, use Service > Start to run it on its own.
+        """
         if self.installed:
-            subprocess.Popen(['libinput-gestures'])
+            self.gestures_process.start(['--verbose'])
+            executor.invalidate()
             self.display_status()
     
+    def apply_changes(self):
+        """Makes libinput-gestures pick saved changes up, see restarter.Restarter
+
+        Changes saved in quick succession are applied with a single restart.
+        """
+        if self.installed:
+            self.statusbar.showMessage('Applying changes...')
+            self.restarter.schedule()
+
+    def changes_applied(self, message):
+        """Event when libinput-gestures has been restarted, shows the last line of the output"""
+        if self.restarter.is_busy():
+            return
+        lines = [line for line in message.splitlines() if line.strip()]
+        self.statusbar.showMessage(lines[-1] if lines else 'Changes saved', 5000)
+
+    def run_command(self, args, on_finished, cache=None):
+        """Runs external command in background (see process.Executor), on_finished gets CompletedProcess
+
+        Failures (including timeouts) are shown in the status bar.
+        """
+        run_in_background(run, args, cache=cache, on_finished=on_finished, on_failed=self.command_failed)
+
+    def command_failed(self, error):
+        self.statusbar.showMessage(str(error) or type(error).__name__, 5000)
+
     def kill_libinput_gestures(self):
         """Fing libinput-gestures and kill it"""
         if self.installed:
-            p = run(['ps', 'axu'])
-            s = p.stdout.decode('utf-8').split('\n')
-            for proc in s:
-                if 'python3' in proc and 'libinput-gestures' in proc and 'libinput-gestures-qt' not in proc:
-                    try:
-                        run(['kill', proc.split()[1]])
-                    except Exception:
-                        pass
-            self.display_status()
+            self.gestures_process.stop()
+            run_in_background(
+                kill_libinput_gestures,
+                on_finished=lambda _: self.display_status(), on_failed=self.command_failed
+            )
     
     def set_to_autostart(self):
         """Sets libinput-gestures to autostart"""
         if self.installed:
-            run(['libinput-gestures-setup', 'autostart'])
-            self.display_status()
+            self.run_command(['libinput-gestures-setup', 'autostart'], lambda _: self.display_status())
     
     def disable_autostart(self):
         """Set libinput-gestures to autostop"""
         if self.installed:
-            run(['libinput-gestures-setup', 'autostop'])
-            self.display_status()
+            self.run_command(['libinput-gestures-setup', 'autostop'], lambda _: self.display_status())
     
+    def show_monitor(self):
+        """Shows live output of libinput-gestures run by the app (see monitor_window.py)"""
+        if not getattr(self, 'monitor_window', None):
+            from libinput_gestures_qt.monitor_window import MonitorWindow
+            self.monitor_window = MonitorWindow(self.event_log, self.gestures_process, self)
+        self.monitor_window.show()
+        self.monitor_window.raise_()
+
+    def measure_latency(self):
+        """Shows latency panel (see latency_window.py)
+
+        It runs its own libinput-gestures on a measurement copy of the config,
+        the usual one has to be stopped first.
+        """
+        if not getattr(self, 'latency_window', None):
+            from libinput_gestures_qt.latency_window import LatencyWindow
+            self.latency_window = LatencyWindow(self.config, self)
+        self.latency_window.show()
+        self.latency_window.raise_()
+
     '''
     Service Menu
     _____________________________________________________________________________________________
     '''
     def display_status(self):
-        """Check status of libinput-gestures and shows it in message box"""
+        """Check status of libinput-gestures in background and shows it in message box"""
         if self.installed:
-            status = run(['libinput-gestures-setup', 'status'])
-            status = status.stdout.decode('utf-8')
-            installed = 'no'
-            if 'is installed' in status:
-                installed = 'yes'
-            running = 'no'
-            if 'is running' in status:
-                running = 'yes'
-            set_to_autostart = 'no'
-            if 'is set to autostart' in status:
-                set_to_autostart = 'yes'
-            status = 'Installed: {}\nRunning: {}\nAutostart: {}\n'.format(installed, running, set_to_autostart)
-            QtWidgets.QMessageBox.about(self, "Status", status)
+            self.run_command(['libinput-gestures-setup', 'status'], self.status_found, cache=STATUS_TTL)
+
+    def status_found(self, status):
+        """Event when 'libinput-gestures-setup status' is done"""
+        status = status.stdout.decode('utf-8')
+        installed = 'no'
+        if 'is installed' in status:
+            installed = 'yes'
+        running = 'no'
+        if 'is running' in status:
+            running = 'yes'
+        set_to_autostart = 'no'
+        if 'is set to autostart' in status:
+            set_to_autostart = 'yes'
+        status = 'Installed: {}\nRunning: {}\nAutostart: {}\n'.format(installed, running, set_to_autostart)
+        QtWidgets.QMessageBox.about(self, "Status", status)
     
     def restart_utility(self):
-        """Runs 'libinput-gestures-setup restart', displays output in message box"""
+        """Restarts libinput-gestures in background (see restarter.Restarter), output goes to the status bar"""
         if self.installed:
-            status = run(['libinput-gestures-setup', 'restart'])
-            status = status.stdout.decode('utf-8')
-            QtWidgets.QMessageBox.about(self, "Status", status)
+            self.statusbar.showMessage('Restarting libinput-gestures...')
+            self.restarter.restart_now()
     
     def stop_utility(self):
         """Runs 'libinput-gestures-setup stop', displays output in message box"""
         if self.installed:
-            status = run(['libinput-gestures-setup', 'stop'])
-            status = status.stdout.decode('utf-8')
-            QtWidgets.QMessageBox.about(self, "Status", status)
+            self.run_command(['libinput-gestures-setup', 'stop'], self.show_output)
     
     def start_utility(self):
         """Runs 'libinput-gestures-setup start', displays output in message box"""
         if self.installed:
-            status = run(['libinput-gestures-setup', 'start'])
-            status = status.stdout.decode('utf-8')
-            QtWidgets.QMessageBox.about(self, "Status", status)
+            self.run_command(['libinput-gestures-setup', 'start'], self.show_output)
+
+    def show_output(self, result):
+        QtWidgets.QMessageBox.about(self, "Status", result.stdout.decode('utf-8'))
 
     '''
     About Menu
@@ -496,8 +590,8 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
                 OR commands
                 e.g. ['ctrl+super+Page_Down']
                 e.g. ['echo "Hello"']
-            self.buttons: list of str
-                e.g. ['gesture swipe up 3']
+            self.buttons: list of config.GestureLine
+                e.g. [('swipe', 'up', '3', None)]
             self.actions: list of str
                 either 'shortcut' (stands for a keyboard shortcut)
                 or 'command'
@@ -505,7 +599,7 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         for_sorting = []
         for i, el in enumerate(self.gestures):
             for_sorting.append([el, (self.fingers[i], self.shortcuts[i], self.buttons[i], self.actions[i])])
-        sorted_conf = sorted(for_sorting)
+        sorted_conf = sorted(for_sorting, key=lambda line: (line[0], line[1][:2]))
         
         self.gestures = []
         self.fingers = []
@@ -536,335 +630,185 @@ class GesturesApp(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
                 e.g. ['echo "Hello"']                              --- Exact values of  '... <fingers> <qdbus trigger shortcut> <shortcut>' 
                 
                                                                                          V------------------------------------V
-            self.buttons: list of str                    <============ Exact values of  'gesture <type:swipe|pinch> <direction> ...'
-                e.g. ['gesture swipe up 3']
+            self.buttons: list of config.GestureLine     <============ The config line itself, so that 'Edit'/'Delete'
+                                                                       act on exactly that line even if another one is
+                                                                       bound to the same gesture
             self.actions: list of str                    <============ Depend on whether xdotool or qdbus is used in config line
                 either 'Keyboard shortcut'
                 or 'Plasma action'
                 or 'Command'
         """
-        conf = read_config()
         self.gestures = []
         self.fingers = []
         self.shortcuts = []
         self.buttons = []
         self.actions = []
-        for line in conf:
-            if line.startswith('gesture'):
-                splitted = line.split()
-                self.gestures.append(reversed_mapping['{} {} {}'.format(splitted[0], splitted[1], splitted[2])])
-                self.fingers.append(splitted[3])
-                if splitted[4] == 'xdotool' and splitted[5] == 'key':
-                    self.actions.append('Keyboard shortcut')
-                    self.shortcuts.append(splitted[6])
-                elif 'qdbus' in splitted[4]:
-                    self.actions.append('Plasma action')
-                    plasma_action = re.findall('"(.*?)"', line)[0]
-                    if plasma_action:
-                        self.shortcuts.append(plasma_action)
-                    else:
-                        self.shortcuts.append(splitted[-1].replace('"', ''))
-                else:
-                    self.actions.append('Command')
-                    self.shortcuts.append(' '.join(splitted[4:]))
-                self.buttons.append('{} {} {} {}'.format(splitted[0], splitted[1], splitted[2], splitted[3]))
+        self.config.index()
+        for entry in self.config.gestures():
+            if not entry.is_valid():
+                raise ValueError(entry.line)
+            self.gestures.append(reversed_mapping['gesture {} {}'.format(entry.type, entry.direction)])
+            self.fingers.append(entry.fingers)
+            self.actions.append(entry.action)
+            self.shortcuts.append(entry.shortcut)
+            self.buttons.append(entry)
+
+    def setup_table(self):
+        """Sets model and 'Delete'/'Edit' delegates for the gestures table (self.tableView)
+
+        Only visible rows are drawn; buttons are painted, not created as widgets.
+        The view shows self.table_filter, rows of self.table_model matching the filter bar (self.filterLine).
+        """
+        self.table_model = GesturesTableModel(self)
+        self.table_filter = GesturesFilterModel(self)
+        self.table_filter.setSourceModel(self.table_model)
+        self.tableView.setModel(self.table_filter)
+        self.filterLine.textChanged.connect(self.table_filter.set_filter)
+        self.tableView.verticalHeader().hide()
+        header = self.tableView.horizontalHeader()
+        for column, width in enumerate((160, 70, 170, 0, 170)):
+            header.resizeSection(column, width)
+        header.setSectionResizeMode(3, QtWidgets.QHeaderView.Stretch)
+        self.delete_delegate = ButtonDelegate('Delete', self.tableView)
+        self.delete_delegate.clicked.connect(self.delete_entry)
+        self.tableView.setItemDelegateForColumn(DELETE_COLUMN, self.delete_delegate)
+        self.edit_delegate = ButtonDelegate('Edit', self.tableView)
+        self.edit_delegate.clicked.connect(self.edit_entry)
+        self.tableView.setItemDelegateForColumn(EDIT_COLUMN, self.edit_delegate)
 
     def display_config(self, refresh=False):
         """Displays current configuration in main window
-        
-        Finally gathers all widgets (creates a couple new) and puts them into nice layouts.
+
+        Puts prepared and sorted config into self.table_model.
+        refresh is kept for compatibility, the table is always updated in place.
         """
-        if refresh:
-            self.area.deleteLater()
-        
-        try:
-            self.prepare_config_for_displaying()
-        except Exception:
-            reply = QtWidgets.QMessageBox.question(
-                self, 'Problem',
-                "Something is wrong with the configuration file...\nFix it?",
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
-                QtWidgets.QMessageBox.No
-            )
-            if reply == QtWidgets.QMessageBox.Yes:
-                fix_config()
+        with tracer.span('display_config'):
+            try:
                 self.prepare_config_for_displaying()
-            else:
-                sys.exit()
-
-        self.sort_config()
-        
-        self.layout = self.verticalLayout
-        self.area = QtWidgets.QScrollArea()
-        content_widget = QtWidgets.QWidget()
-        self.area.setWidget(content_widget)
-        flay = QtWidgets.QGridLayout(content_widget)
-        self.area.setWidgetResizable(True)
-
-        for i, label in enumerate(self.gestures):
-            flay.addWidget(QtWidgets.QLabel(label), i, 0)
-
-        for i, label in enumerate(self.fingers):
-            flay.addWidget(QtWidgets.QLabel(label), i, 1)
+            except Exception:
+                reply = QtWidgets.QMessageBox.question(
+                    self, 'Problem',
+                    "Something is wrong with the configuration file...\nFix it?",
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                    QtWidgets.QMessageBox.No
+                )
+                if reply == QtWidgets.QMessageBox.Yes:
+                    rejected = self.config.normalize()
+                    self.config.save()
+                    try:
+                        self.prepare_config_for_displaying()
+                    except Exception as e:
+                        QtWidgets.QMessageBox.about(
+                            self, 'Problem', 'Cannot read the configuration file: {!r}\n'
+                            'Fix {} by hand, please.'.format(e, self.config.path or CONFIG_LOCATION)
+                        )
+                        sys.exit(1)
+                    self.show_rejected(rejected)
+                else:
+                    sys.exit()
 
-        for i, label in enumerate(self.actions):
-            flay.addWidget(QtWidgets.QLabel(label), i, 2)
+            self.sort_config()
 
-        for i, label in enumerate(self.shortcuts):
-            flay.addWidget(QtWidgets.QLabel(label), i, 3)
+            with tracer.span('table update', rows=len(self.buttons)):
+                self.table_model.update_rows(zip(self.gestures, self.fingers, self.actions, self.shortcuts, self.buttons))
+        self.update_history_actions()
+        self.validate_config()
 
-        for i, button in enumerate(self.buttons):
-            deleteButton = QtWidgets.QPushButton("Delete")
-            deleteButton.setAccessibleName(button)
-            deleteButton.clicked.connect(self.delete_entry)
-            flay.addWidget(deleteButton, i, 4)
+    def validate_config(self):
+        """Checks in background that configured actions can run, results go to the Status column
 
-            editButton = QtWidgets.QPushButton("Edit")
-            editButton.setAccessibleName(button)
-            editButton.clicked.connect(self.edit_entry)
-            flay.addWidget(editButton, i, 5)
+        Only lines that changed since the last run are checked (see validation.Validator).
+        Runs are never concurrent, a request during one is served once it is over.
+        """
+        if self.validating:
+            self.validation_pending = True
+            return
+        self.validating = True
+        lines = [(entry, entry.line) for entry in self.config.gestures()]
+        catalog = list(self.shortcut_catalog.names) if self.plasma_available else None
+        run_in_background(
+            self.validator.check_lines, lines, catalog,
+            on_finished=self.config_validated, on_failed=lambda error: self.config_validated({})
+        )
 
-        self.layout.addWidget(self.area)
+    def config_validated(self, statuses):
+        self.validating = False
+        self.table_model.set_statuses(statuses)
+        if self.validation_pending:
+            self.validation_pending = False
+            self.validate_config()
 
     '''
     Delete Buttons
     _____________________________________________________________________________________________
 
     '''
-    def delete_entry(self):
+    def delete_entry(self, index):
         """Delete line from config
-        
-        Triggered by 'Delete' buttons.
+
+        Triggered by 'Delete' buttons, index is the clicked (filtered) table cell.
         """
-        button = self.sender()
-        if isinstance(button, QtWidgets.QPushButton):
-            reply = QtWidgets.QMessageBox.question(
-                self, 'Message',
-                "Are you sure to delete?",
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
-                QtWidgets.QMessageBox.No
-            )
-            if reply == QtWidgets.QMessageBox.Yes:
-                conf = read_config()
-                new_conf = []
-                for line in conf:
-                    if not line.startswith(button.accessibleName()):
-                        new_conf.append(line)
-                write_config(new_conf)
-                self.display_config(refresh=True)
+        entry = self.table_model.button(self.table_filter.mapToSource(index).row())
+        reply = QtWidgets.QMessageBox.question(
+            self, 'Message',
+            "Are you sure to delete?",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+            QtWidgets.QMessageBox.No
+        )
+        if reply == QtWidgets.QMessageBox.Yes:
+            self.config.remove(entry)
+            self.config.save()
+            self.display_config(refresh=True)
+            self.apply_changes()
 
     '''
     Edit Buttons
     _____________________________________________________________________________________________
 
     '''
-    def edit_entry(self):
-        button = self.sender()
-        if isinstance(button, QtWidgets.QPushButton):
-            lineToEdit = ''
-            conf = read_config()
-            for line in conf:
-                if line.startswith(button.accessibleName()):
-                    lineToEdit = line
-            print(lineToEdit)
-            self.editing = EditGestures(self, lineToEdit)
-            self.editing.setWindowModality(QtCore.Qt.WindowModal)
-            self.editing.show()
+    def edit_entry(self, index):
+        """Shows EditGestures window for the line
 
-        
-        
-class EditGestures(QtWidgets.QWidget, edit_window.Ui_Form):
-    """Secondary window for adding/editing gestures
-    
-    Child to main window (GesturesApp).
-    """
-    def __init__(self, parent, default=None):
-        """init
-        
-        Sets widgets and their attributes that I could not set in QT Designer.
-        Adds events to buttons. Checks for qdbus.
+        Triggered by 'Edit' buttons, index is the clicked (filtered) table cell.
         """
-        super().__init__()
-        self.setupUi(self)
-        self.parent = parent
-        self.setWindowTitle('Add Gestures')
-        self.setWindowIcon(QtGui.QIcon(LOGO_LOCATION))
-        
-        self.QDBUS_NAME = get_qdbus_name()
+        entryToEdit = self.table_model.button(self.table_filter.mapToSource(index).row())
+        self.show_editor(entryToEdit)
 
-        self.shortcut_command.activated[str].connect(self.shortcut_command_or_qdbus)
-        self.actionMenu.activated[str].connect(self.action_chosen)
-        self.fingersLine.valueChanged[int].connect(self.fingers_chosen)
-        self.saveButton.clicked.connect(self.save_changes)
 
-        self.default_line = default
+class FirstPaintFilter(QtCore.QObject):
+    """Marks 'first paint' of the watched widget in the startup profile and emits painted()"""
+    painted = QtCore.pyqtSignal()
 
-        if not default:
-            print("Default is none")
-            self.action = 'gesture swipe up'
-            self.fingers = 3
-            self.shortcut = ''
-            self.fingersLine.setMinimum(3)
-            self.draw_shortcut()
-        else:
-            print("Default is not none")
-            splitConf = default.split()
-            
-            """ Set gesture value """
-            gesture_syntax = ' '.join(splitConf[:3])
-            gesture_key = ''
-            for gesture, syntax in actions_mapping.items():
-                if syntax == gesture_syntax:
-                    gesture_key = gesture
-            self.action = gesture_syntax
-            self.actionMenu.setCurrentIndex(list(actions_mapping.keys()).index(gesture_key))
-            self.action_chosen(self.actionMenu.currentText())
-
-            """ Set finger value """
-            self.fingers_chosen(splitConf[3])
-            self.fingersLine.setValue(int(self.fingers))
-
-            action = splitConf[4]
-            if action == 'xdotool':
-                self.shortcut_command.setCurrentIndex(0)
-                self.draw_shortcut()
-                self.keyboardLine.setKeySequence(splitConf[6])
-            elif action == 'qdbus':
-                self.shortcut_command.setCurrentIndex(1)
-                if self.QDBUS_NAME:
-                    self.draw_plasma_actions(re.findall('"(.*?)"', default)[0])
-                    self.plasma_action_chosen(self.plasmaActions.currentText())
-            else:
-                self.shortcut_command.setCurrentIndex(2)
-                self.draw_command()
-                self.commandLine.setText(splitConf[4])
-                self.command_chosen(self.commandLine.text())
-
-            # self.shortcut_command_or_qdbus(self.shortcut_command.currentText)
-
-    def shortcut_command_or_qdbus(self, text):
-        """Chose whether you want to add plain command, xdotool command using QKeySequenceEdit or qdbus command
-        
-        Does not delete previous widgets: they are stored one upon another.
-        HELP NEEDED -- it works but it's stupid :(
-        """
-
-        print("here: " + text)
-        if text == 'Keyboard Shortcut':
-            self.draw_shortcut()
-        elif text == 'Plasma action':
-            if self.QDBUS_NAME:
-                self.draw_plasma_actions()
-        else:
-            self.draw_command()
-
-    def draw_shortcut(self):
-        """Draws keyboard shortcut input
-        
-        ... so that user could just press buttons (sh|h)e wants
-        istead of manually typing 'xdotool key <key combo>' and remember differences between xdotool/Gnome/KDE/etc.
-        """
-        self.shortcut = ''
-        self.actionType.setText('Keyboard Shortcut')
-        self.keyboardLine = QtWidgets.QKeySequenceEdit()
-        self.gridLayout.addWidget(self.keyboardLine, 4, 2)
-        self.keyboardLine.keySequenceChanged.connect(self.shortcut_chosen)
-
-    def draw_plasma_actions(self, default=None):
-        """Draws Plasma actions combobox input
-        
-        ... so that user could just choose action for Plasma
-        """
-        self.shortcut = self.QDBUS_NAME + ' org.kde.kglobalaccel /component/kwin invokeShortcut "Expose"'
-        
-        self.actionType.setText('Plasma action')
-        self.plasmaActions = QtWidgets.QComboBox()
-        kwin_shortcuts = run(
-            [
-                self.QDBUS_NAME, 'org.kde.kglobalaccel', '/component/kwin',
-                'org.kde.kglobalaccel.Component.shortcutNames'
-            ]
-        )
-        kwin_shortcuts = kwin_shortcuts.stdout.decode('utf-8').split('\n')[:-2]
-        kwin_shortcuts.sort()
-        for kwin_shortcut in kwin_shortcuts:
-            self.plasmaActions.addItem(kwin_shortcut)
-        self.gridLayout.addWidget(self.plasmaActions, 4, 2)
-
-        if default:
-            print(default)
-            self.plasmaActions.setCurrentIndex(kwin_shortcuts.index(default))
-        
-        self.plasmaActions.activated[str].connect(self.plasma_action_chosen)
-        
-    def draw_command(self):
-        """Draws command input
-        
-        ... because I don't want users to be stuck with xdotool and qdbus
-        """
-        self.shortcut = ''
-        self.actionType.setText('Command')
-        self.commandLine = QtWidgets.QLineEdit()
-        self.gridLayout.addWidget(self.commandLine, 4, 2)
-        self.commandLine.textChanged[str].connect(self.command_chosen)
-
-    def action_chosen(self, text):
-        """Event when fingers action is chosen"""
-        if 'Pinch' in text:
-            self.fingersLine.setMinimum(2)
-            self.fingersLine.setValue(2)
-        else:
-            self.fingersLine.setMinimum(3)
-            self.fingersLine.setValue(3)
-        self.action = actions_mapping[text]
-
-    def fingers_chosen(self, value):
-        """Event when amount of fingers is chosen"""
-        self.fingers = value
-
-    def shortcut_chosen(self, text):
-        """Event when keyboard shortcut is chosen"""
-        shortcut = text.toString().split(',')[0]
-        self.shortcut = 'xdotool key ' + find_key_combo(shortcut)
-
-    def command_chosen(self, text):
-        """Event when command is typed in"""
-        print(text)
-        self.shortcut = text
-
-    def plasma_action_chosen(self, text):
-        self.shortcut = '{qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "{sh}"'.format(qdbus=self.QDBUS_NAME, sh=text)
-
-    def save_changes(self):
-        """Writes input data into config file"""
-        if self.action and self.fingers and self.shortcut:
-            conf = read_config()
-            new_conf = []
-            for line in conf:
-                if not self.default_line: 
-                    new_conf.append(line)
-                else:
-                    if line == self.default_line:
-                        new_conf.append('{} {} {}\n'.format(self.action, str(self.fingers), self.shortcut))
-                    else:
-                        new_conf.append(line)
-            if not self.default_line:
-                new_conf.append('{} {} {}\n'.format(self.action, str(self.fingers), self.shortcut))
-            write_config(new_conf)
-            self.actionMenu.setCurrentIndex(0)
-            self.fingersLine.setValue(0)
-            QtWidgets.QMessageBox.about(self, "Success", "Cofiguration successfully edited.")
-            self.parent.display_config(refresh=True)
-            self.close()
-        else:
-            QtWidgets.QMessageBox.about(self, "Fail", "Please, fill all the forms.")
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            obj.removeEventFilter(self)
+            profiler.mark('first paint')
+            self.painted.emit()
+        return False
 
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    """Starts the GUI
+
+    With --profile-startup prints time spent in imports, setupUi, config parsing,
+    probes and until the first paint to stderr, and calls of external commands on exit.
+    With --trace FILE writes a Chrome trace to FILE, see trace.py.
+    """
+    if '--profile-startup' in sys.argv:
+        sys.argv.remove('--profile-startup')
+        profiler.enabled = True
+    take_trace_argument(sys.argv)
+    with profiler.span('QApplication'):
+        app = QtWidgets.QApplication(sys.argv)
     window = GesturesApp()
+    profiler.report_when('first paint', 'kglobalaccel probe', 'setup probe')
     window.show()
     app.exec_()
+    # hung commands would keep pool threads (and so the app) alive
+    executor.cancel()
+    if profiler.enabled:
+        print(executor.format_report(), file=sys.stderr)
+    tracer.close()
 
 
 if __name__ == '__main__':
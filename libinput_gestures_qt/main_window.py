@@ -17,27 +17,18 @@ class Ui_MainWindow(object):
         self.centralwidget.setObjectName("centralwidget")
         self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.centralwidget)
         self.verticalLayout_3.setObjectName("verticalLayout_3")
-        self.gridLayout = QtWidgets.QGridLayout()
-        self.gridLayout.setObjectName("gridLayout")
-        self.label_2 = QtWidgets.QLabel(self.centralwidget)
-        self.label_2.setObjectName("label_2")
-        self.gridLayout.addWidget(self.label_2, 0, 1, 1, 1)
-        self.label = QtWidgets.QLabel(self.centralwidget)
-        self.label.setObjectName("label")
-        self.gridLayout.addWidget(self.label, 0, 2, 1, 1)
-        self.label_3 = QtWidgets.QLabel(self.centralwidget)
-        self.label_3.setObjectName("label_3")
-        self.gridLayout.addWidget(self.label_3, 0, 4, 1, 1)
-        self.label_4 = QtWidgets.QLabel(self.centralwidget)
-        self.label_4.setText("")
-        self.label_4.setObjectName("label_4")
-        self.gridLayout.addWidget(self.label_4, 0, 5, 1, 1)
-        self.label_5 = QtWidgets.QLabel(self.centralwidget)
-        self.label_5.setObjectName("label_5")
-        self.gridLayout.addWidget(self.label_5, 0, 3, 1, 1)
-        self.verticalLayout_3.addLayout(self.gridLayout)
         self.verticalLayout = QtWidgets.QVBoxLayout()
         self.verticalLayout.setObjectName("verticalLayout")
+        self.filterLine = QtWidgets.QLineEdit(self.centralwidget)
+        self.filterLine.setClearButtonEnabled(True)
+        self.filterLine.setObjectName("filterLine")
+        self.verticalLayout.addWidget(self.filterLine)
+        self.tableView = QtWidgets.QTableView(self.centralwidget)
+        self.tableView.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableView.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableView.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.tableView.setObjectName("tableView")
+        self.verticalLayout.addWidget(self.tableView)
         self.verticalLayout_3.addLayout(self.verticalLayout)
         self.verticalLayout_2 = QtWidgets.QVBoxLayout()
         self.verticalLayout_2.setObjectName("verticalLayout_2")
@@ -57,6 +48,8 @@ class Ui_MainWindow(object):
         self.menuAbout.setObjectName("menuAbout")
         self.menuUtility = QtWidgets.QMenu(self.menubar)
         self.menuUtility.setObjectName("menuUtility")
+        self.menuProfiles = QtWidgets.QMenu(self.menubar)
+        self.menuProfiles.setObjectName("menuProfiles")
         MainWindow.setMenuBar(self.menubar)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
         self.statusbar.setObjectName("statusbar")
@@ -89,9 +82,24 @@ class Ui_MainWindow(object):
         self.actionSet_to_autostart.setObjectName("actionSet_to_autostart")
         self.actionDisable_autostart = QtWidgets.QAction(MainWindow)
         self.actionDisable_autostart.setObjectName("actionDisable_autostart")
+        self.actionMonitor = QtWidgets.QAction(MainWindow)
+        self.actionMonitor.setObjectName("actionMonitor")
+        self.actionMeasure_latency = QtWidgets.QAction(MainWindow)
+        self.actionMeasure_latency.setObjectName("actionMeasure_latency")
+        self.actionUndo = QtWidgets.QAction(MainWindow)
+        self.actionUndo.setObjectName("actionUndo")
+        self.actionRedo = QtWidgets.QAction(MainWindow)
+        self.actionRedo.setObjectName("actionRedo")
+        self.actionSave_profile = QtWidgets.QAction(MainWindow)
+        self.actionSave_profile.setObjectName("actionSave_profile")
+        self.actionDelete_profile = QtWidgets.QAction(MainWindow)
+        self.actionDelete_profile.setObjectName("actionDelete_profile")
         self.menuFile.addAction(self.actionRefresh)
         self.menuFile.addAction(self.actionSet_to_default_KDE)
         self.menuFile.addAction(self.actionImport_config_file)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.actionUndo)
+        self.menuFile.addAction(self.actionRedo)
         self.menuService.addAction(self.actionStatus)
         self.menuService.addAction(self.actionRestart)
         self.menuService.addAction(self.actionStart)
@@ -102,7 +110,14 @@ class Ui_MainWindow(object):
         self.menuUtility.addAction(self.actionKill)
         self.menuUtility.addAction(self.actionSet_to_autostart)
         self.menuUtility.addAction(self.actionDisable_autostart)
+        self.menuUtility.addSeparator()
+        self.menuUtility.addAction(self.actionMonitor)
+        self.menuUtility.addAction(self.actionMeasure_latency)
+        self.menuProfiles.addSeparator()
+        self.menuProfiles.addAction(self.actionSave_profile)
+        self.menuProfiles.addAction(self.actionDelete_profile)
         self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuProfiles.menuAction())
         self.menubar.addAction(self.menuUtility.menuAction())
         self.menubar.addAction(self.menuService.menuAction())
         self.menubar.addAction(self.menuAbout.menuAction())
@@ -113,15 +128,13 @@ class Ui_MainWindow(object):
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
-        self.label_2.setText(_translate("MainWindow", "Gesture"))
-        self.label.setText(_translate("MainWindow", "Fingers"))
-        self.label_3.setText(_translate("MainWindow", "Action"))
-        self.label_5.setText(_translate("MainWindow", "Type"))
+        self.filterLine.setPlaceholderText(_translate("MainWindow", "Filter: gesture, fingers, type or action"))
         self.pushButton.setText(_translate("MainWindow", "Add"))
         self.menuFile.setTitle(_translate("MainWindow", "&File"))
         self.menuService.setTitle(_translate("MainWindow", "&Service"))
         self.menuAbout.setTitle(_translate("MainWindow", "&About"))
         self.menuUtility.setTitle(_translate("MainWindow", "&Utility"))
+        self.menuProfiles.setTitle(_translate("MainWindow", "&Profiles"))
         self.actionAdd.setText(_translate("MainWindow", "&Add"))
         self.actionStatus.setText(_translate("MainWindow", "&Status"))
         self.actionRestart.setText(_translate("MainWindow", "&Restart"))
@@ -136,5 +149,13 @@ class Ui_MainWindow(object):
         self.actionKill.setText(_translate("MainWindow", "Kill"))
         self.actionSet_to_autostart.setText(_translate("MainWindow", "Set to autostart"))
         self.actionDisable_autostart.setText(_translate("MainWindow", "Disable autostart"))
+        self.actionMonitor.setText(_translate("MainWindow", "M&onitor"))
+        self.actionMeasure_latency.setText(_translate("MainWindow", "&Measure latency"))
+        self.actionUndo.setText(_translate("MainWindow", "&Undo"))
+        self.actionUndo.setShortcut(_translate("MainWindow", "Ctrl+Z"))
+        self.actionRedo.setText(_translate("MainWindow", "Re&do"))
+        self.actionRedo.setShortcut(_translate("MainWindow", "Ctrl+Shift+Z"))
+        self.actionSave_profile.setText(_translate("MainWindow", "&Save as profile..."))
+        self.actionDelete_profile.setText(_translate("MainWindow", "&Delete profile..."))
 
 
@@ -0,0 +1,210 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Gesture and key names, KDE defaults and helpers to build config lines.
+Does not depend on Qt.
+
+Variables:
+--------------
+actions_mapping: dict
+    finger actions in human-readable form >> finger actions in config-readable form
+reversed_mapping: dict
+    finger actions in config-readable form >> finger actions in human-readable form
+keys_mapping: dict
+    qt keys (lowered) >> xdotool keys
+keysyms: frozenset
+    X keysym names and xdotool aliases that xdotool understands (the common ones)
+kde_defaults: str
+    Default settings for KDE Plasma ({qdbus} is to be formatted)
+kde_defaults_description: str
+    Descriptin for KDE defaults.
+--------------
+Functions: find_key_combo, key_command, plasma_command, gesture_line, client_command, with_action_client
+--------------
+"""
+
+from libinput_gestures_qt.action_client import ACTION_CLIENT
+from libinput_gestures_qt.config import QUOTED, GestureLine, parse_line
+
+actions_mapping = {
+    'Swipe Up': 'gesture swipe up',
+    'Swipe Down': 'gesture swipe down',
+    'Swipe Left': 'gesture swipe left',
+    'Swipe LeftUp': 'gesture swipe left_up',
+    'Swipe LeftDown': 'gesture swipe  left_down',
+    'Swipe Right': 'gesture swipe right',
+    'Swipe RightUp': 'gesture swipe right_up',
+    'Swipe RightDown': 'gesture swipe right_down',
+    'Pinch In': 'gesture pinch in',
+    'Pinch Out': 'gesture pinch out',
+    'Pinch Clockwise': 'gesture pinch clockwise',
+    'Pinch Anticlockwise': 'gesture pinch anticlockwise',
+}
+
+reversed_mapping = {
+    'gesture swipe up': 'Swipe Up',
+    'gesture swipe down': 'Swipe Down',
+    'gesture swipe left': 'Swipe Left',
+    'gesture swipe left_up': 'Swipe LeftUp',
+    'gesture swipe left_down': 'Swipe LeftDown',
+    'gesture swipe right': 'Swipe Right',
+    'gesture swipe right_up': 'Swipe RightUp',
+    'gesture swipe right_down': 'Swipe RightDown',
+    'gesture pinch in': 'Pinch In',
+    'gesture pinch out': 'Pinch Out',
+    'gesture pinch clockwise': 'Pinch Clockwise',
+    'gesture pinch anticlockwise': 'Pinch Anticlockwise'
+}
+
+keys_mapping = {
+    'meta': 'super',
+    'pgdown': 'Page_Down',
+    'pgup': 'Page_Up',
+    'right': 'Right',
+    'left': 'Left',
+    'up': 'Up',
+    'down': 'Down',
+    'f1': 'F1',
+    'f2': 'F2',
+    'f3': 'F3',
+    'f4': 'F4',
+    'f5': 'F5',
+    'f6': 'F6',
+    'f7': 'F7',
+    'f8': 'F8',
+    'f9': 'F9',
+    'f10': 'F10',
+    'f11': 'F11',
+    'f12': 'F12',
+}
+
+keysyms = frozenset(
+    [chr(c) for c in range(ord('a'), ord('z') + 1)] +
+    [chr(c) for c in range(ord('A'), ord('Z') + 1)] +
+    [str(d) for d in range(10)] +
+    ['F{}'.format(n) for n in range(1, 36)] +
+    ['KP_{}'.format(d) for d in range(10)] +
+    # xdotool aliases
+    ['alt', 'ctrl', 'control', 'shift', 'super', 'meta'] +
+    '''BackSpace Tab Linefeed Clear Return Pause Scroll_Lock Sys_Req Escape Delete Home Left Up Right Down
+    Prior Page_Up Next Page_Down End Begin Select Print Execute Insert Undo Redo Menu Find Cancel Help Break
+    Num_Lock KP_Enter KP_Add KP_Subtract KP_Multiply KP_Divide KP_Decimal KP_Separator KP_Equal
+    KP_Home KP_Left KP_Up KP_Right KP_Down KP_Page_Up KP_Page_Down KP_End KP_Begin KP_Insert KP_Delete
+    Shift_L Shift_R Control_L Control_R Caps_Lock Shift_Lock Meta_L Meta_R Alt_L Alt_R
+    Super_L Super_R Hyper_L Hyper_R ISO_Level3_Shift Mode_switch
+    space exclam quotedbl numbersign dollar percent ampersand apostrophe parenleft parenright asterisk plus
+    comma minus period slash colon semicolon less equal greater question at bracketleft backslash
+    bracketright asciicircum underscore grave braceleft bar braceright asciitilde
+    XF86AudioMute XF86AudioLowerVolume XF86AudioRaiseVolume XF86AudioPlay XF86AudioPause XF86AudioStop
+    XF86AudioPrev XF86AudioNext XF86AudioMicMute XF86MonBrightnessUp XF86MonBrightnessDown
+    XF86KbdBrightnessUp XF86KbdBrightnessDown XF86Back XF86Forward XF86Refresh XF86Reload XF86Search
+    XF86HomePage XF86Mail XF86Calculator XF86Explorer XF86Sleep XF86PowerOff XF86ScreenSaver XF86Display
+    XF86TouchpadToggle XF86Copy XF86Cut XF86Paste XF86Close XF86ZoomIn XF86ZoomOut XF86Favorites
+    XF86Launch0 XF86Launch1 XF86Launch2 XF86Launch3 XF86Launch4 XF86Launch5 XF86Launch6 XF86Launch7
+    XF86Launch8 XF86Launch9 XF86LaunchA XF86LaunchB XF86LaunchC XF86LaunchD XF86LaunchE XF86LaunchF'''.split()
+)
+
+kde_defaults = '''
+#This default settings for KDE Plasma generated by libinput-gestures-qt
+#
+#Browser actions Back and Forward
+gesture swipe left 3 xdotool key alt+Right
+gesture swipe right 3 xdotool key alt+Left
+#
+#Present Windows
+gesture swipe down 3 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Expose"
+#
+#Desktop Grid
+gesture swipe up 3  {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "ShowDesktopGrid"
+#
+#Minimize
+gesture swipe down 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Window Minimize"
+#
+#Maximize
+gesture swipe up 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Window Maximize"
+#
+#Next virtual desktop
+gesture swipe left 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Switch to Next Desktop"
+#Previous virtual desktop
+gesture swipe right 4 {qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "Switch to Previous Desktop"
+'''
+
+kde_defaults_description = '''
+Present windows: Swipe Down (3 fingers)
+Desktop Grid: Swipe Up (3 fingers)
+Maximize: Swipe Up (4 fingers)
+Minimize: Swipe Down (4 fingers)
+Next virtual desktop: Swipe Left (4 fingers)
+Previous virtual desktop: Swipe Right (4 fingers)
+Browser 'Back': Swipe Right (3 fingers)
+Browser 'Forward': Swipe Left (3 fingers)
+'''
+
+def find_key_combo(qt_key_combo):
+    """Key combo translator
+    
+    Takes string with QT-like key combo (generated by PyQt5.QtWidgets.QKeySequenceEdit)
+    mapes into a string consumable by xdotool
+    """
+    xdotool_key_combo = []
+    for qt_key in qt_key_combo.split('+'):
+        lowered_key = qt_key.lower()
+        if lowered_key in keys_mapping:
+            xdotool_key_combo.append(keys_mapping[lowered_key])
+        else:
+            xdotool_key_combo.append(lowered_key)
+    return '+'.join(xdotool_key_combo)
+
+
+def key_command(keys, client=False):
+    """Command pressing keys (xdotool form) via xdotool or, if client is True, the resident helper"""
+    return '{} key {}'.format(ACTION_CLIENT if client else 'xdotool', keys)
+
+
+def plasma_command(qdbus_name, shortcut, client=False):
+    """Command invoking kwin shortcut via qdbus or, if client is True or there is no qdbus, the resident helper"""
+    if client or not qdbus_name:
+        return '{} shortcut "{}"'.format(ACTION_CLIENT, shortcut)
+    return '{qdbus} org.kde.kglobalaccel /component/kwin invokeShortcut "{sh}"'.format(qdbus=qdbus_name, sh=shortcut)
+
+
+def gesture_line(action, fingers, command):
+    """Config line, e.g. gesture_line('gesture swipe up', 3, 'xdotool key super+Up')"""
+    return '{} {} {}\n'.format(' '.join(action.split()), str(fingers), command)
+
+
+def client_command(command):
+    """Same xdotool or qdbus action done by the resident helper; other commands are returned as they are"""
+    splitted = command.split()
+    if splitted[:2] == ['xdotool', 'key'] and len(splitted) == 3:
+        return key_command(splitted[2], client=True)
+    if splitted and 'qdbus' in splitted[0] and 'invokeShortcut' in splitted[:-1]:
+        names = QUOTED.findall(command)
+        if names and names[0]:
+            return plasma_command(None, names[0], client=True)
+    return command
+
+
+def with_action_client(text):
+    """Config text (e.g. formatted kde_defaults) with gesture commands switched to the resident helper"""
+    lines = []
+    for line in text.splitlines(True):
+        entry = parse_line(0, line)
+        if isinstance(entry, GestureLine) and entry.command:
+            line = gesture_line(entry.key.rsplit(' ', 1)[0], entry.fingers, client_command(entry.command))
+        lines.append(line)
+    return ''.join(lines)
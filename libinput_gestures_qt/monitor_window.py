@@ -0,0 +1,132 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Live output of libinput-gestures run by the app (Utility > Monitor).
+
+Imported only when the window is opened for the first time.
+
+Variables:
+--------------
+REFRESH_MSEC: int
+    how often new lines are put on screen
+--------------
+Classes:
+MonitorWindow(QtWidgets.QWidget)
+    Start/Stop, debug mode, filter, pause and the output itself.
+--------------
+"""
+
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+from libinput_gestures_qt.event_log import EventLog
+
+REFRESH_MSEC = 200
+
+
+class MonitorWindow(QtWidgets.QWidget):
+    """Shows event_log.EventLog filled from a gestures_process.GesturesProcess
+
+    The log is filled by the main window whether this window is open or not.
+    New lines are put on screen in batches every REFRESH_MSEC while the window is visible
+    and not paused; the view never holds more lines than the log.
+    """
+    def __init__(self, log, process, parent=None):
+        super().__init__(parent, QtCore.Qt.Window)
+        self.setWindowTitle('libinput-gestures monitor')
+        self.resize(720, 420)
+        self.log = log
+        self.process = process
+        self.shown = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(REFRESH_MSEC)
+        self.timer.timeout.connect(self.show_new)
+        self.process.started.connect(self.process_state_changed)
+        self.process.finished.connect(self.process_state_changed)
+        self.process.failed.connect(lambda error: self.status.setText(error))
+
+        self.startButton = QtWidgets.QPushButton()
+        self.startButton.clicked.connect(self.start_or_stop)
+        self.debugCheck = QtWidgets.QCheckBox('Debug (do not run commands)')
+        self.filterLine = QtWidgets.QLineEdit()
+        self.filterLine.setPlaceholderText('Filter')
+        self.filterLine.setClearButtonEnabled(True)
+        self.filterLine.textChanged.connect(self.show_all)
+        self.pauseCheck = QtWidgets.QCheckBox('Pause')
+        self.pauseCheck.toggled.connect(self.pause_toggled)
+        clearButton = QtWidgets.QPushButton('Clear')
+        clearButton.clicked.connect(self.clear)
+        self.output = QtWidgets.QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.output.setMaximumBlockCount(self.log.capacity)
+        self.output.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.status = QtWidgets.QLabel()
+
+        controls = QtWidgets.QHBoxLayout()
+        for widget in (self.startButton, self.debugCheck, self.filterLine, self.pauseCheck, clearButton):
+            controls.addWidget(widget)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.output)
+        layout.addWidget(self.status)
+        self.process_state_changed()
+
+    def process_state_changed(self, *args):
+        running = self.process.is_running()
+        self.startButton.setText('Stop' if running else 'Start')
+        self.debugCheck.setEnabled(not running)
+
+    def start_or_stop(self):
+        if self.process.is_running():
+            self.process.stop()
+        else:
+            self.process.start(['--debug'] if self.debugCheck.isChecked() else ['--verbose'])
+
+    def pause_toggled(self, paused):
+        if not paused:
+            self.show_all()
+
+    def clear(self):
+        self.log.clear()
+        self.show_all()
+
+    def show_all(self):
+        """Re-renders the view from the log, e.g. after the filter has changed"""
+        self.output.clear()
+        self.shown = 0
+        self.show_new()
+
+    def show_new(self):
+        """Appends lines that came since the last call and match the filter"""
+        if self.pauseCheck.isChecked():
+            return
+        new = self.log.since(self.shown)
+        if new:
+            self.shown = new[-1][0]
+            lines = [EventLog.format(entry) for entry in EventLog.matching(new, self.filterLine.text())]
+            if lines:
+                self.output.appendPlainText('\n'.join(lines))
+        self.status.setText('{} lines kept, {} dropped'.format(len(self.log.entries), self.log.dropped))
+
+    def showEvent(self, event):
+        self.show_all()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,255 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Running external tools. Does not depend on Qt.
+
+Every external command goes through one Executor: calls have a timeout, can be cancelled,
+only a few run at once, idempotent queries can be cached, and calls are counted and timed.
+The GUI runs them in QThreadPool (see worker.run_in_background), never in the GUI thread.
+
+Variables:
+--------------
+TIMEOUT: float
+    seconds a command may take before it is killed
+MAX_CALLS: int
+    commands running at once, more wait for their turn
+STATUS_TTL: float
+    seconds 'libinput-gestures-setup status' is cached for
+executor: Executor
+    the one used by run
+--------------
+Classes:
+Cancelled(Exception)
+    Raised by calls killed with Executor.cancel.
+CallStats
+    Count and timing of the calls of one command.
+Executor
+    Runs commands with timeouts, a concurrency limit, a cache and stats.
+--------------
+Functions: run, get_qdbus_name, get_installed, restart_libinput_gestures, kill_libinput_gestures
+--------------
+"""
+
+import os
+import time
+import shutil
+import threading
+import subprocess
+
+from libinput_gestures_qt.trace import tracer
+
+TIMEOUT = 10
+MAX_CALLS = 4
+STATUS_TTL = 2
+
+
+class Cancelled(Exception):
+    """The command was killed by Executor.cancel"""
+
+
+class CallStats:
+    """Calls of one command: count, failures, timeouts, cache hits, total and max duration (seconds)"""
+    __slots__ = ('count', 'failures', 'timeouts', 'cached', 'total', 'longest')
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cached = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Executor:
+    """Runs commands like subprocess.run(args, capture_output=True), but never forever
+
+    run(args, timeout, cache): a call is killed after timeout seconds (subprocess.TimeoutExpired is raised).
+    At most max_calls run at once, others wait. cache (seconds) is for idempotent queries
+    such as status: the result is reused for that long. Any uncached call may change
+    what the cached ones would return, so it drops the cache.
+    self.cancel() kills everything that runs, those calls raise Cancelled.
+    Stats are kept per command, i.e. the binary and its subcommand ('libinput-gestures-setup status').
+    Thread-safe.
+    """
+    def __init__(self, max_calls=MAX_CALLS, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(max_calls)
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.calls = {}
+        self.running = set()
+        self.cancelled = set()
+
+    @staticmethod
+    def command_name(args):
+        name = os.path.basename(args[0])
+        if len(args) > 1 and args[1].isalpha():
+            name += ' ' + args[1]
+        return name
+
+    def stats(self):
+        """{command: {'count': ..., 'failures': ..., 'timeouts': ..., 'cached': ..., 'total': ..., 'longest': ...}}"""
+        with self.lock:
+            return {name: stats.as_dict() for name, stats in self.calls.items()}
+
+    def format_report(self):
+        lines = ['External commands (ms):', '{:<36}{:>7}{:>7}{:>10}{:>10}'.format('command', 'calls', 'cached', 'avg', 'max')]
+        for name, stats in sorted(self.stats().items()):
+            ran = stats['count'] - stats['cached']
+            average = stats['total'] / ran if ran else 0
+            lines.append('{:<36}{:>7}{:>7}{:>10.1f}{:>10.1f}'.format(
+                name, stats['count'], stats['cached'], average * 1000, stats['longest'] * 1000
+            ))
+        return '\n'.join(lines)
+
+    def record(self, name, duration=0.0, failed=False, timed_out=False, cached=False):
+        with self.lock:
+            stats = self.calls.setdefault(name, CallStats())
+            stats.count += 1
+            stats.failures += failed
+            stats.timeouts += timed_out
+            stats.cached += cached
+            stats.total += duration
+            stats.longest = max(stats.longest, duration)
+
+    def invalidate(self):
+        with self.lock:
+            self.cache.clear()
+
+    def cancel(self):
+        """Kills all running commands"""
+        with self.lock:
+            processes = list(self.running)
+            self.cancelled.update(processes)
+        for process in processes:
+            process.kill()
+
+    def run(self, args, timeout=None, cache=None):
+        """subprocess.CompletedProcess with stdout and stderr as bytes
+
+        Raises FileNotFoundError if there is no such command, subprocess.TimeoutExpired, Cancelled.
+        """
+        if isinstance(args, str):
+            args = [args]
+        args = list(args)
+        name = self.command_name(args)
+        with tracer.span(name, 'subprocess', argv=args, cache=cache):
+            return self.call(args, name, timeout, cache)
+
+    def call(self, args, name, timeout, cache):
+        key = tuple(args)
+        if cache:
+            with self.lock:
+                hit = self.cache.get(key)
+            if hit and time.monotonic() - hit[0] < cache:
+                self.record(name, cached=True)
+                return hit[1]
+        with self.slots:
+            started = time.monotonic()
+            try:
+                process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            except OSError:
+                self.record(name, time.monotonic() - started, failed=True)
+                raise
+            with self.lock:
+                self.running.add(process)
+            try:
+                stdout, stderr = process.communicate(timeout=timeout or self.timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                self.record(name, time.monotonic() - started, failed=True, timed_out=True)
+                raise
+            finally:
+                with self.lock:
+                    self.running.discard(process)
+                    cancelled = process in self.cancelled
+                    self.cancelled.discard(process)
+            finished = time.monotonic()
+        if cancelled:
+            self.record(name, finished - started, failed=True)
+            raise Cancelled(' '.join(args))
+        self.record(name, finished - started, failed=process.returncode != 0)
+        result = subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        with self.lock:
+            if cache:
+                self.cache[key] = (finished, result)
+            else:
+                self.cache.clear()
+        return result
+
+
+executor = Executor()
+
+
+def run(args, timeout=None, cache=None):
+    """Runs a command through executor, see Executor.run"""
+    return executor.run(args, timeout, cache)
+
+
+def get_qdbus_name():
+    """It's either 'qdbus' or 'qdbus-qt5', None if there is neither
+
+    Only looks the binary up in PATH. It is needed just for writing qdbus lines,
+    the app itself talks to kglobalaccel in-process (see kglobalaccel.py).
+    """
+    for name in ('qdbus', 'qdbus-qt5'):
+        if shutil.which(name):
+            return name
+    return None
+
+
+def get_installed():
+    """Tries to launch libinput-gestures-setup, returns whether it works"""
+    try:
+        run(['libinput-gestures-setup', 'status'], cache=STATUS_TTL)
+        return True
+    except FileNotFoundError:
+        return False
+    except subprocess.TimeoutExpired:
+        return True
+
+
+def restart_libinput_gestures(only_running=True):
+    """Runs 'libinput-gestures-setup restart' so that libinput-gestures re-reads the config
+
+    If only_running is True, libinput-gestures that is not running is not started.
+    Returns output of the command, None if nothing was done (or libinput-gestures is not installed).
+    Blocks (up to TIMEOUT for each command), see restarter.Restarter for the GUI.
+    """
+    try:
+        if only_running:
+            status = run(['libinput-gestures-setup', 'status']).stdout.decode('utf-8')
+            if 'is running' not in status:
+                return None
+        return run(['libinput-gestures-setup', 'restart']).stdout.decode('utf-8')
+    except FileNotFoundError:
+        return None
+
+
+def kill_libinput_gestures():
+    """Kills every libinput-gestures found in 'ps axu' (but not libinput-gestures-qt)"""
+    processes = run(['ps', 'axu']).stdout.decode('utf-8').split('\n')
+    for proc in processes:
+        if 'python3' in proc and 'libinput-gestures' in proc and 'libinput-gestures-qt' not in proc:
+            try:
+                run(['kill', proc.split()[1]])
+            except Exception:
+                pass
@@ -0,0 +1,110 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Named gesture profiles, e.g. "KDE defaults", "presentation", "browser-only".
+
+A profile is normalized and validated once, when it is saved, and stored as the exact
+content of the configuration file, so switching to it is a single atomic replace.
+Does not depend on Qt.
+
+Variables:
+--------------
+PROFILES_LOCATION: str
+    directory with one '<quoted name>.conf' per profile
+KDE_PROFILE: str
+    name of the profile made from mappings.kde_defaults
+--------------
+Classes:
+ProfileStore
+    Profiles on disk
+--------------
+"""
+
+import os
+import urllib.parse
+
+from libinput_gestures_qt.config import HOME, CONFIG_LOCATION, atomic_write, file_digest, normalize_lines
+
+PROFILES_LOCATION = os.path.join(
+    os.environ.get('XDG_DATA_HOME') or os.path.join(HOME, '.local', 'share'),
+    'libinput-gestures-qt', 'profiles'
+)
+KDE_PROFILE = 'KDE defaults'
+SUFFIX = '.conf'
+
+
+class ProfileStore:
+    """Profiles in self.location (PROFILES_LOCATION by default)"""
+    def __init__(self, location=None):
+        self.location = location or PROFILES_LOCATION
+
+    def path(self, name):
+        """File of profile name; a leading '.' is quoted too, names() skips hidden (e.g. temporary) files"""
+        fname = urllib.parse.quote(name, safe=' ')
+        if fname.startswith('.'):
+            fname = '%2E' + fname[1:]
+        return os.path.join(self.location, fname + SUFFIX)
+
+    def names(self):
+        """Sorted profile names"""
+        try:
+            files = os.listdir(self.location)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            urllib.parse.unquote(fname[:-len(SUFFIX)])
+            for fname in files if fname.endswith(SUFFIX) and not fname.startswith('.')
+        )
+
+    def save(self, name, lines):
+        """Stores lines as profile name, normalized, invalid lines left out
+
+        Returns rejected lines as in config.normalize_lines.
+        """
+        if not name.strip():
+            raise ValueError('empty profile name')
+        rejected = []
+        normalized = list(normalize_lines(lines, rejected))
+        os.makedirs(self.location, exist_ok=True)
+        atomic_write(self.path(name), normalized)
+        return rejected
+
+    def add_builtin(self, name, text):
+        """Stores a profile shipped with the app unless there is one with that name already"""
+        if not os.path.exists(self.path(name)):
+            self.save(name, text.splitlines(True))
+
+    def delete(self, name):
+        os.unlink(self.path(name))
+
+    def active(self, config_path=None):
+        """Name of the profile the configuration file is identical to, None if there is none"""
+        current = file_digest(config_path or CONFIG_LOCATION)
+        for name in self.names():
+            if file_digest(self.path(name)) == current:
+                return name
+        return None
+
+    def switch(self, name, config_path=None):
+        """Makes profile name the configuration: one atomic replace, nothing is parsed
+
+        Raises FileNotFoundError if there is no such profile.
+        Returns True if the configuration file has changed.
+        """
+        with open(self.path(name)) as profile:
+            content = profile.read()
+        return atomic_write(config_path or CONFIG_LOCATION, content, skip_unchanged=True)
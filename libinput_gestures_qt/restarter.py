@@ -0,0 +1,109 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Applying saved changes: libinput-gestures reads its config only when it starts.
+
+Variables:
+--------------
+DELAY_MSEC: int
+    changes saved within that time are applied with a single restart
+--------------
+Classes:
+Restarter(QtCore.QObject)
+    Debounced, serialized restarts of libinput-gestures.
+--------------
+"""
+
+from PyQt5 import QtCore
+
+from libinput_gestures_qt.worker import run_in_background
+from libinput_gestures_qt.process import restart_libinput_gestures
+
+DELAY_MSEC = 700
+
+
+class Restarter(QtCore.QObject):
+    """Restarts libinput-gestures once per batch of changes, never blocking the GUI
+
+    self.schedule() after every save; the restart happens DELAY_MSEC after the last one.
+    The instance run by the app (gestures_process.GesturesProcess) is restarted directly,
+    otherwise 'libinput-gestures-setup restart' runs in QThreadPool, and only if libinput-gestures is running.
+    Restarts never overlap: changes saved during one are applied by one more restart after it,
+    so no gesture is handled by an instance that is half-way through a restart with a stale config.
+    Emits applied(message) when a restart is done ('' if there was nothing to restart).
+    """
+    applied = QtCore.pyqtSignal(str)
+
+    def __init__(self, process, parent=None, delay=DELAY_MSEC):
+        super().__init__(parent)
+        self.process = process
+        self.busy = False
+        self.pending = False
+        self.restarting_process = False
+        self.only_running = True
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.restart)
+        self.process.started.connect(self.process_started)
+        self.process.failed.connect(self.process_failed)
+
+    def schedule(self):
+        """Applies changes after DELAY_MSEC unless more changes come"""
+        self.timer.start()
+
+    def restart_now(self):
+        """Restarts right away (or right after the one in progress), starting libinput-gestures if it is stopped"""
+        self.timer.stop()
+        self.only_running = False
+        self.restart()
+
+    def is_busy(self):
+        return self.busy or self.timer.isActive()
+
+    def restart(self):
+        if self.busy:
+            self.pending = True
+            return
+        self.busy = True
+        if self.process.is_running():
+            self.restarting_process = True
+            self.process.restart()
+        else:
+            only_running, self.only_running = self.only_running, True
+            run_in_background(
+                restart_libinput_gestures, only_running,
+                on_finished=lambda output: self.done((output or '').strip()),
+                on_failed=lambda error: self.done(str(error))
+            )
+
+    def process_started(self):
+        if self.restarting_process:
+            self.restarting_process = False
+            self.done('libinput-gestures restarted')
+
+    def process_failed(self, error):
+        if self.restarting_process:
+            self.restarting_process = False
+            self.done(error)
+
+    def done(self, message):
+        self.busy = False
+        self.applied.emit(message)
+        if self.pending:
+            self.pending = False
+            self.restart()
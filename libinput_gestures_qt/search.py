@@ -0,0 +1,105 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Word index of the gestures table for the filter bar. Does not depend on Qt.
+
+Classes:
+TokenIndex
+    Table rows by the words in their text columns.
+--------------
+"""
+
+FIELDS = 4
+MAX_TERMS = 1000
+
+
+class TokenIndex:
+    """Table rows (gesture, fingers, action type, shortcut, ...) by the words in their first FIELDS columns
+
+    Rows are added and removed one by one as the table changes, nothing is rebuilt.
+    search('swipe 3 firef') returns rows that have every term as a part of some word.
+    Words matching a term are remembered, and a term typed one more letter is only looked up
+    among the words that matched it before, so filtering as you type stays cheap.
+    """
+    def __init__(self):
+        self.counts = {}
+        self.postings = {}
+        self.words = {}
+        self.results = {}
+
+    @staticmethod
+    def tokens(row):
+        return {word for field in row[:FIELDS] for word in str(field).lower().split()}
+
+    def clear(self):
+        self.counts.clear()
+        self.postings.clear()
+        self.words.clear()
+        self.results.clear()
+
+    def add(self, row):
+        self.results.clear()
+        self.counts[row] = self.counts.get(row, 0) + 1
+        if self.counts[row] > 1:
+            return
+        for token in self.tokens(row):
+            if token not in self.postings:
+                self.postings[token] = set()
+                for term, words in self.words.items():
+                    if term in token:
+                        words.add(token)
+            self.postings[token].add(row)
+
+    def remove(self, row):
+        self.results.clear()
+        self.counts[row] -= 1
+        if self.counts[row]:
+            return
+        del self.counts[row]
+        for token in self.tokens(row):
+            self.postings[token].discard(row)
+            if not self.postings[token]:
+                del self.postings[token]
+
+    def matching_words(self, term):
+        if term not in self.words:
+            candidates = self.words.get(term[:-1]) if len(term) > 1 else None
+            if candidates is None:
+                candidates = self.postings
+            if len(self.words) > MAX_TERMS:
+                self.words.clear()
+            self.words[term] = {word for word in candidates if term in word and word in self.postings}
+        return self.words[term]
+
+    def search(self, text):
+        """Set of rows matching every term of text, None if text has no terms (everything matches)"""
+        terms = tuple(sorted(set(text.lower().split()), key=len, reverse=True))
+        if not terms:
+            return None
+        if terms not in self.results:
+            if len(self.results) > MAX_TERMS:
+                self.results.clear()
+            found = None
+            for term in terms:
+                rows = set()
+                for word in self.matching_words(term):
+                    rows |= self.postings.get(word, set())
+                found = rows if found is None else found & rows
+                if not found:
+                    break
+            self.results[terms] = found
+        return self.results[terms]
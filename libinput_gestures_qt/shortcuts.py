@@ -0,0 +1,99 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Cached catalog of kwin shortcuts (the ones Plasma actions invoke).
+
+Names are fetched asynchronously with kglobalaccel.KGlobalAccel and kept in memory
+and under the XDG cache dir, so they are there right away on the next start.
+The list is stale once kglobalshortcutsrc changes. Does not depend on Qt.
+
+Variables:
+--------------
+CACHE_LOCATION: str
+    path to the cached list
+KGLOBALSHORTCUTSRC: str
+    path to the kglobalaccel configuration file
+--------------
+Classes:
+ShortcutCatalog
+    kwin shortcut names, in memory and on disk
+--------------
+"""
+
+import os
+import json
+
+from libinput_gestures_qt.config import HOME
+
+CACHE_LOCATION = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(HOME, '.cache'),
+    'libinput-gestures-qt', 'kwin-shortcuts.json'
+)
+KGLOBALSHORTCUTSRC = os.path.join(
+    os.environ.get('XDG_CONFIG_HOME') or os.path.join(HOME, '.config'),
+    'kglobalshortcutsrc'
+)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class ShortcutCatalog:
+    """kwin shortcut names, in memory and on disk
+
+    self.names: list of str, possibly stale (see self.is_stale)
+    """
+    def __init__(self, cache_location=None, source_location=None):
+        self.cache_location = cache_location or CACHE_LOCATION
+        self.source_location = source_location or KGLOBALSHORTCUTSRC
+        self.names = []
+        self.stamp = None
+        self.load()
+
+    def load(self):
+        """Reads the cache from disk; broken or missing cache leaves the catalog empty"""
+        try:
+            with open(self.cache_location) as cache:
+                data = json.load(cache)
+            self.names = list(data['names'])
+            self.stamp = data['stamp']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.names = []
+            self.stamp = None
+
+    def is_stale(self):
+        """True if there is nothing cached or kglobalshortcutsrc has changed since"""
+        return not self.names or self.stamp != self.source_stamp()
+
+    def source_stamp(self):
+        """mtime of kglobalshortcutsrc, take it before fetching names and pass it to self.update"""
+        return _mtime(self.source_location)
+
+    def update(self, names, stamp):
+        """Stores names in memory and on disk"""
+        self.names = list(names)
+        self.stamp = stamp
+        try:
+            os.makedirs(os.path.dirname(self.cache_location), exist_ok=True)
+            with open(self.cache_location, 'w') as cache:
+                json.dump({'stamp': stamp, 'names': self.names}, cache)
+        except OSError:
+            pass
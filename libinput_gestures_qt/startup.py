@@ -0,0 +1,100 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Startup-time instrumentation, reported by `libinput-gestures-qt --profile-startup`.
+
+Spans are always recorded (it costs a couple of perf_counter calls),
+the report is printed only when profiling was asked for. Does not depend on Qt.
+
+Variables:
+--------------
+profiler: StartupProfiler
+    the one used by the app, started when the package is imported
+--------------
+Classes:
+StartupProfiler
+    Named spans relative to process start.
+--------------
+"""
+
+import sys
+import time
+import contextlib
+
+
+class StartupProfiler:
+    """Named spans relative to self.start
+
+    self.spans: dict, name >> (start offset, duration) in seconds
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = {}
+        self.opened = {}
+        self.enabled = False
+        self.waiting = None
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """with profiler.span('setupUi'): ..."""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def begin(self, name):
+        self.opened[name] = time.perf_counter()
+
+    def end(self, name):
+        """Closes span opened with self.begin, does nothing if it is not open"""
+        started = self.opened.pop(name, None)
+        if started is not None:
+            self.record(name, started, time.perf_counter())
+
+    def mark(self, name):
+        """Zero-length span, e.g. 'first paint'"""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def record(self, name, started, finished):
+        if name not in self.spans:
+            self.spans[name] = (started - self.start, finished - started)
+        self.check_waiting()
+
+    def report_when(self, *names):
+        """Prints report once all names are recorded (only if self.enabled)"""
+        if self.enabled:
+            self.waiting = names
+            self.check_waiting()
+
+    def check_waiting(self):
+        if self.waiting and all(wanted in self.spans for wanted in self.waiting):
+            self.waiting = None
+            self.report()
+
+    def format_report(self):
+        lines = ['Startup profile (ms since start):', '{:<24}{:>10}{:>10}'.format('span', 'at', 'took')]
+        for name, (offset, duration) in sorted(self.spans.items(), key=lambda item: item[1][0]):
+            lines.append('{:<24}{:>10.1f}{:>10.1f}'.format(name, offset * 1000, duration * 1000))
+        return '\n'.join(lines)
+
+    def report(self, file=None):
+        print(self.format_report(), file=file or sys.stderr)
+
+
+profiler = StartupProfiler()
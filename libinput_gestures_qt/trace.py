@@ -0,0 +1,143 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Opt-in tracing in Chrome trace-event format (open the file in chrome://tracing or ui.perfetto.dev).
+
+Enabled by LIBINPUT_GESTURES_QT_TRACE=<file> or `--trace <file>` (both the GUI and the CLI).
+Events are written as they happen, a span is written when it begins and when it ends,
+so a trace of an app that hung and was killed is still readable and shows the span it hung in.
+Disabled tracing costs an attribute check per span. Does not depend on Qt.
+
+Variables:
+--------------
+TRACE_VARIABLE: str
+    environment variable with the trace file
+tracer: Tracer
+    the one used by the app, enabled on import if TRACE_VARIABLE is set
+--------------
+Classes:
+Tracer
+    Writes spans and instant events to a trace file.
+--------------
+Functions: take_trace_argument
+--------------
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+
+TRACE_VARIABLE = 'LIBINPUT_GESTURES_QT_TRACE'
+
+# suppress() without exceptions is a reusable context manager that does nothing
+_NO_SPAN = contextlib.suppress()
+
+
+class Tracer:
+    """Spans (with tracer.span('config parse', 'config'): ...) and instant events, written to self.file
+
+    Timestamps are microseconds since the tracer was created. Thread-safe.
+    """
+    def __init__(self):
+        self.file = None
+        self.start = time.perf_counter()
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.threads = set()
+        self.separator = ''
+
+    @property
+    def enabled(self):
+        return self.file is not None
+
+    def enable(self, path):
+        """Starts writing the trace to path (overwritten)"""
+        self.close()
+        self.file = open(path, 'w')
+        self.file.write('[\n')
+        self.separator = ''
+        self.emit({'name': 'process_name', 'ph': 'M', 'args': {'name': 'libinput-gestures-qt'}})
+
+    def close(self):
+        """Finishes the trace file, nothing is recorded after that"""
+        with self.lock:
+            if self.file is not None:
+                self.file.write('\n]\n')
+                self.file.close()
+                self.file = None
+
+    def timestamp(self):
+        return (time.perf_counter() - self.start) * 1e6
+
+    def emit(self, event):
+        event['pid'] = self.pid
+        event['tid'] = threading.get_ident()
+        with self.lock:
+            if self.file is None:
+                return
+            if event['tid'] not in self.threads:
+                self.threads.add(event['tid'])
+                self.write({
+                    'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': event['tid'],
+                    'args': {'name': threading.current_thread().name}
+                })
+            self.write(event)
+            self.file.flush()
+
+    def write(self, event):
+        self.file.write(self.separator + json.dumps(event))
+        self.separator = ',\n'
+
+    def span(self, name, category='app', **args):
+        """Context manager recording a span with args (shown in the trace viewer)"""
+        if self.file is None:
+            return _NO_SPAN
+        return self._span(name, category, args)
+
+    @contextlib.contextmanager
+    def _span(self, name, category, args):
+        self.emit({'name': name, 'cat': category, 'ph': 'B', 'ts': self.timestamp(), 'args': args})
+        try:
+            yield
+        finally:
+            self.emit({'name': name, 'cat': category, 'ph': 'E', 'ts': self.timestamp()})
+
+    def instant(self, name, category='app', **args):
+        if self.file is not None:
+            self.emit({'name': name, 'cat': category, 'ph': 'i', 's': 't', 'ts': self.timestamp(), 'args': args})
+
+
+def take_trace_argument(argv):
+    """Removes '--trace <file>' from argv (e.g. sys.argv) and enables tracer with it"""
+    if '--trace' in argv:
+        i = argv.index('--trace')
+        if i + 1 >= len(argv):
+            raise SystemExit('--trace needs a file')
+        path = argv[i + 1]
+        del argv[i:i + 2]
+        tracer.enable(path)
+
+
+tracer = Tracer()
+if os.environ.get(TRACE_VARIABLE):
+    try:
+        tracer.enable(os.environ[TRACE_VARIABLE])
+    except OSError as e:
+        print('warning: cannot write trace: {}'.format(e), file=sys.stderr)
@@ -0,0 +1,176 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Checks that configured actions can actually run. Does not depend on Qt,
+the GUI runs it in background (see GesturesApp.validate_config).
+
+Variables:
+--------------
+OK, WARNING, ERROR: str
+    levels of a result, results are (level, message)
+--------------
+Classes:
+Validator
+    Checks gesture commands, remembers what it has checked.
+--------------
+"""
+
+import os
+import re
+import shlex
+import shutil
+import itertools
+
+from libinput_gestures_qt.action_client import ACTION_CLIENT
+from libinput_gestures_qt.config import QUOTED, GestureLine, parse_line
+from libinput_gestures_qt.mappings import keys_mapping, keysyms
+
+OK = 'ok'
+WARNING = 'warning'
+ERROR = 'error'
+
+ASSIGNMENT = re.compile(r'[A-Za-z_][A-Za-z0-9_]*=')
+LOWERED_KEYSYMS = frozenset(key.lower() for key in keysyms) | frozenset(keys_mapping)
+
+
+def _xlib_keysym(name):
+    """True if python-xlib (optional) knows the keysym, None if it is not installed"""
+    try:
+        from Xlib import XK
+    except ImportError:
+        return None
+    return XK.string_to_keysym(name) != 0
+
+
+class Validator:
+    """Checks gesture commands
+
+    xdotool keys are checked against mappings.keysyms and keys_mapping (and python-xlib if it is installed),
+    Plasma actions against the kwin shortcut catalog, other commands against PATH.
+    Binaries, keys and whole lines are looked up once: revalidating after an edit only checks
+    the changed lines. Lines with Plasma actions are checked again when the catalog changes,
+    everything after self.clear() (e.g. when something may have been installed).
+    Not thread-safe, use it from one thread at a time.
+    """
+    def __init__(self, which=shutil.which):
+        self.which = which
+        self.binaries = {}
+        self.keys = {}
+        self.results = {}
+        self.plasma_lines = set()
+        self.catalog = None
+        self.stale = False
+
+    def clear(self):
+        """Forgets everything on the next check"""
+        self.stale = True
+
+    def check_lines(self, lines, catalog=None):
+        """{key: (level, message)} for (key, line) pairs; key is anything hashable, e.g. the GestureLine
+
+        Lines sharing a key get the worst of their results.
+        catalog: kwin shortcut names, None if they are not known.
+        """
+        if self.stale:
+            self.stale = False
+            self.binaries.clear()
+            self.keys.clear()
+            self.results.clear()
+            self.plasma_lines.clear()
+        catalog = frozenset(catalog) if catalog else None
+        if catalog != self.catalog:
+            self.catalog = catalog
+            for line in self.plasma_lines:
+                self.results.pop(line, None)
+            self.plasma_lines.clear()
+        checked = {}
+        results = {}
+        order = (OK, WARNING, ERROR)
+        for key, line in lines:
+            result = results[line] = self.results.get(line) or self.check_line(line)
+            if key not in checked or order.index(result[0]) > order.index(checked[key][0]):
+                checked[key] = result
+        # results of lines that are gone are not kept
+        self.results = results
+        return checked
+
+    def check_line(self, line):
+        entry = parse_line(0, line)
+        if not isinstance(entry, GestureLine):
+            return OK, ''
+        action = entry.action
+        if action == 'Keyboard shortcut':
+            return self.check_keys(entry.command)
+        if action == 'Plasma action':
+            self.plasma_lines.add(line)
+            return self.check_plasma(entry.command, entry.shortcut)
+        return self.check_command(entry.command)
+
+    def resolve(self, name):
+        """True if name is an executable in PATH (or an executable path)"""
+        if name not in self.binaries:
+            if os.sep in name:
+                self.binaries[name] = os.path.isfile(name) and os.access(name, os.X_OK)
+            else:
+                self.binaries[name] = self.which(name) is not None
+        return self.binaries[name]
+
+    def is_key(self, name):
+        if name not in self.keys:
+            known = name in keysyms or name.lower() in LOWERED_KEYSYMS
+            self.keys[name] = known or bool(_xlib_keysym(name))
+        return self.keys[name]
+
+    def check_keys(self, command):
+        """'xdotool key <keys>' or '<helper> key <keys>'"""
+        splitted = command.split()
+        if not self.resolve(splitted[0]):
+            return ERROR, '{} is not installed'.format(splitted[0])
+        if len(splitted) < 3:
+            return ERROR, 'no keys'
+        for combo in splitted[2:]:
+            if combo.startswith('-'):
+                continue
+            for name in combo.split('+'):
+                if not self.is_key(name):
+                    return ERROR, 'unknown key "{}"'.format(name)
+        return OK, ''
+
+    def check_plasma(self, command, shortcut):
+        """qdbus or helper line invoking kwin shortcut"""
+        binary = command.split()[0]
+        if not self.resolve(binary):
+            if binary == ACTION_CLIENT:
+                return ERROR, '{} is not installed'.format(binary)
+            return ERROR, '{} is not installed, switch to the helper'.format(binary)
+        if binary != ACTION_CLIENT and not QUOTED.findall(command):
+            return WARNING, 'shortcut name is not quoted'
+        if self.catalog is not None and shortcut not in self.catalog:
+            return WARNING, 'no kwin shortcut "{}"'.format(shortcut)
+        return OK, ''
+
+    def check_command(self, command):
+        try:
+            words = shlex.split(command)
+        except ValueError as e:
+            return ERROR, str(e)
+        words = list(itertools.dropwhile(ASSIGNMENT.match, words))
+        if not words:
+            return ERROR, 'no command'
+        if not self.resolve(words[0]):
+            return ERROR, '{} is not found in PATH'.format(words[0])
+        return OK, ''
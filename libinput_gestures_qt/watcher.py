@@ -0,0 +1,73 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Watching the configuration file for changes made outside of the app.
+
+Classes:
+ConfigWatcher(QtCore.QObject)
+    Emits changed() once per burst of external writes.
+--------------
+"""
+
+import os
+
+from PyQt5 import QtCore
+
+from libinput_gestures_qt.config import CONFIG_LOCATION
+
+DEBOUNCE_MSEC = 300
+
+
+class ConfigWatcher(QtCore.QObject):
+    """Watches config file of a config.Config
+
+    Both the file and its directory are watched: editors and config management tools
+    often replace the file instead of writing it, and the file may not exist yet.
+    Events are coalesced for DEBOUNCE_MSEC, then changed() is emitted
+    if mtime or size differ from what config has read or written itself.
+    """
+    changed = QtCore.pyqtSignal()
+
+    def __init__(self, config, parent=None, debounce=DEBOUNCE_MSEC):
+        super().__init__(parent)
+        self.config = config
+        self.path = os.path.abspath(config.path or CONFIG_LOCATION)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce)
+        self.timer.timeout.connect(self.check)
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule)
+        self.watcher.directoryChanged.connect(self.schedule)
+        self.watch()
+
+    def watch(self):
+        """(Re)adds paths, the file gets dropped from the watcher when it is replaced"""
+        paths = set(self.watcher.files() + self.watcher.directories())
+        for path in (os.path.dirname(self.path), self.path):
+            if path not in paths and os.path.exists(path):
+                self.watcher.addPath(path)
+
+    def schedule(self, path=None):
+        """Restarts the debounce timer"""
+        self.timer.start()
+
+    def check(self):
+        self.watch()
+        if self.config.changed_on_disk():
+            self.changed.emit()
+
@@ -0,0 +1,80 @@
+'''libinput-gestures-qt. User interface for the libinput-gestures utility.
+    Copyright (C) 2019  Michael Voronov
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Running blocking calls (subprocesses mostly) off the GUI thread.
+
+Classes:
+WorkerSignals(QtCore.QObject)
+    Signals of a Worker, delivered in the GUI thread.
+Worker(QtCore.QRunnable)
+    Runs a function in QThreadPool.
+--------------
+Functions: run_in_background
+--------------
+"""
+
+from PyQt5 import QtCore
+
+# Workers are kept here until they report back,
+# otherwise their signals may be garbage collected before delivery
+_active = set()
+
+
+class WorkerSignals(QtCore.QObject):
+    """finished(result) or failed(exception)"""
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+
+
+class Worker(QtCore.QRunnable):
+    """Calls fn(*args, **kwargs) in a pool thread"""
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+    def _done(self, _):
+        _active.discard(self)
+
+
+def run_in_background(fn, *args, on_finished=None, on_failed=None, pool=None, **kwargs):
+    """Starts fn(*args, **kwargs) in QThreadPool
+
+    on_finished(result) and on_failed(exception) are called in the GUI thread.
+    Returns the Worker.
+    """
+    worker = Worker(fn, *args, **kwargs)
+    worker.setAutoDelete(False)
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    if on_failed:
+        worker.signals.failed.connect(on_failed)
+    worker.signals.finished.connect(worker._done)
+    worker.signals.failed.connect(worker._done)
+    _active.add(worker)
+    (pool or QtCore.QThreadPool.globalInstance()).start(worker)
+    return worker
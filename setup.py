@@ -13,7 +13,10 @@ setup(
         'dev': ['pytest']
     },
     zip_safe=False,
-    scripts=['libinput-gestures-qt'],
+    scripts=[
+        'libinput-gestures-qt', 'libinput-gestures-qt-cli',
+        'libinput-gestures-qt-action', 'libinput-gestures-qt-daemon',
+    ],
     data_files=[
         ('share/applications', ['libinput_gestures_qt/logo/libinput-gestures-qt.desktop']),
         ('share/pixmaps/', ['libinput_gestures_qt/logo/libinput-gestures-qt.png']),
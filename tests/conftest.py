@@ -0,0 +1,14 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+
+from libinput_gestures_qt import history, profiles
+
+
+@pytest.fixture(autouse=True)
+def data_locations(tmp_path, monkeypatch):
+    """Keeps journals and profiles written by tests out of the real XDG data dir"""
+    monkeypatch.setattr(history, 'HISTORY_LOCATION', str(tmp_path / 'history'))
+    monkeypatch.setattr(profiles, 'PROFILES_LOCATION', str(tmp_path / 'profiles'))
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import bench_config  # noqa: E402
+
+
+def test_generate_config():
+    lines = bench_config.generate_config(1000)
+    assert len(lines) == 1000
+    assert bench_config.generate_config(1000) == lines
+    assert any('xdotool key' in line for line in lines)
+    assert any('invokeShortcut' in line for line in lines)
+
+
+def test_run_benchmarks_smoke():
+    results = bench_config.run_benchmarks([10])
+    assert {result['function'] for result in results} == {
+        'read_config', 'resub_config', 'fix_config',
+        'prepare_config_for_displaying', 'sort_config', 'find_key_combo',
+    }
+    slow = [dict(result, lines=1000, per_line_us=1e9) for result in results]
+    assert len(bench_config.check_thresholds(slow, {'read_config': 1.0})) == 1
+    baseline = {'results': [dict(result, seconds=result['seconds'] / 10) for result in results]}
+    assert bench_config.check_baseline(results, baseline, 100.0) == []
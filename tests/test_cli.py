@@ -0,0 +1,66 @@
+import sys
+import json
+import subprocess
+
+from libinput_gestures_qt.cli import main
+
+
+def test_cli_does_not_import_qt():
+    code = 'import sys, libinput_gestures_qt.cli; assert "PyQt5" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_add_edit_delete(tmp_path, capsys):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    assert main(['--config', path, 'add', 'swipe', 'up', '3', '--key', 'Meta+PgDown']) == 0
+    assert main(['--config', path, 'add', 'pinch', 'in', '2', '--command', 'echo hi']) == 0
+    assert main(['--config', path, 'edit', 'pinch', 'in', '2', '--command', 'echo bye']) == 0
+    assert main(['--config', path, 'add', 'swipe', 'nowhere', '3', '--command', 'echo']) == 1
+    capsys.readouterr()
+
+    assert main(['--config', path, 'list', '--json']) == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {'gesture': 'Pinch In', 'fingers': '2', 'type': 'Command', 'action': 'echo bye'},
+        {'gesture': 'Swipe Up', 'fingers': '3', 'type': 'Keyboard shortcut', 'action': 'super+Page_Down'},
+    ]
+
+    assert main(['--config', path, 'delete', 'pinch', 'in', '2']) == 0
+    assert main(['--config', path, 'delete', 'pinch', 'in', '2']) == 1
+    with open(path) as f:
+        assert f.read() == 'gesture swipe up 3 xdotool key super+Page_Down\n'
+
+
+def test_validate(tmp_path, capsys):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write('gesture swipe up 3 echo\ngesture swipe down\n')
+    assert main(['--config', path, 'validate']) == 1
+    assert 'line 2:' in capsys.readouterr().err
+
+
+def test_list_lines_without_keys(tmp_path, capsys):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write('gesture swipe up 3 xdotool key\ngesture swipe down 3 libinput-gestures-qt-action key\n')
+    assert main(['--config', path, 'list']) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        'Swipe Down\t3\tKeyboard shortcut\t', 'Swipe Up\t3\tKeyboard shortcut\t'
+    ]
+
+
+def test_gestures_under_devices(tmp_path, capsys):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write('gesture swipe up 3 echo top\ngesture swipe down 3 echo top\ndevice foo\ngesture swipe down 3 echo foo\n')
+    assert main(['--config', path, 'delete', 'swipe', 'up', '3']) == 0
+    assert main(['--config', path, 'edit', 'swipe', 'down', '3', '--command', 'echo bye']) == 1
+    assert '"", "foo"' in capsys.readouterr().err
+    assert main(['--config', path, 'edit', 'swipe', 'down', '3', '--device', 'foo', '--command', 'echo bye']) == 0
+    assert main(['--config', path, 'add', 'pinch', 'in', '2', '--device', '', '--command', 'echo in']) == 0
+    assert main(['--config', path, 'add', 'pinch', 'out', '2', '--device', 'bar', '--command', 'echo out']) == 0
+    assert main(['--config', path, 'delete', 'swipe', 'down', '3', '--device', '']) == 0
+    with open(path) as f:
+        assert f.read() == (
+            'gesture pinch in 2 echo in\ndevice foo\ngesture swipe down 3 echo bye\n'
+            'device bar\ngesture pinch out 2 echo out\n'
+        )
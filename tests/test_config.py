@@ -0,0 +1,180 @@
+import os
+
+from libinput_gestures_qt.config import Config, GestureLine, DeviceLine, normalize_config, stat_config, atomic_write
+
+
+CONF = '''# comment
+device all
+gesture swipe up 3 xdotool key super+Up
+gesture swipe   down 4 qdbus org.kde.kglobalaccel /component/kwin invokeShortcut "Window Minimize"
+gesture pinch in 2 echo "Hello"
+gesture swipe left
+'''
+
+
+def test_parse():
+    config = Config(CONF.splitlines(True))
+    assert isinstance(config.lines[1], DeviceLine)
+    gestures = config.gestures()
+    assert [g.index for g in gestures] == [2, 3, 4, 5]
+    assert [g.action for g in gestures[:3]] == ['Keyboard shortcut', 'Plasma action', 'Command']
+    assert [g.shortcut for g in gestures[:3]] == ['super+Up', 'Window Minimize', 'echo "Hello"']
+    assert gestures[1].key == 'gesture swipe down 4'
+    assert config.serialize() == CONF
+
+
+def test_edit_in_memory():
+    config = Config(CONF.splitlines(True))
+    rejected = config.normalize()
+    assert rejected == [(6, 'gesture swipe left', 'gesture needs type, direction, fingers and command')]
+    assert len(config.gestures()) == 3
+    config.remove(config.gestures()[0])
+    new = config.append('gesture swipe right 3 xdotool key alt+Left')
+    assert isinstance(new, GestureLine) and new.index == len(config.lines) - 1
+    config.replace(config.gestures()[0], 'gesture swipe down 3 echo\n')
+    assert config.serialize().splitlines()[2:] == [
+        'gesture swipe down 3 echo',
+        'gesture pinch in 2 echo "Hello"',
+        'gesture swipe right 3 xdotool key alt+Left',
+    ]
+
+
+def test_save(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    config = Config.load(path)
+    assert config.lines == []
+    config.append('gesture swipe up 3 echo')
+    config.save()
+    assert Config.load(path).serialize() == 'gesture swipe up 3 echo\n'
+
+
+def test_reload_reuses_unchanged_records(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write(CONF)
+    config = Config.load(path)
+    first, second = config.gestures()[:2]
+    assert not config.changed_on_disk()
+
+    with open(path, 'w') as f:
+        f.write(CONF.replace('super+Up', 'super+Down') + 'gesture pinch out 2 echo\n')
+    assert config.changed_on_disk()
+    config.reload()
+    assert not config.changed_on_disk()
+    assert config.gestures()[0] is not first
+    assert config.gestures()[1] is second
+    assert len(config.gestures()) == 5
+
+
+def test_transaction_writes_once(tmp_path, monkeypatch):
+    from libinput_gestures_qt import config as config_module
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write(CONF)
+    writes = []
+    write_config = config_module.write_config
+    monkeypatch.setattr(config_module, 'write_config', lambda *a: writes.append(a) or write_config(*a))
+
+    config = Config.load(path)
+    assert not config.save()
+    with config.transaction():
+        config.normalize(drop_invalid=False)
+        config.save()
+        config.normalize()
+        config.save()
+    assert len(writes) == 1
+    assert not config.save()
+    assert Config.load(path).serialize() == config.serialize()
+
+    try:
+        with config.transaction():
+            config.remove(config.gestures()[0])
+            config.save()
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert len(writes) == 1
+    assert len(config.gestures()) == 3
+    assert [line.index for line in config.gestures()] == [2, 3, 4]
+
+
+def test_normalize_config_streams_and_reports(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    source = str(tmp_path / 'imported.conf')
+    with open(source, 'w') as f:
+        f.write(CONF + 'gesture swipe up\n\tswipe_threshold 0\nfoo bar\ngesture pinch in 2 xdotool key\n'
+                'gesture swipe diagonal 3 echo hi\ngesture swipe up three echo hi\n')
+    rejected = normalize_config(path, source=source)
+    assert [(lineno, reason) for lineno, line, reason in rejected] == [
+        (6, 'gesture needs type, direction, fingers and command'),
+        (7, 'gesture needs type, direction, fingers and command'),
+        (9, 'unknown directive "foo"'),
+        (10, 'xdotool command must be "xdotool key <keys>"'),
+        (11, 'unknown gesture "swipe diagonal"'),
+        (12, 'fingers must be a number, not "three"'),
+    ]
+    with open(path) as f:
+        assert f.read().splitlines()[-2:] == [
+            'gesture pinch in 2 echo "Hello"',
+            'swipe_threshold 0',
+        ]
+    stamp = stat_config(path)
+    assert normalize_config(path) == []
+    assert stat_config(path) == stamp
+
+
+def test_index_exact_and_by_device():
+    config = Config([
+        'gesture swipe up 3 xdotool key super+Up\n',
+        'gesture swipe up 4 echo "4"\n',
+        'device DLL0665:01\n',
+        'gesture swipe up 3 echo "touchpad"\n',
+    ])
+    assert [r.index for r in config.find('swipe', 'up', 3)] == [3]
+    assert [r.index for r in config.lookup(('swipe', 'up', '3', None))] == [0]
+    assert config.lines[3].index_key == ('swipe', 'up', '3', 'DLL0665:01')
+    assert config.find('swipe', 'up', 5) == []
+
+
+def test_index_follows_changes():
+    config = Config(CONF.splitlines(True))
+    index = config.index()
+    added = config.append('gesture swipe up 3 echo "again"\n')
+    assert config.find('swipe', 'up', '3') == [config.lines[2], added]
+    config.replace(config.lines[2], 'gesture swipe right 3 echo "right"\n')
+    assert config.find('swipe', 'up', '3') == [added]
+    assert config.find('swipe', 'right', '3')[0].command == 'echo "right"'
+    config.remove(added)
+    assert config.find('swipe', 'up', '3') == []
+    assert config.index() is index
+    try:
+        with config.transaction():
+            config.remove(config.lines[3])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert config.find('swipe', 'down', '4')[0].index == 3
+
+
+def test_atomic_write_through_symlink(tmp_path):
+    real = tmp_path / 'dotfiles' / 'libinput-gestures.conf'
+    real.parent.mkdir()
+    real.write_text('old\n')
+    os.chmod(str(real), 0o600)
+    link = tmp_path / 'libinput-gestures.conf'
+    link.symlink_to(real)
+    assert atomic_write(str(link), 'new\n')
+    assert link.is_symlink() and real.read_text() == 'new\n'
+    assert os.stat(str(real)).st_mode & 0o777 == 0o600
+
+
+def test_atomic_write_new_file_follows_umask(tmp_path):
+    umask = os.umask(0o077)
+    try:
+        assert atomic_write(str(tmp_path / 'private.conf'), 'new\n')
+        os.umask(0o022)
+        assert atomic_write(str(tmp_path / 'shared.conf'), 'new\n')
+    finally:
+        os.umask(umask)
+    assert os.stat(str(tmp_path / 'private.conf')).st_mode & 0o777 == 0o600
+    assert os.stat(str(tmp_path / 'shared.conf')).st_mode & 0o777 == 0o644
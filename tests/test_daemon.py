@@ -0,0 +1,64 @@
+import sys
+
+from PyQt5 import QtWidgets
+
+from libinput_gestures_qt.action_client import send, is_running, fallback_command
+from libinput_gestures_qt.config import GestureLine, check_line
+from libinput_gestures_qt.daemon import ActionDaemon
+from libinput_gestures_qt.mappings import with_action_client
+from libinput_gestures_qt.process import get_qdbus_name
+
+QDBUS_ARGUMENTS = ['org.kde.kglobalaccel', '/component/kwin', 'invokeShortcut']
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, name):
+        self.calls.append(('shortcut', name))
+
+    def press(self, keys):
+        self.calls.append(('key', keys))
+
+
+def test_client_lines():
+    text = with_action_client(
+        'gesture swipe left 3 xdotool key alt+Right\n'
+        'gesture swipe up 4 qdbus org.kde.kglobalaccel /component/kwin invokeShortcut "Window Maximize"\n'
+        'gesture pinch in 2 echo hi\n'
+    )
+    lines = text.splitlines(True)
+    assert lines[0] == 'gesture swipe left 3 libinput-gestures-qt-action key alt+Right\n'
+    assert lines[1] == 'gesture swipe up 4 libinput-gestures-qt-action shortcut "Window Maximize"\n'
+    assert lines[2] == 'gesture pinch in 2 echo hi\n'
+    assert all(check_line(line) is None for line in lines)
+
+    entry = GestureLine(1, lines[1])
+    assert entry.uses_client and entry.action == 'Plasma action' and entry.shortcut == 'Window Maximize'
+    assert GestureLine(0, lines[0]).shortcut == 'alt+Right'
+    assert check_line('gesture swipe up 3 libinput-gestures-qt-action run x\n') is not None
+
+
+def test_daemon_dispatches_requests(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    path = str(tmp_path / 'helper.sock')
+    recorder = Recorder()
+    assert not send('key', 'ctrl+t', path)
+
+    daemon = ActionDaemon(path, shortcuts=recorder, keys=recorder)
+    assert daemon.listen()
+    assert is_running(path)
+    assert not ActionDaemon(path, shortcuts=recorder, keys=recorder).listen()
+    assert send('key', 'ctrl+t', path)
+    assert send('shortcut', 'Window Maximize', path)
+    for _ in range(100):
+        app.processEvents()
+        if len(recorder.calls) == 2:
+            break
+    assert recorder.calls == [('key', 'ctrl+t'), ('shortcut', 'Window Maximize')]
+    assert not daemon.handle('reboot now')
+    daemon.server.close()
+
+    assert fallback_command('key', 'ctrl+t') == ['xdotool', 'key', 'ctrl+t']
+    assert fallback_command('shortcut', 'Expose') in (None, [get_qdbus_name(), *QDBUS_ARGUMENTS, 'Expose'])
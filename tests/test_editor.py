@@ -0,0 +1,78 @@
+import sys
+import resource
+
+import pytest
+from PyQt5 import QtWidgets
+
+from libinput_gestures_qt.config import Config
+from libinput_gestures_qt.shortcuts import ShortcutCatalog
+from libinput_gestures_qt.editor import EditGestures
+
+
+@pytest.fixture
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+
+class Parent:
+    """What EditGestures needs from the main window"""
+    QDBUS_NAME = 'qdbus'
+    use_action_client = False
+    plasma_available = True
+
+    def __init__(self, tmp_path):
+        self.config = Config([
+            'gesture swipe up 3 xdotool key super+Page_Down\n',
+            'gesture swipe down 4 firefox --new-window\n',
+        ])
+        self.shortcut_catalog = ShortcutCatalog(str(tmp_path / 'cache'), str(tmp_path / 'rc'))
+        self.shortcut_catalog.names = ['Expose', 'Overview']
+
+    def refresh_kwin_shortcuts(self):
+        pass
+
+
+def test_switching_inputs_reuses_widgets(tmp_path, app):
+    editor = EditGestures(Parent(tmp_path))
+    widgets = len(editor.findChildren(QtWidgets.QWidget))
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for _ in range(2000):
+        for text in ('Keyboard Shortcut', 'Plasma action', 'Command'):
+            editor.shortcut_command_or_qdbus(text)
+    app.processEvents()
+    assert len(editor.findChildren(QtWidgets.QWidget)) == widgets
+    assert resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss < 10 * 1024
+
+    editor.commandLine.setText('firefox')
+    assert editor.shortcut == 'firefox'
+    editor.shortcut_command_or_qdbus('Keyboard Shortcut')
+    assert editor.inputStack.currentWidget() is editor.keyboardLine
+    assert editor.shortcut == ''
+    editor.shortcut_command_or_qdbus('Plasma action')
+    assert editor.plasmaActions.count() == 2
+    editor.plasma_action_chosen('Overview')
+    assert editor.shortcut.endswith('"Overview"')
+    editor.shortcut_command_or_qdbus('Command')
+    assert editor.commandLine.text() == '' and editor.shortcut == ''
+
+
+@pytest.mark.usefixtures('app')
+def test_reset_for_add_and_edit(tmp_path):
+    parent = Parent(tmp_path)
+    editor = EditGestures(parent)
+    editor.reset(parent.config.gestures()[1])
+    assert editor.inputStack.currentWidget() is editor.commandLine
+    assert editor.action == 'gesture swipe down' and int(editor.fingers) == 4
+    assert editor.shortcut == 'firefox --new-window'
+
+    editor.reset()
+    assert editor.default_entry is None
+    assert editor.shortcut == '' and editor.keyboardLine.keySequence().isEmpty()
+    assert editor.conflictLabel.text()
+    editor.actionMenu.setCurrentIndex(1)
+    editor.action_chosen(editor.actionMenu.currentText())
+    editor.shortcut_command_or_qdbus('Command')
+    editor.commandLine.setText('firefox')
+    editor.reset()
+    assert editor.actionMenu.currentIndex() == 0 and editor.action == 'gesture swipe up'
+    assert editor.shortcut_command.currentIndex() == 0 and editor.shortcut == ''
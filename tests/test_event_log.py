@@ -0,0 +1,23 @@
+from libinput_gestures_qt.event_log import EventLog
+
+
+def test_ring_buffer_keeps_last_lines():
+    log = EventLog(capacity=3)
+    for i in range(5):
+        log.append('swipe up {}'.format(i), when=i)
+    assert [line for _, _, line in log.entries] == ['swipe up 2', 'swipe up 3', 'swipe up 4']
+    assert log.dropped == 2 and log.capacity == 3
+
+    assert [entry[0] for entry in log.since(3)] == [4, 5]
+    assert log.since(5) == []
+    assert [entry[2] for entry in EventLog.matching(log.entries, 'UP 3')] == ['swipe up 3']
+    assert len(EventLog.matching(log.entries, '')) == 3
+    assert EventLog.format(log.entries[-1]).endswith('.000 swipe up 4')
+
+    log.clear()
+    log.append('pinch in 2')
+    assert [entry[0] for entry in log.since(5)] == [6]
+    assert log.dropped == 0
+    for i in range(4):
+        log.append('pinch out {}'.format(i))
+    assert log.dropped == 2
@@ -0,0 +1,47 @@
+import sys
+
+from PyQt5 import QtCore, QtWidgets
+
+from libinput_gestures_qt.gestures_process import GesturesProcess
+
+
+def wait(app, condition, timeout=500):
+    for _ in range(timeout):
+        app.processEvents()
+        if condition():
+            return True
+        QtCore.QThread.msleep(5)
+    return False
+
+
+def test_gestures_process_lines():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    process = GesturesProcess(program=sys.executable)
+    lines, finished = [], []
+    process.line.connect(lines.append)
+    process.finished.connect(finished.append)
+    process.start(['-c', 'import sys; print("swipe up 3"); sys.stderr.write("error\\n"); print("tail", end="")'])
+    assert wait(app, lambda: finished)
+    assert finished == [0]
+    assert sorted(lines) == ['error', 'swipe up 3', 'tail']
+
+
+def test_gestures_process_restart():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    process = GesturesProcess(program=sys.executable, stop_timeout=200)
+    lines, finished = [], []
+    process.line.connect(lines.append)
+    process.finished.connect(finished.append)
+    process.start(['-c', 'import time; print("up"); time.sleep(30)'])
+    assert wait(app, lambda: lines)
+    process.restart()
+    assert wait(app, lambda: len(lines) == 2)
+    assert len(finished) == 1
+
+    # the kill timer of the stopped process must not kill the new one
+    timer = QtCore.QElapsedTimer()
+    timer.start()
+    assert wait(app, lambda: timer.elapsed() > 500)
+    assert process.is_running() and len(finished) == 1
+    process.kill()
+    process.process.waitForFinished(1000)
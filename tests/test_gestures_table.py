@@ -0,0 +1,50 @@
+from libinput_gestures_qt.config import Config
+from libinput_gestures_qt.gestures_table import GesturesTableModel, COLUMNS
+
+
+def test_model_rows():
+    model = GesturesTableModel()
+    model.set_rows([
+        ('Swipe Up', '3', 'Keyboard shortcut', 'super+Up', 'gesture swipe up 3'),
+        ('Pinch In', '2', 'Command', 'echo hi', 'gesture pinch in 2'),
+    ])
+    assert model.rowCount() == 2
+    assert model.columnCount() == len(COLUMNS)
+    assert model.data(model.index(1, 3)) == 'echo hi'
+    assert model.data(model.index(1, 4)) is None
+    assert model.button(0) == 'gesture swipe up 3'
+
+
+def test_update_rows_applies_only_differences():
+    def row(n, shortcut='echo'):
+        return ('Swipe Up', str(n), 'Command', shortcut, 'gesture swipe up {}'.format(n))
+
+    model = GesturesTableModel()
+    model.set_rows([row(n) for n in range(10)])
+    inserted, removed, changed = [], [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.dataChanged.connect(lambda top, bottom: changed.append((top.row(), bottom.row())))
+
+    new_rows = [row(n) for n in range(10) if n not in (2, 3)] + [row(42)]
+    new_rows[5] = row(7, 'echo changed')
+    model.update_rows(new_rows)
+
+    assert model.rows == new_rows
+    assert removed == [(2, 3)]
+    assert inserted == [(10, 10)]
+    assert changed == [(7, 7)]
+
+
+def test_rows_of_lines_bound_to_one_gesture():
+    config = Config(['gesture swipe up 3 echo one\n', 'gesture swipe up 3 echo two\n'])
+    one, two = config.gestures()
+    rows = [('Swipe Up', '3', 'Command', entry.command, entry) for entry in (one, two)]
+    model = GesturesTableModel()
+    model.set_rows(rows)
+    assert one.index_key == two.index_key
+    assert [model.button(row) for row in range(2)] == [one, two]
+    removed = []
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.update_rows(rows[1:])
+    assert removed == [(0, 0)] and model.button(0) is two
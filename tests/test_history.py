@@ -0,0 +1,93 @@
+import os
+
+from libinput_gestures_qt.config import Config
+from libinput_gestures_qt.history import History, journal_location
+from libinput_gestures_qt.cli import main
+
+
+def test_undo_redo_revert(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write('gesture swipe up 3 echo "1"\n')
+    config = Config.load(path)
+    config.history = History.open(path)
+    config.append('gesture swipe down 3 echo "2"\n')
+    config.save()
+    config.replace(config.lines[0], 'gesture swipe up 4 echo "1"\n')
+    config.save()
+    history = config.history
+    assert [version.seq for version in history.log()] == [3, 2, 1]
+
+    assert history.undo() == 'gesture swipe up 3 echo "1"\ngesture swipe down 3 echo "2"\n'
+    assert history.undo() == 'gesture swipe up 3 echo "1"\n'
+    assert history.undo() is None
+    assert history.redo() == 'gesture swipe up 3 echo "1"\ngesture swipe down 3 echo "2"\n'
+
+    # a journal read from disk is the same as the one in memory
+    reread = History(history.path)
+    assert reread.head == 2 and reread.content(3) == config.serialize()
+    assert reread.revert(1) == 'gesture swipe up 3 echo "1"\n'
+    assert reread.versions[4].same == 1
+    assert reread.undo() == reread.content(2)
+
+
+def test_journal_stays_small(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    lines = ['gesture swipe up {} echo "{}"\n'.format(3 + i % 2, i) for i in range(50)]
+    history = History.open(path)
+    for i in range(2000):
+        lines[i % 50] = 'gesture swipe up {} echo "{}"\n'.format(3 + i % 2, i % 300)
+        history.record(''.join(lines))
+    assert len(history.versions) > 1900
+    assert os.path.getsize(history.path) < len(history.versions) * 120
+    reread = History(history.path)
+    assert reread.content(reread.head) == ''.join(lines)
+
+
+def test_cli_history_and_revert(tmp_path, capsys):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    assert main(['--config', path, 'add', 'swipe', 'up', '3', '--command', 'echo 1']) == 0
+    assert main(['--config', path, 'add', 'swipe', 'down', '3', '--command', 'echo 2']) == 0
+    assert main(['--config', path, 'history']) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert [line.split('\t')[0] for line in out] == ['3 *', '2', '1']
+    assert main(['--config', path, 'revert', '2']) == 0
+    with open(path) as f:
+        assert f.read() == 'gesture swipe up 3 echo 1\n'
+    assert main(['--config', path, 'revert', '42']) == 1
+    assert os.path.exists(journal_location(path))
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    gui = History(path)
+    gui.record('a\n')
+    cli = History(path)
+    cli.record('a\nb\n')
+    gui.record('a\nc\n')
+    assert gui.undo() == 'a\nb\n'
+
+    reread = History(path)
+    assert sorted(reread.versions) == [1, 2, 3]
+    assert [reread.content(seq) for seq in (1, 2, 3)] == ['a\n', 'a\nb\n', 'a\nc\n']
+    assert reread.head == 2
+
+    # a line cut off by a crash is dropped before the next append
+    with open(path, 'a') as journal:
+        journal.write('{"v": 4, "t"')
+    reread.record('d\n')
+    assert History(path).content(4) == 'd\n'
+
+
+def test_open_records_loaded_content(tmp_path, monkeypatch):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    with open(path, 'w') as f:
+        f.write('gesture swipe up 3 echo "1"\n')
+    config = Config.load(path)
+
+    def read_again(path=None):
+        raise AssertionError('config is read twice')
+
+    monkeypatch.setattr('libinput_gestures_qt.history.read_config', read_again)
+    history = History.open(path, content=config.serialize())
+    assert history.content(history.head) == 'gesture swipe up 3 echo "1"\n'
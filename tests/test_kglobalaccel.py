@@ -0,0 +1,92 @@
+import sys
+import shutil
+import subprocess
+
+import pytest
+from PyQt5 import QtCore, QtDBus, QtWidgets
+
+from libinput_gestures_qt.kglobalaccel import KGlobalAccel, SERVICE, PATH, INTERFACE, invoke_shortcut
+
+pytestmark = pytest.mark.skipif(shutil.which('dbus-daemon') is None, reason='needs dbus-daemon')
+
+
+class StandInComponent(QtCore.QObject):
+    """kwin component of kglobalaccel, as far as the app uses it"""
+    QtCore.Q_CLASSINFO('D-Bus Interface', INTERFACE)
+
+    def __init__(self):
+        super().__init__()
+        self.invoked = []
+
+    @QtCore.pyqtSlot(result='QStringList')
+    def shortcutNames(self):
+        return ['Window Minimize', 'Expose']
+
+    @QtCore.pyqtSlot(str)
+    def invokeShortcut(self, name):
+        self.invoked.append(name)
+
+
+@pytest.fixture
+def private_bus():
+    daemon = subprocess.Popen(
+        ['dbus-daemon', '--session', '--nofork', '--print-address'], stdout=subprocess.PIPE
+    )
+    address = daemon.stdout.readline().decode().strip()
+    yield address
+    daemon.terminate()
+    daemon.wait()
+    daemon.stdout.close()
+
+
+def wait_for(app, condition):
+    for _ in range(500):
+        app.processEvents()
+        if condition():
+            return True
+        QtCore.QThread.msleep(2)
+    return False
+
+
+def test_probe_list_and_invoke(private_bus):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    client_bus = QtDBus.QDBusConnection.connectToBus(private_bus, 'client')
+    results = []
+    kglobalaccel = KGlobalAccel(bus=client_bus)
+    kglobalaccel.probed.connect(lambda found: results.append(('probed', found)))
+    kglobalaccel.listed.connect(lambda names: results.append(('listed', names)))
+    kglobalaccel.failed.connect(lambda error: results.append(('failed', bool(error))))
+
+    kglobalaccel.probe()
+    kglobalaccel.list_shortcuts()
+    assert wait_for(app, lambda: len(results) == 2)
+    assert sorted(results) == [('failed', True), ('probed', False)]
+
+    server_bus = QtDBus.QDBusConnection.connectToBus(private_bus, 'server')
+    component = StandInComponent()
+    assert server_bus.registerObject(PATH, component, QtDBus.QDBusConnection.ExportAllSlots)
+    assert server_bus.registerService(SERVICE)
+
+    del results[:]
+    kglobalaccel.probe()
+    kglobalaccel.list_shortcuts()
+    kglobalaccel.invoke('Expose')
+    assert wait_for(app, lambda: len(results) == 2 and component.invoked)
+    assert sorted(results) == [('listed', ['Expose', 'Window Minimize']), ('probed', True)]
+    assert component.invoked == ['Expose']
+
+    QtDBus.QDBusConnection.disconnectFromBus('client')
+    QtDBus.QDBusConnection.disconnectFromBus('server')
+
+
+def test_not_connected():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    bus = QtDBus.QDBusConnection.connectToBus('unix:path=/nonexistent', 'nowhere')
+    results = []
+    kglobalaccel = KGlobalAccel(bus=bus)
+    kglobalaccel.probed.connect(results.append)
+    kglobalaccel.probe()
+    assert wait_for(app, lambda: results)
+    assert results == [False]
+    assert not invoke_shortcut('Expose', bus)
+    QtDBus.QDBusConnection.disconnectFromBus('nowhere')
@@ -0,0 +1,34 @@
+import json
+import shlex
+
+from libinput_gestures_qt.latency import LatencyRecorder, measurement_config, parse_gesture, percentile
+
+
+def test_parse_gesture():
+    assert parse_gesture('SWIPE left_up 3 [-72.3, -341.5]') == 'gesture swipe left_up 3'
+    assert parse_gesture('   pinch in 2') == 'gesture pinch in 2'
+    assert parse_gesture('libinput-gestures: session KDE+x11') is None
+
+
+def test_measurement_config():
+    lines = measurement_config(
+        ['# comment\n', 'gesture swipe up 3 xdotool key super+Up\n', 'device all\n'], '/tmp/x y/done'
+    )
+    assert lines[0] == '# comment\n' and lines[2] == 'device all\n'
+    command = shlex.split(lines[1])
+    assert command[:6] == ['gesture', 'swipe', 'up', '3', 'sh', '-c']
+    assert command[6] == "xdotool key super+Up; echo 'gesture swipe up 3' >> '/tmp/x y/done'"
+
+
+def test_recorder():
+    recorder = LatencyRecorder()
+    assert recorder.done('gesture swipe up 3', 1.0) is None
+    for i in range(10):
+        recorder.gesture('gesture swipe up 3', i)
+    for i in range(10):
+        recorder.done('gesture swipe up 3', i + (i + 1) / 1000)
+    stats = recorder.summary()['gesture swipe up 3']
+    assert stats['count'] == 10
+    assert round(stats['p50'], 6) == 5 and round(stats['p90'], 6) == 9 and round(stats['max'], 6) == 10
+    assert percentile([], 50) is None and percentile([3], 99) == 3
+    assert len(json.loads(recorder.to_json())['samples']['gesture swipe up 3']) == 10
@@ -0,0 +1,58 @@
+import sys
+import time
+import threading
+import subprocess
+
+import pytest
+
+from libinput_gestures_qt.process import Executor, Cancelled
+
+PYTHON = sys.executable
+
+
+def test_timeout_and_stats():
+    executor = Executor()
+    assert executor.run([PYTHON, '-c', 'print("hi")']).stdout.strip() == b'hi'
+    with pytest.raises(subprocess.TimeoutExpired):
+        executor.run([PYTHON, '-c', 'import time; time.sleep(30)'], timeout=0.3)
+    with pytest.raises(FileNotFoundError):
+        executor.run(['no-such-command-here'])
+    stats = executor.stats()
+    assert stats[Executor.command_name([PYTHON])]['count'] == 2
+    assert stats[Executor.command_name([PYTHON])]['timeouts'] == 1
+    assert stats['no-such-command-here']['failures'] == 1
+    assert 'no-such-command-here' in executor.format_report()
+
+
+def test_cache():
+    executor = Executor()
+    query = [PYTHON, '-c', 'import time; print(time.time())']
+    first = executor.run(query, cache=60)
+    assert executor.run(query, cache=60) is first
+    executor.run([PYTHON, '-c', 'pass'])
+    assert executor.run(query, cache=60) is not first
+    assert executor.stats()[Executor.command_name(query)]['cached'] == 1
+
+
+def test_cancel_and_limit():
+    executor = Executor(max_calls=1)
+    errors = []
+
+    def hang():
+        try:
+            executor.run([PYTHON, '-c', 'import time; time.sleep(30)'])
+        except Cancelled as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hang) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    # the second call waits for the first one
+    assert len(executor.running) == 1
+    executor.cancel()
+    time.sleep(0.5)
+    executor.cancel()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 2
@@ -0,0 +1,51 @@
+from libinput_gestures_qt import cli
+from libinput_gestures_qt.profiles import ProfileStore, KDE_PROFILE
+from libinput_gestures_qt.cli import main
+
+
+def test_save_and_switch(tmp_path):
+    store = ProfileStore(str(tmp_path / 'profiles'))
+    config_path = str(tmp_path / 'libinput-gestures.conf')
+    rejected = store.save('browser/only', [
+        'gesture  swipe\tleft 3 xdotool key alt+Right\n', 'gesture swipe up\n', 'device all'
+    ])
+    assert [lineno for lineno, _, _ in rejected] == [2]
+    with open(store.path('browser/only')) as profile:
+        assert profile.read() == 'gesture swipe left 3 xdotool key alt+Right\ndevice all\n'
+    assert store.names() == ['browser/only']
+
+    assert store.active(config_path) is None
+    assert store.switch('browser/only', config_path) is True
+    assert store.switch('browser/only', config_path) is False
+    assert store.active(config_path) == 'browser/only'
+    store.add_builtin('browser/only', 'gesture pinch in 2 echo\n')
+    assert store.active(config_path) == 'browser/only'
+
+
+def test_cli_profiles(tmp_path, capsys, monkeypatch):
+    # switching restarts libinput-gestures, not the one of whoever runs the tests
+    restarts = []
+    monkeypatch.setattr(cli, 'restart_libinput_gestures', lambda: restarts.append(True))
+    path = str(tmp_path / 'libinput-gestures.conf')
+    assert main(['--config', path, 'add', 'swipe', 'up', '3', '--command', 'echo 1']) == 0
+    assert main(['--config', path, 'profile', 'save', 'presentation']) == 0
+    assert main(['--config', path, 'profile', 'switch', KDE_PROFILE]) == 0
+    assert main(['--config', path, 'profile', 'list']) == 0
+    assert capsys.readouterr().out.splitlines() == [KDE_PROFILE + ' *', 'presentation']
+    assert main(['--config', path, 'profile', 'switch', 'presentation']) == 0
+    with open(path) as f:
+        assert f.read() == 'gesture swipe up 3 echo 1\n'
+    assert len(restarts) == 2
+    assert main(['--config', path, 'profile', 'delete', 'nothing']) == 1
+
+
+def test_names_starting_with_dot(tmp_path):
+    store = ProfileStore(str(tmp_path / 'profiles'))
+    config_path = str(tmp_path / 'libinput-gestures.conf')
+    store.save('.work', ['gesture pinch in 2 echo\n'])
+    store.save('..', ['gesture pinch out 2 echo\n'])
+    assert store.names() == ['..', '.work']
+    assert store.switch('.work', config_path) is True
+    assert store.active(config_path) == '.work'
+    store.delete('.work')
+    assert store.names() == ['..']
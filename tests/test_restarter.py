@@ -0,0 +1,46 @@
+import sys
+
+from PyQt5 import QtCore, QtWidgets
+
+from libinput_gestures_qt.gestures_process import GesturesProcess
+from libinput_gestures_qt.restarter import Restarter
+
+
+def wait(app, condition, timeout=500):
+    for _ in range(timeout):
+        app.processEvents()
+        if condition():
+            return True
+        QtCore.QThread.msleep(5)
+    return False
+
+
+def test_changes_are_applied_once_per_batch():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    process = GesturesProcess(program=sys.executable, stop_timeout=200)
+    restarter = Restarter(process, delay=50)
+    lines, applied = [], []
+    process.line.connect(lines.append)
+    restarter.applied.connect(applied.append)
+    process.start(['-c', 'import time; print("up"); time.sleep(30)'])
+    assert wait(app, lambda: lines)
+
+    for _ in range(5):
+        restarter.schedule()
+    assert wait(app, lambda: applied)
+    assert wait(app, lambda: len(lines) == 2)
+    assert applied == ['libinput-gestures restarted']
+
+    # a change saved during a restart is applied by one more restart after it
+    restarter.restart_now()
+    restarter.schedule()
+    assert wait(app, lambda: len(applied) == 3 and not restarter.is_busy())
+    assert wait(app, lambda: len(lines) == 4)
+
+    # the restarted instance keeps running past the kill timeout of the stopped one
+    timer = QtCore.QElapsedTimer()
+    timer.start()
+    assert wait(app, lambda: timer.elapsed() > 500)
+    assert process.is_running() and not restarter.is_busy()
+    process.kill()
+    process.process.waitForFinished(1000)
@@ -0,0 +1,40 @@
+from libinput_gestures_qt.search import TokenIndex
+from libinput_gestures_qt.gestures_table import GesturesTableModel, GesturesFilterModel
+
+UP = ('Swipe Up', '3', 'Keyboard shortcut', 'Super+Page_Down', 'up')
+DOWN = ('Swipe Down', '4', 'Command', 'firefox --new-window', 'down')
+PINCH = ('Pinch In', '2', 'Plasma action', 'Expose', 'in')
+
+
+def test_search():
+    index = TokenIndex()
+    for row in (UP, DOWN, PINCH, UP):
+        index.add(row)
+    assert index.search('  ') is None
+    assert index.search('swipe') == {UP, DOWN}
+    assert index.search('swipe fire') == {DOWN}
+    assert index.search('swipe firef') == {DOWN}
+    assert index.search('SHORTCUT 3') == {UP}
+    assert index.search('nothing') == set()
+
+    # a duplicate row stays until its last copy is removed
+    index.remove(UP)
+    assert index.search('page_down') == {UP}
+    index.remove(UP)
+    assert index.search('page_down') == set()
+    index.add(('Swipe Left', '3', 'Command', 'firefox-esr', 'left'))
+    assert {row[-1] for row in index.search('swipe fire')} == {'down', 'left'}
+
+
+def test_filter_follows_updates():
+    model = GesturesTableModel()
+    proxy = GesturesFilterModel()
+    proxy.setSourceModel(model)
+    model.set_rows([UP, DOWN, PINCH])
+    proxy.set_filter('swipe')
+    assert proxy.rowCount() == 2
+    model.update_rows([UP, PINCH, ('Swipe Right', '3', 'Command', 'dolphin', 'right')])
+    assert [proxy.index(row, 0).data() for row in range(proxy.rowCount())] == ['Swipe Up', 'Swipe Right']
+    assert model.button(proxy.mapToSource(proxy.index(1, 0)).row()) == 'right'
+    proxy.set_filter('')
+    assert proxy.rowCount() == 3
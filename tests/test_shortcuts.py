@@ -0,0 +1,22 @@
+import os
+
+from libinput_gestures_qt.shortcuts import ShortcutCatalog
+
+
+def test_catalog_cache(tmp_path):
+    cache = str(tmp_path / 'cache' / 'kwin-shortcuts.json')
+    source = str(tmp_path / 'kglobalshortcutsrc')
+    with open(source, 'w') as f:
+        f.write('[kwin]\n')
+
+    catalog = ShortcutCatalog(cache, source)
+    assert catalog.names == [] and catalog.is_stale()
+    catalog.update(['Expose', 'Window Minimize'], os.stat(source).st_mtime)
+    assert not catalog.is_stale()
+
+    reloaded = ShortcutCatalog(cache, source)
+    assert reloaded.names == ['Expose', 'Window Minimize']
+    assert not reloaded.is_stale()
+
+    os.utime(source, (0, 0))
+    assert reloaded.is_stale()
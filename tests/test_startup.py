@@ -0,0 +1,30 @@
+import io
+
+from libinput_gestures_qt.startup import StartupProfiler
+
+
+def test_report_when_all_spans_recorded(monkeypatch):
+    profiler = StartupProfiler()
+    reports = []
+    monkeypatch.setattr(profiler, 'report', lambda file=None: reports.append(profiler.format_report()))
+
+    with profiler.span('setupUi'):
+        pass
+    profiler.report_when('setupUi', 'first paint')
+    assert reports == []  # not enabled
+
+    profiler.enabled = True
+    profiler.report_when('setupUi', 'first paint')
+    profiler.begin('qdbus probe')
+    assert reports == []
+    profiler.mark('first paint')
+    assert len(reports) == 1
+    assert 'setupUi' in reports[0] and 'first paint' in reports[0]
+    assert 'qdbus probe' not in reports[0]
+
+    profiler.end('qdbus probe')
+    profiler.end('never opened')
+    assert len(reports) == 1
+    out = io.StringIO()
+    StartupProfiler.report(profiler, out)
+    assert 'qdbus probe' in out.getvalue()
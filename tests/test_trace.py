@@ -0,0 +1,68 @@
+import sys
+import json
+import threading
+
+from libinput_gestures_qt.trace import Tracer, tracer
+from libinput_gestures_qt.cli import main
+from libinput_gestures_qt.process import run
+
+
+def test_spans(tmp_path):
+    path = str(tmp_path / 'trace.json')
+    trace = Tracer()
+    with trace.span('disabled'):
+        pass
+    trace.enable(path)
+    with trace.span('outer', 'config', lines=2):
+        with trace.span('inner'):
+            trace.instant('tick')
+    def other():
+        with trace.span('other thread'):
+            pass
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    thread.join()
+    hung = trace.span('hung')
+    hung.__enter__()
+
+    # a trace of a killed app is not closed, it still loads and shows the span it hung in
+    with open(path) as f:
+        events = json.loads(f.read() + ']')
+    hung.__exit__(None, None, None)
+    trace.close()
+    with open(path) as f:
+        assert json.load(f)[:-1] == events
+
+    spans = [(event['name'], event['ph']) for event in events if event['ph'] != 'M']
+    assert spans == [
+        ('outer', 'B'), ('inner', 'B'), ('tick', 'i'), ('inner', 'E'), ('outer', 'E'),
+        ('other thread', 'B'), ('other thread', 'E'), ('hung', 'B')
+    ]
+    outer = next(event for event in events if event['name'] == 'outer')
+    assert outer['args'] == {'lines': 2} and outer['cat'] == 'config'
+    assert len({event['tid'] for event in events}) == 2
+    assert sum(event['name'] == 'thread_name' for event in events) == 2
+
+
+def test_cli_trace(tmp_path):
+    path = str(tmp_path / 'libinput-gestures.conf')
+    trace = str(tmp_path / 'trace.json')
+    assert main(['--config', path, '--trace', trace, 'add', 'swipe', 'up', '3', '--command', 'echo hi']) == 0
+    assert not tracer.enabled
+    with open(trace) as f:
+        names = {event['name'] for event in json.load(f)}
+    assert {'config read', 'config parse', 'config write', 'history record', 'add'} <= names
+
+
+def test_subprocess_spans(tmp_path):
+    trace = str(tmp_path / 'trace.json')
+    tracer.enable(trace)
+    try:
+        run([sys.executable, '-c', 'pass'])
+    finally:
+        tracer.close()
+    with open(trace) as f:
+        events = [event for event in json.load(f) if event.get('cat') == 'subprocess']
+    assert [event['ph'] for event in events] == ['B', 'E']
+    assert events[0]['args']['argv'] == [sys.executable, '-c', 'pass']
@@ -0,0 +1,57 @@
+from libinput_gestures_qt.validation import Validator, OK, WARNING, ERROR
+from libinput_gestures_qt.gestures_table import GesturesTableModel, STATUS_COLUMN
+
+
+class Which:
+    """shutil.which stand-in that counts lookups"""
+    def __init__(self, *installed):
+        self.installed = installed
+        self.calls = []
+
+    def __call__(self, name):
+        self.calls.append(name)
+        return '/usr/bin/' + name if name in self.installed else None
+
+
+def test_check_lines():
+    validator = Validator(Which('xdotool', 'qdbus', 'echo'))
+    lines = [
+        ('up', 'gesture swipe up 3 xdotool key super+Page_Down\n'),
+        ('down', 'gesture swipe down 3 xdotool key ctrl+nosuchkey\n'),
+        ('left', 'gesture swipe left 3 qdbus org.kde.kglobalaccel /component/kwin invokeShortcut "Expose"\n'),
+        ('right', 'gesture swipe right 3 libinput-gestures-qt-action shortcut "Expose"\n'),
+        ('in', 'gesture pinch in 2 LANG=C echo "hi"\n'),
+        ('out', 'gesture pinch out 2 firefox\n'),
+    ]
+    statuses = validator.check_lines(lines, ['Expose'])
+    assert statuses['up'] == (OK, '')
+    assert statuses['down'] == (ERROR, 'unknown key "nosuchkey"')
+    assert statuses['left'] == (OK, '')
+    assert statuses['right'][0] == ERROR
+    assert statuses['in'] == (OK, '')
+    assert statuses['out'] == (ERROR, 'firefox is not found in PATH')
+    assert validator.check_lines(lines[2:3], ['Overview'])['left'] == (WARNING, 'no kwin shortcut "Expose"')
+
+
+def test_revalidation_is_cached():
+    which = Which('xdotool', 'echo')
+    validator = Validator(which)
+    lines = [(n, 'gesture swipe up {} xdotool key super+Up\n'.format(n)) for n in range(3, 5)]
+    validator.check_lines(lines)
+    checked = []
+    validator.check_line = lambda line: checked.append(line) or (OK, '')
+    validator.check_lines(lines + [(5, 'gesture swipe up 5 echo\n')])
+    assert checked == ['gesture swipe up 5 echo\n']
+    assert which.calls == ['xdotool']
+
+
+def test_status_column():
+    model = GesturesTableModel()
+    model.set_rows([('Swipe Up', '3', 'Command', 'firefox', 'up'), ('Pinch In', '2', 'Command', 'echo', 'in')])
+    changed = []
+    model.dataChanged.connect(lambda top, bottom: changed.append(top.row()))
+    model.set_statuses({'up': (ERROR, 'firefox is not found in PATH'), 'in': (OK, '')})
+    model.set_statuses({'up': (ERROR, 'firefox is not found in PATH'), 'in': (WARNING, 'hm')})
+    assert changed == [0, 1, 1]
+    assert model.data(model.index(0, STATUS_COLUMN)) == 'firefox is not found in PATH'
+    assert model.data(model.index(1, STATUS_COLUMN)) == 'hm'
@@ -0,0 +1,35 @@
+import sys
+import threading
+
+from PyQt5 import QtCore, QtWidgets
+
+from libinput_gestures_qt import worker
+from libinput_gestures_qt.worker import run_in_background
+
+
+def test_results_are_delivered_in_gui_thread():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    gui_thread = threading.get_ident()
+    ran_in, results, errors = [], [], []
+
+    def work(x, y=0):
+        ran_in.append(threading.get_ident())
+        return x + y
+
+    def fail():
+        raise ValueError('broken')
+
+    finished = run_in_background(
+        work, 1, y=2, on_finished=lambda result: results.append((result, threading.get_ident()))
+    )
+    failed = run_in_background(fail, on_failed=lambda error: errors.append((error, threading.get_ident())))
+    for _ in range(500):
+        app.processEvents()
+        if results and errors:
+            break
+        QtCore.QThread.msleep(5)
+
+    assert ran_in and ran_in[0] != gui_thread
+    assert results == [(3, gui_thread)]
+    assert isinstance(errors[0][0], ValueError) and errors[0][1] == gui_thread
+    assert finished not in worker._active and failed not in worker._active